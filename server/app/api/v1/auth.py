@@ -1,13 +1,15 @@
+from typing import Optional
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.responses import JSONResponse
 
 from app.schemas.auth import (
     LoginRequest, SignUpRequest, AuthResponse,
-    UserResponse, UserProfileUpdate
+    UserResponse, UserProfileUpdate,
+    RefreshRequest, LogoutRequest, TokenResponse
 )
 from app.services.auth_service import auth_service
 from app.utils.auth import get_current_user, get_current_user_id
-from app.core.exceptions import AuthenticationError, ValidationError
+from app.core.exceptions import AuthenticationError, NotFoundError, ValidationError
 
 
 router = APIRouter(prefix="/auth", tags=["인증"])
@@ -33,6 +35,15 @@ async def sign_in(login_data: LoginRequest):
         raise HTTPException(status_code=e.status_code, detail=e.detail)
 
 
+@router.post("/refresh", response_model=TokenResponse)
+async def refresh(refresh_data: RefreshRequest):
+    """토큰 갱신 (리프레시 토큰 교체 + 새 액세스 토큰, 비밀번호 인증 없음)"""
+    try:
+        return await auth_service.refresh_session(refresh_data.refresh_token)
+    except AuthenticationError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+
 @router.get("/me", response_model=UserResponse)
 async def get_current_user_info(current_user: UserResponse = Depends(get_current_user)):
     """현재 사용자 정보 조회"""
@@ -40,8 +51,11 @@ async def get_current_user_info(current_user: UserResponse = Depends(get_current
 
 
 @router.post("/logout")
-async def logout():
-    """로그아웃"""
+async def logout(logout_data: Optional[LogoutRequest] = None):
+    """로그아웃 (리프레시 토큰을 보내면 폐기)"""
+    if logout_data and logout_data.refresh_token:
+        await auth_service.revoke_session(logout_data.refresh_token)
+
     # 클라이언트에서 토큰을 삭제하도록 안내
     return JSONResponse(
         content={"message": "로그아웃되었습니다. 클라이언트에서 토큰을 삭제해주세요."},
@@ -55,5 +69,7 @@ async def update_profile(
     current_user: UserResponse = Depends(get_current_user)
 ):
     """사용자 프로필 업데이트"""
-    # TODO: 프로필 업데이트 로직 구현
-    return current_user
\ No newline at end of file
+    try:
+        return await auth_service.update_user_profile(current_user, profile_data)
+    except NotFoundError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
\ No newline at end of file
@@ -1,37 +1,148 @@
-from datetime import date, datetime
-from typing import List
-from fastapi import APIRouter, Depends, HTTPException, Query
+import calendar
+from datetime import date, datetime, timedelta
+from typing import List, Optional, Union
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 
 from app.schemas.medication import (
     MedicationCreate, MedicationUpdate, MedicationResponse,
     MedicationRecordCreate, MedicationRecordUpdate,
+    MedicationRecordBatchCreate, MedicationRecordBatchResponse,
     DailyMedicationRecord, MedicationDoseResponse,
-    MonthlyStatistics
+    MonthlyStatistics, StreakResponse, CalendarStatus, DailyAdherence,
+    MedicationPage, MedicationRecordPage, MedicationImageResponse
 )
+from app.services.media_service import media_service
 from app.services.medication_service import medication_service
 from app.utils.auth import get_current_user_id
-from app.core.exceptions import NotFoundError, ValidationError
+from app.utils.export import csv_chunks, ndjson_chunks
+from app.utils.http import conditional_json_response, immutable_response, model_response
+from app.utils.idempotency import get_idempotency_key, idempotent
+from app.core.exceptions import (
+    ConflictError, ExternalServiceError, NotFoundError, PayloadTooLargeError, ValidationError
+)
 
 
 router = APIRouter(prefix="/medications", tags=["약물 관리"])
 
+# 달력 기간 조회 최대 일수
+MAX_CALENDAR_RANGE_DAYS = 366
+
+# 약물 목록 기본/최대 페이지 크기
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
+# 복용 기록 내보내기 컬럼 (CSV 헤더 순서)
+EXPORT_COLUMNS = [
+    "date", "time", "medication_id", "medication_name",
+    "status", "delay_reason", "taken_at", "id"
+]
+
 
 @router.post("", response_model=MedicationResponse)
 async def create_medication(
     medication_data: MedicationCreate,
+    user_id: str = Depends(get_current_user_id),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key)
+):
+    """약물 등록 (Idempotency-Key 지원)"""
+    try:
+        return await idempotent(
+            idempotency_key, user_id, "create_medication", medication_data,
+            lambda: medication_service.create_medication(user_id, medication_data),
+            MedicationResponse
+        )
+    except ValidationError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+
+@router.get("", response_model=Union[List[MedicationResponse], MedicationPage])
+async def get_medications(
+    limit: Optional[int] = Query(None, ge=1, le=MAX_PAGE_SIZE, description="페이지 크기 (지정 시 페이지 응답)"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
+    fields: Optional[str] = Query(None, description="조회할 필드 (쉼표 구분, 예: id,name,image_path)"),
+    user_id: str = Depends(get_current_user_id)
+):
+    """사용자의 약물 목록 조회 (최신 등록순)
+
+    limit/cursor/fields를 하나도 보내지 않으면 기존처럼 전체 목록(배열)을 반환하고,
+    하나라도 보내면 커서 페이지네이션 응답(MedicationPage)을 반환합니다.
+    """
+    if limit is None and cursor is None and fields is None:
+        medications = await medication_service.get_medications(user_id)
+        return model_response(medications, List[MedicationResponse])
+
+    field_list = [f.strip() for f in fields.split(",") if f.strip()] if fields else None
+    try:
+        page = await medication_service.get_medications_page(user_id, limit or DEFAULT_PAGE_SIZE, cursor, field_list)
+        return model_response(page, MedicationPage)
+    except ValidationError as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+
+@router.get("/records", response_model=MedicationRecordPage)
+async def get_records(
+    start_date: date = Query(..., description="시작 날짜 (YYYY-MM-DD)"),
+    end_date: date = Query(..., description="종료 날짜 (YYYY-MM-DD, 포함)"),
+    limit: int = Query(100, ge=1, le=MAX_PAGE_SIZE, description="페이지 크기"),
+    cursor: Optional[str] = Query(None, description="이전 응답의 next_cursor"),
     user_id: str = Depends(get_current_user_id)
 ):
-    """약물 등록"""
+    """기간별 복용 기록 조회 (날짜/시간순, 커서 페이지네이션)"""
+    if end_date < start_date:
+        raise HTTPException(status_code=422, detail="종료 날짜는 시작 날짜 이후여야 합니다")
     try:
-        return await medication_service.create_medication(user_id, medication_data)
+        page = await medication_service.get_records_page(user_id, start_date, end_date, limit, cursor)
+        return model_response(page, MedicationRecordPage)
     except ValidationError as e:
         raise HTTPException(status_code=e.status_code, detail=e.detail)
 
 
-@router.get("", response_model=List[MedicationResponse])
-async def get_medications(user_id: str = Depends(get_current_user_id)):
-    """사용자의 약물 목록 조회"""
-    return await medication_service.get_medications(user_id)
+@router.post(
+    "/images",
+    response_model=MedicationImageResponse,
+    openapi_extra={"requestBody": {"content": {"multipart/form-data": {"schema": {
+        "type": "object",
+        "properties": {"file": {"type": "string", "format": "binary"}},
+        "required": ["file"],
+    }}}}}
+)
+async def upload_medication_image(
+    request: Request,
+    user_id: str = Depends(get_current_user_id)
+):
+    """약물 이미지 업로드 (multipart/form-data의 file 필드, JPEG/PNG/WebP)
+
+    응답의 image_path를 약물 등록/수정에 사용하고, 목록 화면은 variants의 thumbnail을 사용합니다.
+    """
+    content_length = request.headers.get("content-length")
+    try:
+        return await media_service.save_upload(
+            user_id,
+            request.headers.get("content-type", ""),
+            int(content_length) if content_length and content_length.isdigit() else None,
+            request.stream()
+        )
+    except (ValidationError, PayloadTooLargeError, ExternalServiceError) as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
+
+
+@router.get("/images/{image_id}/{variant}")
+async def get_medication_image(
+    image_id: str,
+    variant: str,
+    request: Request,
+    user_id: str = Depends(get_current_user_id)
+):
+    """약물 이미지 조회 (variant: thumbnail, medium, original / 장기 캐시)"""
+    try:
+        return await immutable_response(
+            request,
+            f'"{image_id}-{variant}"',
+            lambda: media_service.open_variant(user_id, image_id, variant)
+        )
+    except (NotFoundError, ExternalServiceError) as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
 
 
 @router.get("/{medication_id}", response_model=MedicationResponse)
@@ -41,7 +152,8 @@ async def get_medication(
 ):
     """특정 약물 조회"""
     try:
-        return await medication_service.get_medication(user_id, medication_id)
+        medication = await medication_service.get_medication(user_id, medication_id)
+        return model_response(medication, MedicationResponse)
     except NotFoundError as e:
         raise HTTPException(status_code=e.status_code, detail=e.detail)
 
@@ -50,11 +162,16 @@ async def get_medication(
 async def update_medication(
     medication_id: str,
     medication_data: MedicationUpdate,
-    user_id: str = Depends(get_current_user_id)
+    user_id: str = Depends(get_current_user_id),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key)
 ):
-    """약물 정보 업데이트"""
+    """약물 정보 업데이트 (Idempotency-Key 지원)"""
     try:
-        return await medication_service.update_medication(user_id, medication_id, medication_data)
+        return await idempotent(
+            idempotency_key, user_id, "update_medication", (medication_id, medication_data),
+            lambda: medication_service.update_medication(user_id, medication_id, medication_data),
+            MedicationResponse
+        )
     except NotFoundError as e:
         raise HTTPException(status_code=e.status_code, detail=e.detail)
 
@@ -62,45 +179,149 @@ async def update_medication(
 @router.delete("/{medication_id}")
 async def delete_medication(
     medication_id: str,
-    user_id: str = Depends(get_current_user_id)
+    user_id: str = Depends(get_current_user_id),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key)
 ):
-    """약물 삭제"""
-    success = await medication_service.delete_medication(user_id, medication_id)
-    if not success:
-        raise HTTPException(status_code=404, detail="약물을 찾을 수 없습니다")
-    return {"message": "약물이 삭제되었습니다"}
+    """약물 삭제 (Idempotency-Key 지원)"""
+
+    async def delete():
+        success = await medication_service.delete_medication(user_id, medication_id)
+        if not success:
+            raise HTTPException(status_code=404, detail="약물을 찾을 수 없습니다")
+        return {"message": "약물이 삭제되었습니다"}
+
+    return await idempotent(
+        idempotency_key, user_id, "delete_medication", medication_id, delete, dict
+    )
 
 
 @router.post("/records", response_model=MedicationDoseResponse)
 async def create_medication_record(
     record_data: MedicationRecordCreate,
-    user_id: str = Depends(get_current_user_id)
+    user_id: str = Depends(get_current_user_id),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key)
 ):
-    """복용 기록 생성"""
+    """복용 기록 생성 (Idempotency-Key 지원)"""
     try:
-        return await medication_service.create_medication_record(user_id, record_data)
-    except ValidationError as e:
+        return await idempotent(
+            idempotency_key, user_id, "create_medication_record", record_data,
+            lambda: medication_service.create_medication_record(user_id, record_data),
+            MedicationDoseResponse
+        )
+    except (ValidationError, ConflictError) as e:
         raise HTTPException(status_code=e.status_code, detail=e.detail)
 
 
+@router.post("/records/batch", response_model=MedicationRecordBatchResponse)
+async def create_medication_records_batch(
+    batch_data: MedicationRecordBatchCreate,
+    user_id: str = Depends(get_current_user_id),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key)
+):
+    """복용 기록 일괄 생성 (오프라인 기록 동기화, Idempotency-Key 지원)"""
+    return await idempotent(
+        idempotency_key, user_id, "create_medication_records_batch", batch_data,
+        lambda: medication_service.create_medication_records_batch(user_id, batch_data.records),
+        MedicationRecordBatchResponse
+    )
+
+
 @router.get("/records/daily", response_model=DailyMedicationRecord)
 async def get_daily_records(
     target_date: date = Query(..., description="조회할 날짜 (YYYY-MM-DD)"),
     user_id: str = Depends(get_current_user_id)
 ):
     """특정 날짜의 복용 기록 조회"""
-    return await medication_service.get_daily_records(user_id, target_date)
+    records = await medication_service.get_daily_records(user_id, target_date)
+    return model_response(records, DailyMedicationRecord)
+
+
+@router.get("/records/calendar", response_model=List[CalendarStatus])
+async def get_monthly_calendar(
+    request: Request,
+    year: int = Query(..., description="연도"),
+    month: int = Query(..., ge=1, le=12, description="월"),
+    user_id: str = Depends(get_current_user_id)
+):
+    """월간 달력 상태 조회 (ETag/Last-Modified 지원)"""
+    start_date = date(year, month, 1)
+    end_date = date(year, month, calendar.monthrange(year, month)[1])
+
+    days = await medication_service.get_daily_adherence(user_id, start_date, end_date)
+
+    return conditional_json_response(
+        request,
+        [CalendarStatus(date=day.date.day, status=day.overall_status) for day in days],
+        last_modified=max((day.updated_at for day in days if day.updated_at), default=None)
+    )
+
+
+@router.get("/records/calendar/range", response_model=List[DailyAdherence])
+async def get_calendar_range(
+    request: Request,
+    start_date: date = Query(..., description="시작 날짜 (YYYY-MM-DD)"),
+    end_date: date = Query(..., description="종료 날짜 (YYYY-MM-DD, 포함)"),
+    user_id: str = Depends(get_current_user_id)
+):
+    """기간별 일별 복용 집계 조회 (ETag/Last-Modified 지원)"""
+    if end_date < start_date:
+        raise HTTPException(status_code=422, detail="종료 날짜는 시작 날짜 이후여야 합니다")
+    if end_date - start_date >= timedelta(days=MAX_CALENDAR_RANGE_DAYS):
+        raise HTTPException(
+            status_code=422,
+            detail=f"조회 기간은 최대 {MAX_CALENDAR_RANGE_DAYS}일입니다"
+        )
+
+    days = await medication_service.get_daily_adherence(user_id, start_date, end_date)
+
+    return conditional_json_response(
+        request,
+        days,
+        last_modified=max((day.updated_at for day in days if day.updated_at), default=None)
+    )
+
+
+@router.get("/records/export")
+async def export_records(
+    format: str = Query("ndjson", pattern="^(ndjson|csv)$", description="내보내기 형식 (ndjson | csv)"),
+    start_date: Optional[date] = Query(None, description="시작 날짜 (YYYY-MM-DD)"),
+    end_date: Optional[date] = Query(None, description="종료 날짜 (YYYY-MM-DD, 포함)"),
+    user_id: str = Depends(get_current_user_id)
+):
+    """전체 복용 기록 내보내기 (NDJSON/CSV 스트리밍)"""
+    if start_date and end_date and end_date < start_date:
+        raise HTTPException(status_code=422, detail="종료 날짜는 시작 날짜 이후여야 합니다")
+
+    pages = medication_service.iter_record_pages(user_id, start_date, end_date)
+    if format == "csv":
+        body, media_type = csv_chunks(pages, EXPORT_COLUMNS), "text/csv"
+    else:
+        body, media_type = ndjson_chunks(pages), "application/x-ndjson"
+
+    return StreamingResponse(
+        body,
+        media_type=media_type,
+        headers={
+            "Content-Disposition": f'attachment; filename="medication_records.{format}"',
+            "Cache-Control": "no-store",
+        }
+    )
 
 
 @router.put("/records/{record_id}", response_model=MedicationDoseResponse)
 async def update_medication_record(
     record_id: str,
     update_data: MedicationRecordUpdate,
-    user_id: str = Depends(get_current_user_id)
+    user_id: str = Depends(get_current_user_id),
+    idempotency_key: Optional[str] = Depends(get_idempotency_key)
 ):
-    """복용 기록 업데이트"""
+    """복용 기록 업데이트 (Idempotency-Key 지원)"""
     try:
-        return await medication_service.update_medication_record(user_id, record_id, update_data)
+        return await idempotent(
+            idempotency_key, user_id, "update_medication_record", (record_id, update_data),
+            lambda: medication_service.update_medication_record(user_id, record_id, update_data),
+            MedicationDoseResponse
+        )
     except NotFoundError as e:
         raise HTTPException(status_code=e.status_code, detail=e.detail)
 
@@ -112,4 +333,10 @@ async def get_monthly_statistics(
     user_id: str = Depends(get_current_user_id)
 ):
     """월간 통계 조회"""
-    return await medication_service.get_monthly_statistics(user_id, year, month)
\ No newline at end of file
+    return await medication_service.get_monthly_statistics(user_id, year, month)
+
+
+@router.get("/statistics/streak", response_model=StreakResponse)
+async def get_streak(user_id: str = Depends(get_current_user_id)):
+    """연속 복용 현황 조회 (현재/최장 연속 복용일, 마지막 완료일)"""
+    return await medication_service.get_streak(user_id)
\ No newline at end of file
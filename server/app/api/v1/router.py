@@ -2,6 +2,7 @@ from fastapi import APIRouter
 
 from app.api.v1.auth import router as auth_router
 from app.api.v1.medications import router as medications_router
+from app.api.v1.sync import router as sync_router
 
 
 api_router = APIRouter()
@@ -10,4 +11,7 @@ api_router = APIRouter()
 api_router.include_router(auth_router)
 
 # 약물 관리 관련 라우터
-api_router.include_router(medications_router)
\ No newline at end of file
+api_router.include_router(medications_router)
+
+# 델타 동기화 라우터
+api_router.include_router(sync_router)
\ No newline at end of file
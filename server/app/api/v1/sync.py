@@ -0,0 +1,33 @@
+from typing import Optional
+from fastapi import APIRouter, Depends, HTTPException, Query
+
+from app.core.config import settings
+from app.core.exceptions import GoneError, ValidationError
+from app.schemas.sync import SyncResponse
+from app.services.sync_service import sync_service
+from app.utils.auth import get_current_user_id
+from app.utils.http import model_response
+
+
+router = APIRouter(prefix="/sync", tags=["동기화"])
+
+# 한 번에 조회할 최대 항목 수 (테이블별)
+MAX_SYNC_PAGE_SIZE = 1000
+
+
+@router.get("", response_model=SyncResponse)
+async def get_changes(
+    since: Optional[str] = Query(None, description="이전 응답의 next_cursor (없으면 전체 동기화)"),
+    limit: int = Query(settings.SYNC_PAGE_SIZE, ge=1, le=MAX_SYNC_PAGE_SIZE, description="테이블별 최대 항목 수"),
+    user_id: str = Depends(get_current_user_id)
+):
+    """델타 동기화 (since 이후 생성/수정/삭제된 약물과 복용 기록)
+
+    has_more가 true이면 next_cursor로 바로 다시 요청하고, 아니면 next_cursor를 저장해
+    다음 동기화에 사용합니다. 같은 항목이 여러 번 올 수 있으므로 id 기준으로 덮어씁니다.
+    """
+    try:
+        changes = await sync_service.get_changes(user_id, since, limit)
+        return model_response(changes, SyncResponse, headers={"Cache-Control": "no-store"})
+    except (ValidationError, GoneError) as e:
+        raise HTTPException(status_code=e.status_code, detail=e.detail)
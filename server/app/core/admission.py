@@ -0,0 +1,283 @@
+import asyncio
+import json
+import logging
+import math
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Optional
+
+from jose import JWTError, jwt
+
+from app.core.cache import TTLCache
+from app.core.config import settings
+from app.core.metrics import REQUESTS_REJECTED
+
+
+logger = logging.getLogger(__name__)
+
+# 부하 제어 대상에서 제외할 경로 (프로브/메트릭은 과부하 중에도 응답해야 함)
+EXEMPT_PATHS = {"/health", "/ready", "/metrics"}
+
+# 인증 전 호출하는 경로 (클라이언트 IP별 별도 토큰 버킷, RATE_LIMIT_AUTH_*)
+AUTH_PATHS = {"/v1/auth/signup", "/v1/auth/signin", "/v1/auth/refresh"}
+
+
+class RateLimiter(ABC):
+    """사용자별 토큰 버킷 인터페이스 (초당 rate개 충전, 최대 burst개)"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+
+    @abstractmethod
+    async def acquire(self, key: str) -> float:
+        """토큰 하나 사용, 허용되면 0 아니면 다음 토큰까지 대기할 초"""
+
+    def reset(self):
+        """fork 직후 부모 프로세스에서 물려받은 연결 참조 폐기"""
+
+
+class InMemoryRateLimiter(RateLimiter):
+    """워커 프로세스 내 토큰 버킷 (REDIS_URL이 없을 때, 워커마다 따로 계산)"""
+
+    def __init__(self, rate: float, burst: int, max_keys: int = 100000):
+        super().__init__(rate, burst)
+        # 가득 찰 때까지 걸리는 시간이 지나면 새 버킷과 같으므로 그 뒤엔 버림
+        self._buckets = TTLCache(max_size=max_keys, ttl_seconds=burst / rate + 1)
+
+    async def acquire(self, key: str) -> float:
+        now = time.monotonic()
+        tokens, updated_at = self._buckets.get(key) or (float(self.burst), now)
+        tokens = min(float(self.burst), tokens + (now - updated_at) * self.rate)
+
+        if tokens >= 1:
+            self._buckets.set(key, (tokens - 1, now))
+            return 0.0
+        self._buckets.set(key, (tokens, now))
+        return (1 - tokens) / self.rate
+
+
+class RedisRateLimiter(RateLimiter):
+    """Redis 토큰 버킷 (파드/워커 간 공유, Lua 스크립트로 원자적 갱신)"""
+
+    # KEYS[1]: 버킷, ARGV: rate, burst -> {허용 여부, 대기 ms}
+    ACQUIRE_SCRIPT = """
+    local rate = tonumber(ARGV[1])
+    local burst = tonumber(ARGV[2])
+    local now_parts = redis.call('time')
+    local now = tonumber(now_parts[1]) * 1000 + math.floor(tonumber(now_parts[2]) / 1000)
+
+    local bucket = redis.call('hmget', KEYS[1], 'tokens', 'ts')
+    local tokens = tonumber(bucket[1]) or burst
+    local ts = tonumber(bucket[2]) or now
+    tokens = math.min(burst, tokens + (now - ts) * rate / 1000)
+
+    local allowed = 0
+    local wait_ms = 0
+    if tokens >= 1 then
+        tokens = tokens - 1
+        allowed = 1
+    else
+        wait_ms = math.ceil((1 - tokens) * 1000 / rate)
+    end
+
+    redis.call('hset', KEYS[1], 'tokens', tostring(tokens), 'ts', now)
+    redis.call('pexpire', KEYS[1], math.ceil(burst * 1000 / rate) + 1000)
+    return {allowed, wait_ms}
+    """
+
+    def __init__(self, url: str, rate: float, burst: int):
+        super().__init__(rate, burst)
+        self.url = url
+        self._client = None
+
+    @property
+    def client(self):
+        # 워커 프로세스에서 처음 사용할 때 연결 풀 생성 (fork 이전에 만들지 않음)
+        if self._client is None:
+            import redis.asyncio as redis
+
+            self._client = redis.from_url(self.url)
+        return self._client
+
+    async def acquire(self, key: str) -> float:
+        try:
+            allowed, wait_ms = await self.client.eval(
+                self.ACQUIRE_SCRIPT, 1, f"healthplus:ratelimit:{key}", self.rate, self.burst
+            )
+        except Exception as e:
+            # Redis 장애 시 제한 없이 통과 (캐시와 같은 방식)
+            logger.warning("rate limit check failed: %s", e)
+            return 0.0
+        return 0.0 if allowed else int(wait_ms) / 1000
+
+    def reset(self):
+        self._client = None
+
+
+def create_rate_limiter(rate: float, burst: int) -> RateLimiter:
+    """설정에 따라 토큰 버킷 생성 (REDIS_URL이 있으면 Redis, 없으면 프로세스 내)"""
+    if settings.REDIS_URL:
+        return RedisRateLimiter(settings.REDIS_URL, rate, burst)
+    return InMemoryRateLimiter(rate, burst)
+
+
+rate_limiter = create_rate_limiter(settings.RATE_LIMIT_PER_SECOND, settings.RATE_LIMIT_BURST)
+auth_rate_limiter = create_rate_limiter(settings.RATE_LIMIT_AUTH_PER_SECOND, settings.RATE_LIMIT_AUTH_BURST)
+
+
+class AdmissionLimiter:
+    """워커별 동시 처리 요청 수 제한
+
+    자리가 없으면 최대 max_wait초까지 대기하고, 대기열이 max_queue를 넘거나
+    대기 시간을 넘기면 즉시 거절합니다(요청이 타임아웃까지 쌓이지 않도록).
+    """
+
+    def __init__(self, max_in_flight: int, max_queue: int, max_wait: float):
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self.max_wait = max_wait
+        self.in_flight = 0
+        self.waiting = 0
+        self._semaphore: Optional[asyncio.Semaphore] = None
+
+    async def acquire(self) -> bool:
+        if self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+
+        if self._semaphore.locked():
+            if self.waiting >= self.max_queue:
+                return False
+            self.waiting += 1
+            try:
+                await asyncio.wait_for(self._semaphore.acquire(), self.max_wait)
+            except asyncio.TimeoutError:
+                return False
+            finally:
+                self.waiting -= 1
+        else:
+            await self._semaphore.acquire()
+
+        self.in_flight += 1
+        return True
+
+    def release(self):
+        self.in_flight -= 1
+        self._semaphore.release()
+
+    def reset(self):
+        """fork 직후 부모 프로세스의 상태 폐기"""
+        self.in_flight = 0
+        self.waiting = 0
+        self._semaphore = None
+
+
+admission_limiter = AdmissionLimiter(
+    settings.ADMISSION_MAX_IN_FLIGHT,
+    settings.ADMISSION_MAX_QUEUE,
+    settings.ADMISSION_MAX_WAIT_SECONDS
+)
+
+
+class AdmissionMiddleware:
+    """부하 제어 ASGI 미들웨어
+
+    1. 사용자(토큰의 sub, 없으면 클라이언트 IP)별 토큰 버킷 -> 429
+       (인증 경로는 클라이언트 IP별 별도 버킷)
+    2. 워커별 동시 처리 수 제한, 대기 초과 시 -> 503
+    거절은 앱(DB 접근)에 도달하기 전에 Retry-After와 함께 바로 응답합니다.
+    """
+
+    def __init__(self, app: Any):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if (
+            scope["type"] != "http"
+            or not settings.ADMISSION_CONTROL_ENABLED
+            or scope["path"] in EXEMPT_PATHS
+            or scope["method"] == "OPTIONS"
+        ):
+            await self.app(scope, receive, send)
+            return
+
+        if settings.RATE_LIMIT_ENABLED:
+            if scope["path"] in AUTH_PATHS:
+                retry_after = await auth_rate_limiter.acquire(f"auth:ip:{client_ip(scope)}")
+            else:
+                retry_after = await rate_limiter.acquire(_client_key(scope))
+            if retry_after > 0:
+                REQUESTS_REJECTED.labels("rate_limited").inc()
+                await _reject(send, 429, "요청이 너무 많습니다. 잠시 후 다시 시도해주세요", retry_after)
+                return
+
+        if not await admission_limiter.acquire():
+            REQUESTS_REJECTED.labels("overloaded").inc()
+            await _reject(
+                send, 503, "서버가 혼잡합니다. 잠시 후 다시 시도해주세요",
+                settings.ADMISSION_RETRY_AFTER_SECONDS
+            )
+            return
+
+        try:
+            await self.app(scope, receive, send)
+        finally:
+            admission_limiter.release()
+
+
+def _client_key(scope) -> str:
+    """토큰 버킷 키 (검증된 토큰의 사용자 ID, 없으면 클라이언트 IP)"""
+    token = _bearer_token(scope)
+    if token:
+        try:
+            payload = jwt.decode(token, settings.JWT_SECRET, algorithms=[settings.JWT_ALGORITHM])
+            if payload.get("sub"):
+                return f"user:{payload['sub']}"
+        except JWTError:
+            pass
+
+    return f"ip:{client_ip(scope)}"
+
+
+def client_ip(scope) -> str:
+    """클라이언트 IP
+
+    RATE_LIMIT_TRUSTED_PROXY_COUNT개의 프록시(ingress 등) 뒤에서는 X-Forwarded-For의
+    오른쪽에서 그 개수번째 값(가장 바깥 신뢰 프록시가 본 주소)을 사용합니다.
+    그보다 왼쪽 값은 클라이언트가 임의로 넣을 수 있으므로 쓰지 않습니다.
+    """
+    trusted = settings.RATE_LIMIT_TRUSTED_PROXY_COUNT
+    if trusted > 0:
+        forwarded = [
+            address.strip()
+            for name, value in scope.get("headers", [])
+            if name == b"x-forwarded-for"
+            for address in value.decode("latin-1").split(",")
+        ]
+        if len(forwarded) >= trusted:
+            return forwarded[-trusted]
+
+    client = scope.get("client")
+    return client[0] if client else "unknown"
+
+
+def _bearer_token(scope) -> Optional[str]:
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            return token.strip() if scheme.lower() == "bearer" else None
+    return None
+
+
+async def _reject(send, status_code: int, detail: str, retry_after: float):
+    body = json.dumps({"detail": detail}, ensure_ascii=False).encode()
+    await send({
+        "type": "http.response.start",
+        "status": status_code,
+        "headers": [
+            (b"content-type", b"application/json"),
+            (b"content-length", str(len(body)).encode()),
+            (b"retry-after", str(max(math.ceil(retry_after), 1)).encode()),
+        ],
+    })
+    await send({"type": "http.response.body", "body": body})
@@ -0,0 +1,306 @@
+import functools
+import inspect
+import json
+import logging
+import time
+from abc import ABC, abstractmethod
+from collections import OrderedDict
+from typing import Any, Callable, Hashable, Optional, Union, get_type_hints
+
+from pydantic import TypeAdapter
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class TTLCache:
+    """TTL + LRU 인메모리 캐시 (워커 프로세스 단위)"""
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 300):
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._data: "OrderedDict[Hashable, tuple]" = OrderedDict()
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        """캐시 조회 (만료된 항목은 제거)"""
+        item = self._data.get(key)
+        if item is None:
+            return None
+
+        value, expires_at = item
+        if expires_at <= time.monotonic():
+            del self._data[key]
+            return None
+
+        self._data.move_to_end(key)
+        return value
+
+    def set(self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None):
+        """캐시 저장 (용량 초과 시 가장 오래 사용되지 않은 항목 제거)"""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._data[key] = (value, time.monotonic() + ttl)
+        self._data.move_to_end(key)
+
+        while len(self._data) > self.max_size:
+            self._data.popitem(last=False)
+
+    def delete(self, key: Hashable):
+        """캐시 항목 삭제"""
+        self._data.pop(key, None)
+
+    def delete_where(self, predicate: Callable[[Hashable], bool]):
+        """조건에 맞는 키의 캐시 항목 모두 삭제"""
+        for key in [key for key in self._data if predicate(key)]:
+            del self._data[key]
+
+    def clear(self):
+        """전체 캐시 삭제"""
+        self._data.clear()
+
+    def __len__(self) -> int:
+        return len(self._data)
+
+
+class CacheBackend(ABC):
+    """캐시 백엔드 인터페이스 (값은 JSON 직렬화 가능한 객체)"""
+
+    @abstractmethod
+    async def get(self, key: str) -> Optional[Any]:
+        ...
+
+    @abstractmethod
+    async def set(self, key: str, value: Any, ttl_seconds: int):
+        ...
+
+    @abstractmethod
+    async def add(self, key: str, value: Any, ttl_seconds: int) -> bool:
+        """키가 없을 때만 저장"""
+
+    @abstractmethod
+    async def delete(self, *keys: str):
+        ...
+
+    async def ping(self):
+        """백엔드 연결 확인 (실패 시 예외)"""
+
+    def reset(self):
+        """fork 직후 부모 프로세스에서 물려받은 연결 참조 폐기"""
+
+
+class InMemoryCacheBackend(CacheBackend):
+    """프로세스 내 캐시 백엔드 (REDIS_URL이 없을 때 사용)"""
+
+    def __init__(self, max_size: int = 50000):
+        self._cache = TTLCache(max_size=max_size)
+
+    async def get(self, key: str) -> Optional[Any]:
+        return self._cache.get(key)
+
+    async def set(self, key: str, value: Any, ttl_seconds: int):
+        self._cache.set(key, value, ttl_seconds)
+
+    async def add(self, key: str, value: Any, ttl_seconds: int) -> bool:
+        if self._cache.get(key) is not None:
+            return False
+        self._cache.set(key, value, ttl_seconds)
+        return True
+
+    async def delete(self, *keys: str):
+        for key in keys:
+            self._cache.delete(key)
+
+
+class RedisCacheBackend(CacheBackend):
+    """Redis 캐시 백엔드 (gunicorn 워커 간 공유)"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self._client = None
+
+    @property
+    def client(self):
+        # 워커 프로세스에서 처음 사용할 때 연결 풀 생성 (fork 이전에 만들지 않음)
+        if self._client is None:
+            import redis.asyncio as redis
+
+            self._client = redis.from_url(self.url)
+        return self._client
+
+    async def get(self, key: str) -> Optional[Any]:
+        value = await self.client.get(key)
+        return json.loads(value) if value is not None else None
+
+    async def set(self, key: str, value: Any, ttl_seconds: int):
+        await self.client.set(key, json.dumps(value), ex=ttl_seconds)
+
+    async def add(self, key: str, value: Any, ttl_seconds: int) -> bool:
+        return bool(await self.client.set(key, json.dumps(value), ex=ttl_seconds, nx=True))
+
+    async def delete(self, *keys: str):
+        if keys:
+            await self.client.delete(*keys)
+
+    async def ping(self):
+        await self.client.ping()
+
+    def reset(self):
+        self._client = None
+
+
+class Cache:
+    """공유 캐시 (사용자/범위별 키 버전 관리)
+
+    키 형식: {prefix}:{namespace}:{user_id}:{version}:{args}
+    무효화는 (user_id, scope)의 버전을 새 값으로 바꾸는 방식이라 키를 스캔하지 않습니다.
+    백엔드 오류 시에는 캐시 없이 동작합니다.
+    """
+
+    def __init__(self, backend: CacheBackend, prefix: str = "healthplus", shared: bool = False):
+        self.backend = backend
+        self.prefix = prefix
+        self.shared = shared
+
+    @property
+    def enabled(self) -> bool:
+        """응답 캐싱 사용 여부
+
+        무효화(버전 교체)가 모든 워커에 보여야 하므로 공유 백엔드(Redis)일 때만 켜고,
+        프로세스 내 캐시는 CACHE_IN_PROCESS_FALLBACK으로 명시했을 때(워커 1개)만 사용합니다.
+        """
+        return settings.CACHE_ENABLED and (self.shared or settings.CACHE_IN_PROCESS_FALLBACK)
+
+    def _version_key(self, user_id: str, scope: str) -> str:
+        return f"{self.prefix}:ver:{scope}:{user_id}"
+
+    async def get_version(self, user_id: str, scope: str) -> str:
+        """(user_id, scope)의 현재 키 버전 조회 (없으면 새로 발급)"""
+        key = self._version_key(user_id, scope)
+        version = await self.backend.get(key)
+        if version is None:
+            await self.backend.add(key, str(time.time_ns()), settings.CACHE_VERSION_TTL_SECONDS)
+            version = await self.backend.get(key)
+        return version
+
+    async def build_key(self, namespace: str, user_id: str, scope: str, *args: Any) -> str:
+        """버전이 포함된 캐시 키 생성"""
+        version = await self.get_version(user_id, scope)
+        suffix = ":".join(_key_part(arg) for arg in args)
+        return f"{self.prefix}:{namespace}:{user_id}:{version}:{suffix}"
+
+    async def get(self, key: str) -> Optional[Any]:
+        try:
+            return await self.backend.get(key)
+        except Exception as e:
+            logger.warning("cache get failed: %s", e)
+            return None
+
+    async def set(self, key: str, value: Any, ttl_seconds: Optional[int] = None):
+        try:
+            await self.backend.set(key, value, ttl_seconds or settings.CACHE_DEFAULT_TTL_SECONDS)
+        except Exception as e:
+            logger.warning("cache set failed: %s", e)
+
+    async def add(self, key: str, value: Any, ttl_seconds: Optional[int] = None) -> bool:
+        """키가 없을 때만 저장 (백엔드 오류 시 저장된 것으로 간주)"""
+        try:
+            return await self.backend.add(key, value, ttl_seconds or settings.CACHE_DEFAULT_TTL_SECONDS)
+        except Exception as e:
+            logger.warning("cache add failed: %s", e)
+            return True
+
+    async def delete(self, *keys: str):
+        try:
+            await self.backend.delete(*keys)
+        except Exception as e:
+            logger.warning("cache delete failed: %s", e)
+
+    async def invalidate(self, user_id: str, *scopes: str):
+        """사용자의 범위별 캐시 전체 무효화 (버전 교체)"""
+        try:
+            for scope in scopes:
+                await self.backend.set(
+                    self._version_key(user_id, scope),
+                    str(time.time_ns()),
+                    settings.CACHE_VERSION_TTL_SECONDS
+                )
+        except Exception as e:
+            logger.warning("cache invalidate failed: %s", e)
+
+    async def delete_cached(self, namespace: str, user_id: str, scope: str, *args: Any):
+        """특정 인자의 캐시 항목 삭제"""
+        try:
+            key = await self.build_key(namespace, user_id, scope, *args)
+        except Exception as e:
+            logger.warning("cache delete failed: %s", e)
+            return
+        await self.delete(key)
+
+
+def _key_part(value: Any) -> str:
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    if isinstance(value, (list, tuple, set)):
+        return ",".join(sorted(_key_part(item) for item in value))
+    return str(value)
+
+
+def create_cache() -> Cache:
+    """설정에 따라 캐시 생성 (REDIS_URL이 있으면 Redis, 없으면 프로세스 내 캐시)"""
+    if settings.REDIS_URL:
+        return Cache(RedisCacheBackend(settings.REDIS_URL), shared=True)
+    return Cache(InMemoryCacheBackend())
+
+
+cache = create_cache()
+
+
+def cached(
+    namespace: str,
+    scope: str,
+    ttl: Union[int, Callable[..., int], None] = None,
+):
+    """서비스 조회 메서드용 read-through 캐시 데코레이터
+
+    메서드 시그니처는 (self, user_id, ...) 형태여야 하며, 위치/키워드 인자를
+    시그니처에 맞춰 정리한 값(기본값 포함)으로 키를 만듭니다.
+    반환 타입 힌트로 캐시된 JSON 값을 다시 모델로 변환합니다.
+    """
+
+    def decorator(func):
+        adapter = None
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        async def wrapper(*args, **kwargs):
+            nonlocal adapter
+            if not cache.enabled:
+                return await func(*args, **kwargs)
+
+            if adapter is None:
+                adapter = TypeAdapter(get_type_hints(func)["return"])
+
+            bound = signature.bind(*args, **kwargs)
+            bound.apply_defaults()
+            _, user_id, *key_args = bound.arguments.values()
+
+            try:
+                key = await cache.build_key(namespace, user_id, scope, *key_args)
+            except Exception as e:
+                logger.warning("cache key build failed: %s", e)
+                return await func(*args, **kwargs)
+
+            hit = await cache.get(key)
+            if hit is not None:
+                return adapter.validate_python(hit)
+
+            result = await func(*args, **kwargs)
+            ttl_seconds = ttl(user_id, *key_args) if callable(ttl) else ttl
+            # 검증 없이 만든 응답 모델(FAST_SERIALIZATION)은 DB 값 그대로 저장
+            await cache.set(key, adapter.dump_python(result, mode="json", warnings=False), ttl_seconds)
+            return result
+
+        return wrapper
+
+    return decorator
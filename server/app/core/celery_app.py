@@ -0,0 +1,86 @@
+import asyncio
+import functools
+import logging
+from typing import Any, Callable, Coroutine, Dict, Optional, Set
+
+from celery import Celery
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+BROKER_URL = settings.CELERY_BROKER_URL or settings.REDIS_URL
+
+# 브로커가 없으면 워커 없이 앱 프로세스에서 실행 (로컬 개발용)
+EAGER = settings.CELERY_TASK_ALWAYS_EAGER or not BROKER_URL
+
+celery_app = Celery("healthplus", broker=BROKER_URL or "memory://", include=["app.jobs.tasks"])
+celery_app.conf.update(
+    task_serializer="json",
+    accept_content=["json"],
+    task_ignore_result=True,
+    task_acks_late=True,
+    worker_prefetch_multiplier=1,
+    task_always_eager=EAGER,
+    broker_connection_retry_on_startup=True,
+    timezone=settings.APP_TIMEZONE,
+)
+
+# 작업 이름 -> 비동기 구현 (eager 모드에서 현재 이벤트 루프로 실행할 때 사용)
+_coroutines: Dict[str, Callable[..., Coroutine]] = {}
+
+# eager 모드 백그라운드 작업 참조 (완료 전 GC 방지)
+_background_tasks: Set[asyncio.Task] = set()
+
+_worker_loop: Optional[asyncio.AbstractEventLoop] = None
+
+
+def async_task(name: str, **options):
+    """비동기 함수를 Celery 작업으로 등록
+
+    워커에서는 프로세스별로 유지되는 이벤트 루프에서 실행합니다
+    (Supabase 클라이언트의 커넥션 풀이 루프에 묶여 있으므로 작업마다 새 루프를 만들지 않음).
+    """
+
+    def decorator(func: Callable[..., Coroutine]):
+        _coroutines[name] = func
+
+        @celery_app.task(name=name, **options)
+        @functools.wraps(func)
+        def task(*args: Any):
+            return _get_worker_loop().run_until_complete(func(*args))
+
+        return task
+
+    return decorator
+
+
+async def enqueue(task: Any, *args: Any):
+    """작업 실행 요청 (요청 처리를 기다리게 하지 않음)
+
+    eager 모드에서는 현재 이벤트 루프의 백그라운드 작업으로 실행하고,
+    그 외에는 브로커에 전달합니다. 인자는 JSON 직렬화 가능해야 합니다.
+    """
+    if EAGER:
+        background = asyncio.create_task(_coroutines[task.name](*args))
+        _background_tasks.add(background)
+        background.add_done_callback(_on_background_done)
+        return
+
+    # 브로커 전송은 동기 I/O이므로 이벤트 루프를 막지 않도록 스레드에서 실행
+    await asyncio.to_thread(task.apply_async, args=args)
+
+
+def _on_background_done(background: asyncio.Task):
+    _background_tasks.discard(background)
+    if not background.cancelled() and background.exception() is not None:
+        logger.error("background task failed", exc_info=background.exception())
+
+
+def _get_worker_loop() -> asyncio.AbstractEventLoop:
+    global _worker_loop
+    if _worker_loop is None or _worker_loop.is_closed():
+        _worker_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_worker_loop)
+    return _worker_loop
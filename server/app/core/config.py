@@ -1,9 +1,20 @@
 import os
 from typing import Optional
-from pydantic import Field
+from pydantic import Field, model_validator
 from pydantic_settings import BaseSettings
 
 
+def _env_file() -> str:
+    """환경에 따라 다른 .env 파일 로드"""
+    environment = os.getenv("ENVIRONMENT", "development")
+    env_file = f".env.{environment}"
+
+    # 환경별 파일이 없으면 기본 .env 파일 사용
+    if not os.path.exists(env_file):
+        return ".env"
+    return env_file
+
+
 class Settings(BaseSettings):
     """애플리케이션 설정"""
 
@@ -14,13 +25,119 @@ class Settings(BaseSettings):
 
     # JWT 설정
     JWT_SECRET: str = Field(..., env="JWT_SECRET")
+    # 리프레시 토큰을 쓰지 않을 때의 액세스 토큰 유효 시간
     JWT_EXPIRY_HOURS: int = Field(24, env="JWT_EXPIRY_HOURS")
+    # 리프레시 토큰을 쓸 때의 액세스 토큰 유효 시간 (짧게 두고 /refresh로 재발급)
+    JWT_ACCESS_TOKEN_EXPIRY_MINUTES: int = Field(15, env="JWT_ACCESS_TOKEN_EXPIRY_MINUTES")
     JWT_ALGORITHM: str = "HS256"
+    # 리프레시 토큰 (사용할 때마다 새 토큰으로 교체, REDIS_URL이 있으면 Redis, 없으면 DB에 저장)
+    REFRESH_TOKEN_ENABLED: bool = Field(True, env="REFRESH_TOKEN_ENABLED")
+    REFRESH_TOKEN_EXPIRY_DAYS: int = Field(30, env="REFRESH_TOKEN_EXPIRY_DAYS")
+    # 사용 직후 같은 토큰의 재시도(동시 요청, 응답 유실)는 계열을 폐기하지 않고 새 토큰 발급
+    REFRESH_TOKEN_REUSE_GRACE_SECONDS: int = Field(30, env="REFRESH_TOKEN_REUSE_GRACE_SECONDS")
+
+    # 인증 모드 설정
+    # remote: 매 요청마다 Supabase에서 사용자/프로필 조회
+    # local: 검증된 JWT 클레임과 공유 캐시(REDIS_URL)의 사용자 정보로 인증 (캐시 미스 시 프로필만 조회)
+    AUTH_MODE: str = Field("remote", env="AUTH_MODE")
+    PRINCIPAL_CACHE_TTL_SECONDS: int = Field(300, env="PRINCIPAL_CACHE_TTL_SECONDS")
+
+    # 데이터베이스(PostgREST) 커넥션 풀 설정 (워커 프로세스당)
+    DB_POOL_MAX_CONNECTIONS: int = Field(200, env="DB_POOL_MAX_CONNECTIONS")
+    DB_POOL_MAX_KEEPALIVE_CONNECTIONS: int = Field(50, env="DB_POOL_MAX_KEEPALIVE_CONNECTIONS")
+    # 워커 시작 시 트래픽을 받기 전에 미리 열어 둘 연결 수 (동시 조회로 워밍업)
+    DB_POOL_WARMUP_CONNECTIONS: int = Field(4, env="DB_POOL_WARMUP_CONNECTIONS")
+
+    # 저장소 백엔드 설정 (서비스 역할 조회 경로)
+    # postgrest: Supabase PostgREST(HTTP) 경유, asyncpg: DATABASE_URL로 Postgres 직접 연결
+    STORAGE_BACKEND: str = Field("postgrest", env="STORAGE_BACKEND")
+    DATABASE_URL: Optional[str] = Field(None, env="DATABASE_URL")
+    PG_POOL_MIN_SIZE: int = Field(2, env="PG_POOL_MIN_SIZE")
+    PG_POOL_MAX_SIZE: int = Field(10, env="PG_POOL_MAX_SIZE")  # 워커 프로세스당
+    # 커넥션별 prepared statement 캐시 크기 (PgBouncer transaction 모드면 0)
+    PG_STATEMENT_CACHE_SIZE: int = Field(100, env="PG_STATEMENT_CACHE_SIZE")
+
+    # 공유 캐시 설정 (REDIS_URL이 있을 때 응답 캐싱, 없으면 캐시 없이 조회)
+    CACHE_ENABLED: bool = Field(True, env="CACHE_ENABLED")
+    # REDIS_URL 없이 프로세스 내 캐시로 응답 캐싱 (무효화가 다른 워커에 전달되지 않으므로 워커 1개일 때만)
+    CACHE_IN_PROCESS_FALLBACK: bool = Field(False, env="CACHE_IN_PROCESS_FALLBACK")
+    CACHE_DEFAULT_TTL_SECONDS: int = Field(300, env="CACHE_DEFAULT_TTL_SECONDS")
+    CACHE_VERSION_TTL_SECONDS: int = Field(604800, env="CACHE_VERSION_TTL_SECONDS")
+
+    # 통계 캐시 설정 (이번 달/미래 달은 짧게, 지난 달은 길게)
+    STATISTICS_CACHE_TTL_SECONDS: int = Field(300, env="STATISTICS_CACHE_TTL_SECONDS")
+    STATISTICS_PAST_MONTH_CACHE_TTL_SECONDS: int = Field(86400, env="STATISTICS_PAST_MONTH_CACHE_TTL_SECONDS")
+
+    # 쓰기 요청 Idempotency-Key 설정 (첫 응답을 공유 캐시에 저장해 재시도 시 재생)
+    IDEMPOTENCY_ENABLED: bool = Field(True, env="IDEMPOTENCY_ENABLED")
+    IDEMPOTENCY_TTL_SECONDS: int = Field(3600, env="IDEMPOTENCY_TTL_SECONDS")
+    # 첫 요청 처리 중 표시 유지 시간 (gunicorn 타임아웃 이상)
+    IDEMPOTENCY_LOCK_TTL_SECONDS: int = Field(60, env="IDEMPOTENCY_LOCK_TTL_SECONDS")
+
+    # 델타 동기화(/v1/sync) 설정
+    SYNC_PAGE_SIZE: int = Field(500, env="SYNC_PAGE_SIZE")
+    # 커서 위치를 이만큼 앞당겨 늦게 커밋된 쓰기를 다음 동기화에서 다시 읽음 (중복은 클라이언트가 덮어씀)
+    SYNC_SAFETY_WINDOW_SECONDS: float = Field(10.0, env="SYNC_SAFETY_WINDOW_SECONDS")
+    # 삭제 기록 보존 기간 (이보다 오래된 커서는 410, 전체 동기화 필요)
+    SYNC_TOMBSTONE_RETENTION_DAYS: int = Field(30, env="SYNC_TOMBSTONE_RETENTION_DAYS")
+
+    # 전체 사용자 복용 통계 배치 (python -m app.jobs.population_analytics) 한 번에 읽는 기록 수
+    ANALYTICS_CHUNK_SIZE: int = Field(1000, env="ANALYTICS_CHUNK_SIZE")
+
+    # 약물 이미지 업로드 설정 (Supabase Storage 비공개 버킷에 저장, 모든 파드가 공유)
+    MEDIA_STORAGE_BUCKET: str = Field("medication-images", env="MEDIA_STORAGE_BUCKET")
+    # 업로드/썸네일 생성 중 작업 파일 위치 (기본: 시스템 임시 디렉터리, 처리 후 삭제)
+    MEDIA_WORK_DIR: Optional[str] = Field(None, env="MEDIA_WORK_DIR")
+    MEDIA_MAX_UPLOAD_BYTES: int = Field(10 * 1024 * 1024, env="MEDIA_MAX_UPLOAD_BYTES")
+    # 디코딩 허용 최대 픽셀 수 (압축 폭탄 방지)
+    MEDIA_MAX_IMAGE_PIXELS: int = Field(40_000_000, env="MEDIA_MAX_IMAGE_PIXELS")
+    # 파생 이미지 긴 변 최대 픽셀 (목록 화면: thumbnail, 상세 화면: medium)
+    MEDIA_THUMBNAIL_SIZE: int = Field(160, env="MEDIA_THUMBNAIL_SIZE")
+    MEDIA_MEDIUM_SIZE: int = Field(640, env="MEDIA_MEDIUM_SIZE")
+    # 워커별 썸네일 생성 프로세스 수
+    MEDIA_PROCESS_WORKERS: int = Field(2, env="MEDIA_PROCESS_WORKERS")
+    MEDIA_CACHE_MAX_AGE_SECONDS: int = Field(31536000, env="MEDIA_CACHE_MAX_AGE_SECONDS")
+
+    # 백그라운드 작업(Celery) 설정
+    # 브로커가 없거나 CELERY_TASK_ALWAYS_EAGER이면 워커 없이 앱 프로세스에서 실행
+    CELERY_BROKER_URL: Optional[str] = Field(None, env="CELERY_BROKER_URL")  # 없으면 REDIS_URL
+    CELERY_TASK_ALWAYS_EAGER: bool = Field(False, env="CELERY_TASK_ALWAYS_EAGER")
+
+    # 메트릭 설정 (/metrics, Prometheus 형식)
+    METRICS_ENABLED: bool = Field(True, env="METRICS_ENABLED")
+    EVENT_LOOP_LAG_INTERVAL_SECONDS: float = Field(1.0, env="EVENT_LOOP_LAG_INTERVAL_SECONDS")
+
+    # 부하 제어 설정 (요청이 DB에 닿기 전에 거절)
+    ADMISSION_CONTROL_ENABLED: bool = Field(True, env="ADMISSION_CONTROL_ENABLED")
+    # 워커별 동시 처리 요청 수, 대기열 길이, 최대 대기 시간 (넘으면 503)
+    ADMISSION_MAX_IN_FLIGHT: int = Field(100, env="ADMISSION_MAX_IN_FLIGHT")
+    ADMISSION_MAX_QUEUE: int = Field(200, env="ADMISSION_MAX_QUEUE")
+    ADMISSION_MAX_WAIT_SECONDS: float = Field(2.0, env="ADMISSION_MAX_WAIT_SECONDS")
+    ADMISSION_RETRY_AFTER_SECONDS: int = Field(2, env="ADMISSION_RETRY_AFTER_SECONDS")
+    # 사용자별 토큰 버킷 (REDIS_URL이 있으면 Redis로 공유, 넘으면 429)
+    RATE_LIMIT_ENABLED: bool = Field(True, env="RATE_LIMIT_ENABLED")
+    RATE_LIMIT_PER_SECOND: float = Field(5.0, env="RATE_LIMIT_PER_SECOND")
+    RATE_LIMIT_BURST: int = Field(30, env="RATE_LIMIT_BURST")
+    # 로그인/가입/토큰 갱신은 클라이언트 IP별 별도 버킷 (무차별 대입 방지, 일반 요청 한도와 분리)
+    RATE_LIMIT_AUTH_PER_SECOND: float = Field(0.5, env="RATE_LIMIT_AUTH_PER_SECOND")
+    RATE_LIMIT_AUTH_BURST: int = Field(10, env="RATE_LIMIT_AUTH_BURST")
+    # 앱 앞단 신뢰 프록시 수 (0이면 연결 주소, ingress 뒤면 1: X-Forwarded-For 오른쪽에서 N번째 값 사용)
+    RATE_LIMIT_TRUSTED_PROXY_COUNT: int = Field(0, env="RATE_LIMIT_TRUSTED_PROXY_COUNT")
+
+    # 준비 상태(/ready) 설정: 의존성 상태를 주기적으로 확인해 캐시
+    READINESS_CHECK_INTERVAL_SECONDS: float = Field(10.0, env="READINESS_CHECK_INTERVAL_SECONDS")
+    READINESS_CHECK_TIMEOUT_SECONDS: float = Field(3.0, env="READINESS_CHECK_TIMEOUT_SECONDS")
+
+    # 응답 직렬화 설정
+    # true: 조회 응답을 DB 행에서 검증 없이 만들고 한 번에 JSON 직렬화 (response_model 재검증 생략)
+    FAST_SERIALIZATION: bool = Field(True, env="FAST_SERIALIZATION")
 
     # 앱 설정
     APP_NAME: str = Field("내 약 관리", env="APP_NAME")
     APP_VERSION: str = Field("1.0.0", env="APP_VERSION")
     APP_ENVIRONMENT: str = Field("development", env="APP_ENVIRONMENT")
+    # 사용자 현지 시간대 (복용 시간/날짜 기준)
+    APP_TIMEZONE: str = Field("Asia/Seoul", env="APP_TIMEZONE")
 
     # 환경 설정
     DEBUG: bool = Field(True, env="DEBUG")
@@ -30,25 +147,37 @@ class Settings(BaseSettings):
     NOTIFICATION_ENABLED: bool = Field(True, env="NOTIFICATION_ENABLED")
     PUSH_NOTIFICATION_ENABLED: bool = Field(True, env="PUSH_NOTIFICATION_ENABLED")
 
+    # 복용 알림 스케줄러 설정 (워커 중 리더 하나에서만 실행)
+    REMINDER_SCHEDULER_ENABLED: bool = Field(False, env="REMINDER_SCHEDULER_ENABLED")
+    REMINDER_BATCH_SIZE: int = Field(500, env="REMINDER_BATCH_SIZE")
+    REMINDER_SYNC_INTERVAL_SECONDS: int = Field(30, env="REMINDER_SYNC_INTERVAL_SECONDS")
+    # 리더 교체 시 이전 리더의 마지막 발송 시각부터 이어서 보낼 최대 과거 범위 (오래된 알림은 건너뜀)
+    REMINDER_CATCHUP_SECONDS: int = Field(600, env="REMINDER_CATCHUP_SECONDS")
+    # 발송기: log(로컬 스텁) 또는 "모듈:클래스"
+    REMINDER_SENDER: str = Field("log", env="REMINDER_SENDER")
+
+    # 리더 선출 설정 (REDIS_URL이 있으면 Redis 키, 없으면 LEADER_LOCK_DIR의 파일 잠금)
+    LEADER_LOCK_TTL_SECONDS: int = Field(30, env="LEADER_LOCK_TTL_SECONDS")
+    LEADER_LOCK_DIR: str = Field("/tmp", env="LEADER_LOCK_DIR")
+
     # 로깅 설정
     LOG_LEVEL: str = Field("debug", env="LOG_LEVEL")
 
     # Redis 설정
     REDIS_URL: Optional[str] = Field(None, env="REDIS_URL")
 
+    @model_validator(mode="after")
+    def check_storage_backend(self) -> "Settings":
+        # 잘못된 저장소 설정은 첫 조회가 아니라 시작 시 실패
+        if self.STORAGE_BACKEND not in ("postgrest", "asyncpg"):
+            raise ValueError(f"STORAGE_BACKEND는 postgrest 또는 asyncpg여야 합니다: {self.STORAGE_BACKEND}")
+        if self.STORAGE_BACKEND == "asyncpg" and not self.DATABASE_URL:
+            raise ValueError("STORAGE_BACKEND=asyncpg이면 DATABASE_URL이 필요합니다")
+        return self
+
     class Config:
         case_sensitive = True
-
-        @property
-        def env_file(self):
-            """환경에 따라 다른 .env 파일 로드"""
-            environment = os.getenv("ENVIRONMENT", "development")
-            env_file = f".env.{environment}"
-
-            # 환경별 파일이 없으면 기본 .env 파일 사용
-            if not os.path.exists(env_file):
-                return ".env"
-            return env_file
+        env_file = _env_file()
 
 
 def get_settings() -> Settings:
@@ -1,24 +1,75 @@
 import asyncio
-from typing import Optional
-from supabase import create_client, Client, ClientOptions
+from typing import Any, Dict, List, Optional, Union
+
+import httpx
+from postgrest import AsyncPostgrestClient
+from postgrest.constants import DEFAULT_POSTGREST_CLIENT_TIMEOUT
+from supabase import AsyncClient, AsyncClientOptions
 from app.core.config import settings
+from app.core.metrics import track_db_call
+
+
+class PooledPostgrestClient(AsyncPostgrestClient):
+    """커넥션 풀 크기를 설정할 수 있는 PostgREST 비동기 클라이언트 (HTTP/2 keep-alive)"""
+
+    def create_session(
+        self,
+        base_url: str,
+        headers: Dict[str, str],
+        timeout: Union[int, float, httpx.Timeout],
+        verify: bool = True,
+        proxy: Optional[str] = None,
+    ) -> httpx.AsyncClient:
+        return httpx.AsyncClient(
+            base_url=base_url,
+            headers=headers,
+            timeout=timeout,
+            verify=verify,
+            proxy=proxy,
+            follow_redirects=True,
+            http2=True,
+            limits=httpx.Limits(
+                max_connections=settings.DB_POOL_MAX_CONNECTIONS,
+                max_keepalive_connections=settings.DB_POOL_MAX_KEEPALIVE_CONNECTIONS,
+            ),
+        )
+
+
+class PooledAsyncClient(AsyncClient):
+    """PooledPostgrestClient를 사용하는 Supabase 비동기 클라이언트"""
+
+    @staticmethod
+    def _init_postgrest_client(
+        rest_url: str,
+        headers: Dict[str, str],
+        schema: str,
+        timeout: Union[int, float, httpx.Timeout] = DEFAULT_POSTGREST_CLIENT_TIMEOUT,
+        verify: bool = True,
+    ) -> AsyncPostgrestClient:
+        return PooledPostgrestClient(
+            rest_url,
+            headers=headers,
+            schema=schema,
+            timeout=timeout,
+            verify=verify,
+        )
 
 
 class SupabaseClient:
-    """Supabase 클라이언트 싱글톤"""
+    """Supabase 비동기 클라이언트 싱글톤"""
 
-    _instance: Optional[Client] = None
-    _service_instance: Optional[Client] = None
+    _instance: Optional[AsyncClient] = None
+    _service_instance: Optional[AsyncClient] = None
 
     @classmethod
-    def get_client(cls) -> Client:
+    def get_client(cls) -> AsyncClient:
         """일반 클라이언트 인스턴스 반환"""
         if cls._instance is None:
-            options = ClientOptions(
+            options = AsyncClientOptions(
                 auto_refresh_token=True,
                 persist_session=True
             )
-            cls._instance = create_client(
+            cls._instance = PooledAsyncClient(
                 settings.SUPABASE_URL,
                 settings.SUPABASE_ANON_KEY,
                 options=options
@@ -26,23 +77,119 @@ class SupabaseClient:
         return cls._instance
 
     @classmethod
-    def get_service_client(cls) -> Client:
+    def get_service_client(cls) -> AsyncClient:
         """서비스 역할 클라이언트 인스턴스 반환"""
         if cls._service_instance is None:
-            options = ClientOptions(
+            options = AsyncClientOptions(
                 auto_refresh_token=False,
                 persist_session=False
             )
-            cls._service_instance = create_client(
+            cls._service_instance = PooledAsyncClient(
                 settings.SUPABASE_URL,
                 settings.SUPABASE_SERVICE_ROLE_KEY,
                 options=options
             )
         return cls._service_instance
 
+    @classmethod
+    async def close(cls):
+        """클라이언트별 HTTP 커넥션 풀(PostgREST/Storage/Auth) 닫기 (워커 종료 시)"""
+        for client in (cls._instance, cls._service_instance):
+            if client is None:
+                continue
+            # 사용하지 않은 하위 클라이언트는 새로 만들지 않도록 속성을 직접 확인
+            for sub_client in (client._postgrest, client._storage):
+                if sub_client is not None:
+                    await sub_client.aclose()
+            await client.auth.close()
+        cls._instance = None
+        cls._service_instance = None
+
+    @classmethod
+    def reset(cls):
+        """fork 직후 부모 프로세스에서 물려받은 인스턴스 폐기
+
+        닫지 않고 참조만 버립니다(소켓을 부모와 공유하므로 닫으면 부모 연결까지 끊김).
+        다음 호출 시 워커 프로세스의 이벤트 루프에서 새로 만듭니다.
+        """
+        cls._instance = None
+        cls._service_instance = None
+
+
+class PostgresPool:
+    """asyncpg 커넥션 풀 (워커 프로세스당 하나, STORAGE_BACKEND=asyncpg일 때 사용)"""
+
+    _pool = None
+
+    @classmethod
+    async def get_pool(cls):
+        """풀 반환 (처음 호출 시 현재 이벤트 루프에서 생성)"""
+        if cls._pool is None:
+            import asyncpg
+
+            cls._pool = await asyncpg.create_pool(
+                settings.DATABASE_URL,
+                min_size=settings.PG_POOL_MIN_SIZE,
+                max_size=settings.PG_POOL_MAX_SIZE,
+                statement_cache_size=settings.PG_STATEMENT_CACHE_SIZE,
+            )
+        return cls._pool
+
+    @classmethod
+    async def close(cls):
+        if cls._pool is not None:
+            await cls._pool.close()
+            cls._pool = None
+
+    @classmethod
+    def reset(cls):
+        """fork 직후 부모 프로세스에서 물려받은 풀 참조 폐기 (닫지 않음)"""
+        cls._pool = None
+
+
+async def pg_fetch(name: str, sql: str, *args: Any) -> List[Any]:
+    """Postgres 직접 조회 (메트릭 기록)
+
+    asyncpg는 커넥션별로 SQL을 prepare해 캐시하므로 같은 SQL 상수를 쓰는
+    반복 조회는 prepared statement로 실행됩니다.
+    """
+    pool = await PostgresPool.get_pool()
+    async with track_db_call(name, "SQL"):
+        return await pool.fetch(sql, *args)
+
+
+async def execute(query: Any) -> Any:
+    """PostgREST 쿼리 실행 (모든 데이터 접근이 거치는 공통 경로, 메트릭 기록)"""
+    async with track_db_call(query.path.lstrip("/"), query.http_method):
+        return await query.execute()
+
+
+def with_returning(query: Any, columns: str) -> Any:
+    """쓰기 쿼리(insert/upsert/update)가 반환할 컬럼 지정
+
+    PostgREST 임베딩(예: "*, medications(name)")을 쓰면 연관 테이블 값을
+    추가 조회 없이 같은 요청으로 받을 수 있습니다.
+    """
+    query.params = query.params.set("select", columns)
+    return query
+
+
+async def ping_db():
+    """PostgREST 연결 확인 (한 행만 읽는 가벼운 조회)"""
+    await execute(
+        get_service_supabase().table("user_profiles").select("user_id").limit(1)
+    )
+
+
+async def ping_postgres():
+    """Postgres 직접 연결 풀 확인"""
+    pool = await PostgresPool.get_pool()
+    async with track_db_call("postgres", "PING"):
+        await pool.fetchval("SELECT 1")
+
 
 async def init_db():
-    """데이터베이스 초기화"""
+    """데이터베이스 초기화 (워커 프로세스의 이벤트 루프에서 클라이언트 생성 후 연결 워밍업)"""
     try:
         client = SupabaseClient.get_client()
         print("✅ Supabase 클라이언트 초기화 완료")
@@ -51,9 +198,13 @@ async def init_db():
         service_client = SupabaseClient.get_service_client()
         print("✅ Supabase 서비스 클라이언트 초기화 완료")
 
-        # 연결 테스트
-        response = service_client.table("user_profiles").select("count", count="exact").execute()
-        print(f"✅ 데이터베이스 연결 테스트 완료")
+        # 트래픽을 받기 전에 커넥션 풀에 연결을 미리 열어 둠
+        await asyncio.gather(*(ping_db() for _ in range(max(settings.DB_POOL_WARMUP_CONNECTIONS, 1))))
+        print(f"✅ 데이터베이스 연결 워밍업 완료")
+
+        if settings.STORAGE_BACKEND == "asyncpg":
+            await ping_postgres()
+            print("✅ Postgres 직접 연결 풀 초기화 완료")
 
     except Exception as e:
         print(f"❌ Supabase 초기화 실패: {e}")
@@ -62,11 +213,17 @@ async def init_db():
         pass
 
 
-def get_supabase() -> Client:
+async def close_db():
+    """데이터베이스 연결 정리 (PostgREST/Storage/Auth HTTP 풀과 asyncpg 풀)"""
+    await SupabaseClient.close()
+    await PostgresPool.close()
+
+
+def get_supabase() -> AsyncClient:
     """일반 Supabase 클라이언트 의존성"""
     return SupabaseClient.get_client()
 
 
-def get_service_supabase() -> Client:
+def get_service_supabase() -> AsyncClient:
     """서비스 Supabase 클라이언트 의존성"""
-    return SupabaseClient.get_service_client()
\ No newline at end of file
+    return SupabaseClient.get_service_client()
@@ -51,6 +51,20 @@ class ConflictError(APIException):
         super().__init__(detail=detail, status_code=409, error_code="CONFLICT")
 
 
+class GoneError(APIException):
+    """더 이상 제공하지 않는 리소스"""
+
+    def __init__(self, detail: str = "Resource no longer available"):
+        super().__init__(detail=detail, status_code=410, error_code="GONE")
+
+
+class PayloadTooLargeError(APIException):
+    """요청 본문 크기 초과"""
+
+    def __init__(self, detail: str = "Payload too large"):
+        super().__init__(detail=detail, status_code=413, error_code="PAYLOAD_TOO_LARGE")
+
+
 class ExternalServiceError(APIException):
     """외부 서비스 오류"""
 
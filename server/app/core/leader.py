@@ -0,0 +1,113 @@
+import fcntl
+import logging
+import os
+import uuid
+from abc import ABC, abstractmethod
+from typing import Optional
+
+from app.core.config import settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class LeaderLock(ABC):
+    """리더 선출 인터페이스 (여러 워커 중 하나만 작업을 실행)"""
+
+    @abstractmethod
+    async def acquire(self) -> bool:
+        """리더 자격 획득 또는 갱신 (리더이면 True)"""
+
+    @abstractmethod
+    async def release(self):
+        ...
+
+
+class FileLeaderLock(LeaderLock):
+    """파일 잠금 기반 리더 선출 (같은 호스트/파드의 gunicorn 워커 간)
+
+    잠금을 가진 프로세스가 종료되면 OS가 잠금을 해제하므로 다른 워커가 이어받습니다.
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self._fd: Optional[int] = None
+
+    async def acquire(self) -> bool:
+        if self._fd is not None:
+            return True
+
+        fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            fcntl.flock(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            os.close(fd)
+            return False
+
+        self._fd = fd
+        return True
+
+    async def release(self):
+        if self._fd is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+            os.close(self._fd)
+            self._fd = None
+
+
+class RedisLeaderLock(LeaderLock):
+    """Redis 키 기반 리더 선출 (여러 파드 간, TTL 만료 시 다른 워커가 이어받음)"""
+
+    # 내가 가진 잠금일 때만 만료 시간 연장/삭제
+    RENEW_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('pexpire', KEYS[1], ARGV[2])
+    end
+    return 0
+    """
+    RELEASE_SCRIPT = """
+    if redis.call('get', KEYS[1]) == ARGV[1] then
+        return redis.call('del', KEYS[1])
+    end
+    return 0
+    """
+
+    def __init__(self, url: str, key: str, ttl_seconds: int):
+        self.url = url
+        self.key = key
+        self.ttl_seconds = ttl_seconds
+        self.token = uuid.uuid4().hex
+        self._client = None
+
+    @property
+    def client(self):
+        # 워커 프로세스에서 처음 사용할 때 연결 풀 생성 (fork 이전에 만들지 않음)
+        if self._client is None:
+            import redis.asyncio as redis
+
+            self._client = redis.from_url(self.url)
+        return self._client
+
+    async def acquire(self) -> bool:
+        if await self.client.set(self.key, self.token, nx=True, ex=self.ttl_seconds):
+            return True
+        renewed = await self.client.eval(
+            self.RENEW_SCRIPT, 1, self.key, self.token, self.ttl_seconds * 1000
+        )
+        return bool(renewed)
+
+    async def release(self):
+        try:
+            await self.client.eval(self.RELEASE_SCRIPT, 1, self.key, self.token)
+        except Exception as e:
+            logger.warning("leader lock release failed: %s", e)
+
+
+def create_leader_lock(name: str) -> LeaderLock:
+    """설정에 따라 리더 잠금 생성 (REDIS_URL이 있으면 Redis, 없으면 파일 잠금)"""
+    if settings.REDIS_URL:
+        return RedisLeaderLock(
+            settings.REDIS_URL,
+            f"healthplus:leader:{name}",
+            settings.LEADER_LOCK_TTL_SECONDS
+        )
+    return FileLeaderLock(os.path.join(settings.LEADER_LOCK_DIR, f"healthplus_{name}.lock"))
@@ -0,0 +1,23 @@
+"""워커 프로세스 생명주기
+
+gunicorn preload_app이면 앱을 마스터에서 import한 뒤 워커를 fork합니다. 마스터에서 만들어진
+클라이언트/커넥션 풀을 워커가 같이 쓰지 않도록 fork 직후 참조를 버리고, 워커의 이벤트 루프에서
+새로 연 뒤(lifespan 시작) 트래픽을 받습니다.
+"""
+from app.core.admission import admission_limiter, auth_rate_limiter, rate_limiter
+from app.core.cache import cache
+from app.core.database import PostgresPool, SupabaseClient
+from app.core.readiness import readiness
+from app.services.media_service import media_service
+
+
+def reset_after_fork():
+    """fork 직후 워커에서 호출 (gunicorn post_fork 훅)"""
+    SupabaseClient.reset()
+    PostgresPool.reset()
+    cache.backend.reset()
+    rate_limiter.reset()
+    auth_rate_limiter.reset()
+    admission_limiter.reset()
+    readiness.reset()
+    media_service.reset()
@@ -0,0 +1,155 @@
+import asyncio
+import os
+import time
+from contextlib import asynccontextmanager
+from contextvars import ContextVar
+from typing import Any, Dict, List, Optional
+
+from prometheus_client import REGISTRY, CollectorRegistry, Counter, Histogram, generate_latest
+from prometheus_client import multiprocess
+
+from app.core.config import settings
+
+
+# gunicorn 멀티 프로세스 모드에서는 PROMETHEUS_MULTIPROC_DIR에 워커별 파일로 기록되고
+# /metrics 요청 시 모든 워커의 값을 합산합니다.
+
+REQUEST_LATENCY = Histogram(
+    "healthplus_http_request_duration_seconds",
+    "HTTP 요청 처리 시간",
+    ["method", "route", "status"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.075, 0.1, 0.25, 0.5, 0.75, 1.0, 2.5, 5.0, 10.0),
+)
+
+DB_QUERY_LATENCY = Histogram(
+    "healthplus_db_query_duration_seconds",
+    "데이터 접근(PostgREST/Auth) 호출 시간",
+    ["target", "operation"],
+    buckets=(0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+
+DB_QUERY_ERRORS = Counter(
+    "healthplus_db_query_errors_total",
+    "데이터 접근 호출 실패 수",
+    ["target", "operation"],
+)
+
+DB_CALLS_PER_REQUEST = Histogram(
+    "healthplus_db_calls_per_request",
+    "요청당 데이터 접근 호출 수",
+    ["route"],
+    buckets=(0, 1, 2, 3, 4, 5, 8, 13, 21),
+)
+
+EVENT_LOOP_LAG = Histogram(
+    "healthplus_event_loop_lag_seconds",
+    "실행 준비된 작업이 이벤트 루프에서 대기한 시간",
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+
+REMINDERS_DISPATCHED = Counter(
+    "healthplus_reminders_dispatched_total",
+    "발송한 복용 알림 수",
+    ["result"],
+)
+
+REQUESTS_REJECTED = Counter(
+    "healthplus_requests_rejected_total",
+    "부하 제어로 거절한 요청 수 (rate_limited: 429, overloaded: 503)",
+    ["reason"],
+)
+
+IDEMPOTENT_REPLAYS = Counter(
+    "healthplus_idempotent_replays_total",
+    "Idempotency-Key 재시도에 저장된 응답을 재생한 수",
+    ["operation"],
+)
+
+# 요청 단위 데이터 접근 호출 수 (미들웨어가 설정, execute가 증가)
+_db_calls: ContextVar[Optional[List[int]]] = ContextVar("db_calls", default=None)
+
+UNMATCHED_ROUTE = "<unmatched>"
+
+
+@asynccontextmanager
+async def track_db_call(target: str, operation: str):
+    """데이터 접근 호출 시간/실패 기록 및 요청당 호출 수 집계"""
+    counter = _db_calls.get()
+    if counter is not None:
+        counter[0] += 1
+
+    start = time.perf_counter()
+    try:
+        yield
+    except Exception:
+        DB_QUERY_ERRORS.labels(target, operation).inc()
+        raise
+    finally:
+        DB_QUERY_LATENCY.labels(target, operation).observe(time.perf_counter() - start)
+
+
+class MetricsMiddleware:
+    """라우트별 지연 시간과 요청당 DB 호출 수를 기록하는 ASGI 미들웨어"""
+
+    def __init__(self, app: Any):
+        self.app = app
+        self._route_paths: Optional[Dict[Any, str]] = None
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http" or not settings.METRICS_ENABLED:
+            await self.app(scope, receive, send)
+            return
+
+        status_code = 500
+
+        async def send_wrapper(message):
+            nonlocal status_code
+            if message["type"] == "http.response.start":
+                status_code = message["status"]
+            await send(message)
+
+        counter = [0]
+        token = _db_calls.set(counter)
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            _db_calls.reset(token)
+
+            route = self._route_path(scope)
+            REQUEST_LATENCY.labels(scope["method"], route, str(status_code)).observe(elapsed)
+            DB_CALLS_PER_REQUEST.labels(route).observe(counter[0])
+
+    def _route_path(self, scope) -> str:
+        # 라벨 카디널리티를 막기 위해 실제 경로 대신 라우트 템플릿 사용
+        endpoint = scope.get("endpoint")
+        if endpoint is None:
+            return UNMATCHED_ROUTE
+
+        if self._route_paths is None:
+            self._route_paths = {
+                route.endpoint: route.path
+                for route in scope["app"].routes
+                if hasattr(route, "endpoint")
+            }
+        return self._route_paths.get(endpoint, UNMATCHED_ROUTE)
+
+
+async def monitor_event_loop_lag(interval: float):
+    """이벤트 루프 지연 측정 (sleep이 예정보다 늦게 깨어난 시간)"""
+    while True:
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        EVENT_LOOP_LAG.observe(max(time.perf_counter() - start - interval, 0.0))
+
+
+def render_metrics() -> bytes:
+    """Prometheus 텍스트 형식으로 메트릭 출력"""
+    if os.environ.get("PROMETHEUS_MULTIPROC_DIR"):
+        registry = CollectorRegistry()
+        multiprocess.MultiProcessCollector(registry)
+    else:
+        registry = REGISTRY
+    return generate_latest(registry)
+
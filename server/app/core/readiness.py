@@ -0,0 +1,120 @@
+import asyncio
+import logging
+import time
+from typing import Awaitable, Callable, Dict, NamedTuple, Optional
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.database import ping_db, ping_postgres
+
+
+logger = logging.getLogger(__name__)
+
+
+class DependencyStatus(NamedTuple):
+    """의존성 확인 결과"""
+    ok: bool
+    latency_ms: float
+    checked_at: float  # time.monotonic()
+    error: Optional[str] = None
+
+
+class Readiness:
+    """워커 준비 상태 (/ready)
+
+    워밍업이 끝난 뒤 의존성(PostgREST, Redis, Postgres 직접 연결)을 주기적으로 확인해
+    결과를 캐시합니다. /ready는 캐시된 결과만 읽으므로 프로브가 DB에 부하를 주지 않습니다.
+    """
+
+    def __init__(self):
+        self.warmed = False
+        self.statuses: Dict[str, DependencyStatus] = {}
+        self._task: Optional[asyncio.Task] = None
+
+    def reset(self):
+        """fork 직후 부모 프로세스의 상태 폐기"""
+        self.warmed = False
+        self.statuses = {}
+        self._task = None
+
+    def checks(self) -> Dict[str, Callable[[], Awaitable]]:
+        """설정에 따라 확인할 의존성"""
+        checks = {"postgrest": ping_db}
+        if settings.REDIS_URL:
+            checks["redis"] = cache.backend.ping
+        if settings.STORAGE_BACKEND == "asyncpg":
+            checks["postgres"] = ping_postgres
+        return checks
+
+    async def run_checks(self):
+        """모든 의존성을 동시에 확인해 결과 갱신"""
+        names, checks = zip(*self.checks().items())
+        results = await asyncio.gather(*(self._check(check) for check in checks))
+        self.statuses = dict(zip(names, results))
+
+    async def _check(self, check: Callable[[], Awaitable]) -> DependencyStatus:
+        started = time.monotonic()
+        try:
+            await asyncio.wait_for(check(), settings.READINESS_CHECK_TIMEOUT_SECONDS)
+            error = None
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        finished = time.monotonic()
+        return DependencyStatus(
+            ok=error is None,
+            latency_ms=round((finished - started) * 1000, 2),
+            checked_at=finished,
+            error=error
+        )
+
+    def start(self):
+        """주기적 확인 시작 (워밍업 완료 후 호출)"""
+        self.warmed = True
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """확인 중단, 이후 /ready는 503 (종료 중인 워커로 트래픽이 가지 않도록)"""
+        self.warmed = False
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+
+    async def _run(self):
+        while True:
+            await asyncio.sleep(settings.READINESS_CHECK_INTERVAL_SECONDS)
+            try:
+                await self.run_checks()
+            except Exception as e:
+                logger.exception("readiness check failed: %s", e)
+
+    def is_ready(self) -> bool:
+        """워밍업 완료 + 최근 확인 결과가 모두 정상"""
+        if not self.warmed or not self.statuses:
+            return False
+        # 확인 루프가 멈춰 결과가 오래되면 준비되지 않은 것으로 봄
+        stale_before = time.monotonic() - 3 * settings.READINESS_CHECK_INTERVAL_SECONDS
+        return all(status.ok and status.checked_at >= stale_before for status in self.statuses.values())
+
+    def snapshot(self) -> dict:
+        now = time.monotonic()
+        return {
+            "status": "ready" if self.is_ready() else "not_ready",
+            "warmed": self.warmed,
+            "checks": {
+                name: {
+                    "ok": status.ok,
+                    "latency_ms": status.latency_ms,
+                    "age_seconds": round(now - status.checked_at, 1),
+                    "error": status.error,
+                }
+                for name, status in self.statuses.items()
+            },
+        }
+
+
+readiness = Readiness()
@@ -0,0 +1,30 @@
+"""야간 배치: 전날 기록이 없는 예정 복용을 missed로 생성
+
+사용법: python -m app.jobs.missed_doses [--date YYYY-MM-DD]
+"""
+import argparse
+import asyncio
+from datetime import date, timedelta
+from typing import Optional
+
+from app.services.dose_schedule_service import dose_schedule_service
+
+
+async def run(target_date: Optional[date] = None) -> int:
+    """미복용 기록 생성 (날짜 미지정 시 현지 시간 기준 어제)"""
+    if target_date is None:
+        target_date = dose_schedule_service.local_now().date() - timedelta(days=1)
+    return await dose_schedule_service.materialize_missed_doses(target_date)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="미복용 기록 생성 배치")
+    parser.add_argument("--date", type=date.fromisoformat, default=None, help="대상 날짜 (기본값: 어제)")
+    args = parser.parse_args()
+
+    inserted = asyncio.run(run(args.date))
+    print(f"✅ 미복용 기록 {inserted}건 생성 완료")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""운영 배치: 전체 사용자 복용 통계 집계 (완료율 분포, 시간대/제형/단위별)
+
+사용법: python -m app.jobs.population_analytics [--start YYYY-MM-DD] [--end YYYY-MM-DD] [--dry-run]
+"""
+import argparse
+import asyncio
+from datetime import date, timedelta
+from typing import List, Optional, Tuple
+
+from app.services.analytics_service import analytics_service
+from app.services.dose_schedule_service import dose_schedule_service
+
+
+def resolve_period(start_date: Optional[date], end_date: Optional[date]) -> Tuple[date, date]:
+    """집계 기간 결정
+
+    둘 다 없으면 현지 시간 기준 지난 달. 한쪽만 주면 시작일은 종료일이 속한 달 1일,
+    종료일은 시작일이 속한 달 말일로 채웁니다. 시작일이 종료일보다 늦으면 ValueError.
+    """
+    if start_date is None and end_date is None:
+        first_of_month = dose_schedule_service.local_now().date().replace(day=1)
+        end_date = first_of_month - timedelta(days=1)
+        start_date = end_date.replace(day=1)
+    elif start_date is None:
+        start_date = end_date.replace(day=1)
+    elif end_date is None:
+        next_month = (start_date.replace(day=28) + timedelta(days=4)).replace(day=1)
+        end_date = next_month - timedelta(days=1)
+    if start_date > end_date:
+        raise ValueError(f"시작 날짜({start_date})가 종료 날짜({end_date})보다 늦습니다")
+    return start_date, end_date
+
+
+async def run(start_date: Optional[date] = None, end_date: Optional[date] = None, save: bool = True) -> List[dict]:
+    """기간 집계 후 저장 (기간은 resolve_period 기준)"""
+    start_date, end_date = resolve_period(start_date, end_date)
+
+    rows = await analytics_service.compute_population_report(start_date, end_date)
+    if save:
+        await analytics_service.save_population_report(start_date, end_date, rows)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="전체 사용자 복용 통계 배치")
+    parser.add_argument("--start", type=date.fromisoformat, default=None, help="시작 날짜 (기본값: 종료 날짜가 속한 달 1일, 둘 다 없으면 지난 달 1일)")
+    parser.add_argument("--end", type=date.fromisoformat, default=None, help="종료 날짜 (기본값: 시작 날짜가 속한 달 말일, 둘 다 없으면 지난 달 말일)")
+    parser.add_argument("--dry-run", action="store_true", help="저장하지 않고 출력만")
+    args = parser.parse_args()
+
+    try:
+        start_date, end_date = resolve_period(args.start, args.end)
+    except ValueError as e:
+        parser.error(str(e))
+
+    rows = asyncio.run(run(start_date, end_date, save=not args.dry_run))
+    for row in rows:
+        print(
+            f"{row['dimension']:<24} {row['bucket']:<10} users={row['user_count']} "
+            f"doses={row['total_doses']} rate={row['completion_rate']}"
+        )
+    print(f"✅ 복용 통계 요약 {len(rows)}행 {'계산' if args.dry_run else '저장'} 완료")
+
+
+if __name__ == "__main__":
+    main()
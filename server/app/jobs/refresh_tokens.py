@@ -0,0 +1,21 @@
+"""정리 배치: 만료된 리프레시 토큰 삭제 (refresh_tokens 테이블 저장소 사용 시, Redis는 TTL로 만료)
+
+사용법: python -m app.jobs.refresh_tokens
+"""
+import asyncio
+
+from app.services.auth_service import auth_service
+
+
+async def run() -> int:
+    """만료된 리프레시 토큰 정리"""
+    return await auth_service.purge_expired_refresh_tokens()
+
+
+def main():
+    deleted = asyncio.run(run())
+    print(f"✅ 만료된 리프레시 토큰 {deleted}건 정리 완료")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,21 @@
+"""정리 배치: 보존 기간(SYNC_TOMBSTONE_RETENTION_DAYS)이 지난 동기화 삭제 기록 삭제
+
+사용법: python -m app.jobs.sync_tombstones
+"""
+import asyncio
+
+from app.services.sync_service import sync_service
+
+
+async def run() -> int:
+    """보존 기간이 지난 삭제 기록 정리"""
+    return await sync_service.purge_tombstones()
+
+
+def main():
+    deleted = asyncio.run(run())
+    print(f"✅ 동기화 삭제 기록 {deleted}건 정리 완료")
+
+
+if __name__ == "__main__":
+    main()
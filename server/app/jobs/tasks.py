@@ -0,0 +1,38 @@
+"""백그라운드 작업 정의
+
+워커 실행: celery -A app.core.celery_app worker --loglevel=info
+서비스 모듈이 이 모듈의 작업을 enqueue하므로 서비스는 함수 안에서 import합니다(순환 import 방지).
+"""
+from datetime import date
+from typing import Optional
+
+from app.core.celery_app import async_task
+
+
+@async_task(
+    "healthplus.create_user_profile",
+    autoretry_for=(Exception,),
+    retry_backoff=True,
+    max_retries=5
+)
+async def create_user_profile(user_id: str, email: str, name: Optional[str], login_method: str):
+    """회원가입 후 사용자 프로필 생성"""
+    from app.services.auth_service import auth_service
+
+    await auth_service._create_user_profile(user_id, email, name, login_method)
+
+
+@async_task("healthplus.recompute_monthly_statistics")
+async def recompute_monthly_statistics(user_id: str, year: int, month: int):
+    """기록이 바뀐 달의 월간 통계를 다시 계산해 캐시에 저장"""
+    from app.services.medication_service import medication_service
+
+    await medication_service.get_monthly_statistics(user_id, year, month)
+
+
+@async_task("healthplus.materialize_missed_doses")
+async def materialize_missed_doses(target_date: str):
+    """지정한 날짜(YYYY-MM-DD)의 미복용 기록 생성"""
+    from app.services.dose_schedule_service import dose_schedule_service
+
+    await dose_schedule_service.materialize_missed_doses(date.fromisoformat(target_date))
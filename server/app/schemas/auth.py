@@ -46,6 +46,18 @@ class TokenResponse(BaseModel):
     access_token: str
     token_type: str = "bearer"
     expires_in: int
+    refresh_token: Optional[str] = None
+    refresh_expires_in: Optional[int] = None
+
+
+class RefreshRequest(BaseModel):
+    """토큰 갱신 요청"""
+    refresh_token: str
+
+
+class LogoutRequest(BaseModel):
+    """로그아웃 요청 (리프레시 토큰을 보내면 해당 로그인의 토큰 전체 폐기)"""
+    refresh_token: Optional[str] = None
 
 
 class UserResponse(BaseModel):
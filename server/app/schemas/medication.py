@@ -1,8 +1,10 @@
-from datetime import datetime, time
-from typing import List, Optional
-from pydantic import BaseModel, Field
+from datetime import date, datetime, time
+from typing import Any, Dict, List, Optional
+from pydantic import BaseModel, Field, field_validator
 from enum import Enum
 
+from app.utils.dosage import normalize_time
+
 
 class MedicationForm(str, Enum):
     """약 형태"""
@@ -65,6 +67,13 @@ class MedicationUpdate(BaseModel):
     memo: Optional[str] = Field(None, max_length=500)
 
 
+class MedicationImageResponse(BaseModel):
+    """약물 이미지 업로드 응답 (image_path를 약물 등록/수정에 사용)"""
+    image_id: str
+    image_path: str
+    variants: Dict[str, str]
+
+
 class MedicationResponse(BaseModel):
     """약물 응답"""
     id: str
@@ -81,6 +90,14 @@ class MedicationResponse(BaseModel):
     memo: Optional[str] = None
     created_at: datetime
     updated_at: datetime
+    # 현재 복용 시간이 적용되기 시작한 시각 (이전 날짜의 미복용 계산에는 쓰지 않음)
+    schedule_updated_at: Optional[datetime] = None
+
+
+class MedicationPage(BaseModel):
+    """약물 목록 페이지 (커서 기반, fields 지정 시 해당 필드만 포함)"""
+    items: List[Dict[str, Any]]
+    next_cursor: Optional[str] = None
 
 
 class MedicationRecordCreate(BaseModel):
@@ -91,6 +108,20 @@ class MedicationRecordCreate(BaseModel):
     status: MedicationStatus
     delay_reason: Optional[str] = None
 
+    @field_validator("time")
+    @classmethod
+    def validate_time(cls, value: str) -> str:
+        # 예정 복용(dosage_times)과 같은 HH:MM으로 저장
+        normalized = normalize_time(value)
+        if normalized is None:
+            raise ValueError("복용 시간은 HH:MM 형식이어야 합니다")
+        return normalized
+
+
+class MedicationRecordBatchCreate(BaseModel):
+    """복용 기록 일괄 생성 (오프라인 동기화용)"""
+    records: List[MedicationRecordCreate] = Field(..., min_items=1, max_items=200)
+
 
 class MedicationRecordUpdate(BaseModel):
     """복용 기록 업데이트"""
@@ -99,15 +130,49 @@ class MedicationRecordUpdate(BaseModel):
 
 
 class MedicationDoseResponse(BaseModel):
-    """복용 기록 응답"""
+    """복용 기록 응답 (id가 없으면 기록되지 않은 예정 복용)"""
+    id: Optional[str] = None
+    medication_id: Optional[str] = None
+    medication_name: str
+    time: str
+    status: MedicationStatus
+    delay_reason: Optional[str] = None
+    taken_at: Optional[datetime] = None
+
+
+class MedicationRecordBatchItemResult(BaseModel):
+    """복용 기록 일괄 생성 항목별 결과"""
+    index: int
+    success: bool
+    record: Optional[MedicationDoseResponse] = None
+    error: Optional[str] = None
+
+
+class MedicationRecordBatchResponse(BaseModel):
+    """복용 기록 일괄 생성 응답"""
+    results: List[MedicationRecordBatchItemResult]
+    success_count: int = Field(..., ge=0)
+    failure_count: int = Field(..., ge=0)
+
+
+class MedicationRecordItem(BaseModel):
+    """기간별 복용 기록 항목"""
     id: str
+    medication_id: str
     medication_name: str
+    date: date
     time: str
     status: MedicationStatus
     delay_reason: Optional[str] = None
     taken_at: Optional[datetime] = None
 
 
+class MedicationRecordPage(BaseModel):
+    """기간별 복용 기록 페이지 (커서 기반)"""
+    items: List[MedicationRecordItem]
+    next_cursor: Optional[str] = None
+
+
 class DailyMedicationRecord(BaseModel):
     """일별 복용 기록"""
     date: datetime
@@ -125,7 +190,24 @@ class MonthlyStatistics(BaseModel):
     completed_days: int = Field(..., ge=0)
 
 
+class StreakResponse(BaseModel):
+    """연속 복용 현황 (전체 기간, 기록 없는 날은 건너뜀)"""
+    current_streak: int = Field(..., ge=0)
+    longest_streak: int = Field(..., ge=0)
+    last_completed_date: Optional[date] = None
+
+
 class CalendarStatus(BaseModel):
     """달력 상태"""
     date: int
-    status: MedicationStatus
\ No newline at end of file
+    status: MedicationStatus
+
+
+class DailyAdherence(BaseModel):
+    """일별 복용 집계 (daily_adherence)"""
+    date: date
+    total_doses: int = Field(..., ge=0)
+    taken_count: int = Field(..., ge=0)
+    completion_rate: float = Field(..., ge=0.0, le=1.0)
+    overall_status: MedicationStatus
+    updated_at: Optional[datetime] = None
\ No newline at end of file
@@ -0,0 +1,12 @@
+from datetime import datetime
+from pydantic import BaseModel
+
+
+class Reminder(BaseModel):
+    """발송할 복용 알림"""
+    user_id: str
+    medication_id: str
+    medication_name: str
+    dosage_time: str  # HH:MM
+    dose_at: datetime  # 복용 예정 시각
+    fire_at: datetime  # 알림 시각 (dose_at - reminder_minutes_before)
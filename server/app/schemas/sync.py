@@ -0,0 +1,33 @@
+from datetime import date, datetime
+from typing import List, Optional
+from pydantic import BaseModel
+
+from app.schemas.medication import MedicationResponse, MedicationStatus
+
+
+class SyncRecordItem(BaseModel):
+    """동기화 복용 기록 (약물 이름은 medications에서 조회)"""
+    id: str
+    medication_id: str
+    date: date
+    time: str
+    status: MedicationStatus
+    delay_reason: Optional[str] = None
+    taken_at: Optional[datetime] = None
+    updated_at: datetime
+
+
+class SyncTombstone(BaseModel):
+    """삭제 기록 (약물이 삭제되면 해당 약물의 복용 기록도 함께 삭제됨)"""
+    entity_type: str
+    entity_id: str
+    deleted_at: datetime
+
+
+class SyncResponse(BaseModel):
+    """델타 동기화 응답 (since 이후 생성/수정/삭제된 항목)"""
+    medications: List[MedicationResponse]
+    records: List[SyncRecordItem]
+    deleted: List[SyncTombstone]
+    next_cursor: str
+    has_more: bool
@@ -0,0 +1,84 @@
+import logging
+from datetime import date, datetime, timezone
+from typing import List
+
+from app.core.config import settings
+from app.core.database import execute, get_service_supabase
+from app.services.medication_store import create_medication_store
+from app.utils.analytics import PopulationAggregator
+
+
+logger = logging.getLogger(__name__)
+
+
+class AnalyticsService:
+    """운영자용 전체 사용자 복용 통계 배치
+
+    기간 내 복용 기록을 (date, id) 키셋으로 ANALYTICS_CHUNK_SIZE개씩 읽어
+    청크마다 NumPy 배열로 집계하고(PopulationAggregator), 결과 요약 행만
+    adherence_analytics 테이블에 저장합니다. 사용자별 반복 조회가 없고
+    메모리는 기록 수가 아니라 사용자/그룹 수에 비례합니다.
+    """
+
+    def __init__(self):
+        self.store = create_medication_store()
+
+    async def compute_population_report(self, start_date: date, end_date: date) -> List[dict]:
+        """기간(양 끝 날짜 포함) 전체 사용자 요약 행 계산"""
+        aggregator = PopulationAggregator()
+        after = None
+        while True:
+            rows = await self.store.list_analytics_records(
+                start_date, end_date, after, settings.ANALYTICS_CHUNK_SIZE
+            )
+            # PostgREST max-rows가 요청보다 작을 수 있으므로 빈 결과가 나올 때까지 읽음
+            if not rows:
+                break
+
+            aggregator.add_chunk(
+                [row["user_id"] for row in rows],
+                [row["time"] for row in rows],
+                [row["status"] for row in rows],
+                [row["form"] or "other" for row in rows],
+                [row["dosage_unit"] or "other" for row in rows],
+            )
+            after = (rows[-1]["date"], rows[-1]["id"])
+
+        logger.info("population analytics %s~%s: %d records", start_date, end_date, aggregator.rows)
+        return aggregator.summary()
+
+    async def save_population_report(self, start_date: date, end_date: date, rows: List[dict]):
+        """기간 요약 행 저장 (같은 기간의 이전 결과는 교체)
+
+        기간 키(period_start, period_end, dimension, bucket)로 upsert한 뒤 이번 결과에 없는
+        이전 행만 지우므로, 중간에 실패해도 기간 결과가 비는 순간이 없습니다.
+        """
+        client = get_service_supabase()
+        computed_at = datetime.now(timezone.utc).isoformat()
+
+        if rows:
+            await execute(
+                client.table("adherence_analytics").upsert(
+                    [
+                        {
+                            **row,
+                            "period_start": start_date.isoformat(),
+                            "period_end": end_date.isoformat(),
+                            "computed_at": computed_at,
+                        }
+                        for row in rows
+                    ],
+                    on_conflict="period_start,period_end,dimension,bucket"
+                )
+            )
+        # 이번 집계에 없는 버킷 (예: 더 이상 쓰지 않는 제형) 정리
+        await execute(
+            client.table("adherence_analytics")
+            .delete()
+            .eq("period_start", start_date.isoformat())
+            .eq("period_end", end_date.isoformat())
+            .neq("computed_at", computed_at)
+        )
+
+# 싱글톤 인스턴스
+analytics_service = AnalyticsService()
@@ -1,14 +1,29 @@
-import asyncio
-from datetime import datetime, timedelta
+import hashlib
+import logging
+import secrets
+import uuid
+from datetime import datetime, timedelta, timezone
 from typing import Optional
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from supabase import Client
 
+from app.core.cache import cache
+from app.core.celery_app import enqueue
 from app.core.config import settings
-from app.core.database import get_supabase, get_service_supabase
-from app.core.exceptions import AuthenticationError, ValidationError
-from app.schemas.auth import LoginRequest, SignUpRequest, UserResponse, TokenResponse
+from app.core.database import execute, get_supabase, get_service_supabase
+from app.core.metrics import track_db_call
+from app.core.exceptions import AuthenticationError, NotFoundError, ValidationError
+from app.jobs.tasks import create_user_profile
+from app.services.refresh_token_store import create_refresh_token_store
+from app.schemas.auth import (
+    LoginRequest, SignUpRequest, UserResponse, TokenResponse, UserProfileUpdate
+)
+
+
+logger = logging.getLogger(__name__)
+
+# 사용자 정보 캐시 무효화 범위 (프로필 변경 시 교체)
+PRINCIPAL_SCOPE = "principal"
 
 
 class AuthService:
@@ -16,6 +31,7 @@ class AuthService:
 
     def __init__(self):
         self.pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+        self.refresh_store = create_refresh_token_store()
 
     def verify_password(self, plain_password: str, hashed_password: str) -> bool:
         """비밀번호 검증"""
@@ -28,7 +44,7 @@ class AuthService:
     def create_access_token(self, data: dict) -> str:
         """액세스 토큰 생성"""
         to_encode = data.copy()
-        expire = datetime.utcnow() + timedelta(hours=settings.JWT_EXPIRY_HOURS)
+        expire = datetime.utcnow() + timedelta(seconds=access_token_expiry_seconds())
         to_encode.update({"exp": expire})
 
         encoded_jwt = jwt.encode(
@@ -38,6 +54,98 @@ class AuthService:
         )
         return encoded_jwt
 
+    def create_user_token(self, user: UserResponse) -> str:
+        """사용자 정보 클레임을 포함한 액세스 토큰 생성"""
+        return self.create_access_token(_user_claims(user))
+
+    async def create_session(self, user: UserResponse) -> TokenResponse:
+        """로그인 세션 발급 (액세스 토큰 + 새 계열의 리프레시 토큰)"""
+        claims = _user_claims(user)
+        refresh_token = None
+        if settings.REFRESH_TOKEN_ENABLED:
+            refresh_token = await self._issue_refresh_token(user.id, str(uuid.uuid4()), claims)
+        return self._token_response(claims, refresh_token)
+
+    async def refresh_session(self, refresh_token: str) -> TokenResponse:
+        """리프레시 토큰으로 액세스 토큰 재발급 (Supabase 호출 없음)
+
+        사용한 리프레시 토큰은 폐기하고 같은 계열의 새 토큰을 발급합니다.
+        이미 사용된 토큰이 다시 오면 탈취로 보고 계열 전체를 폐기합니다. 단, 사용 후
+        REFRESH_TOKEN_REUSE_GRACE_SECONDS 안의 재시도(동시 요청, 응답 유실)에는 계열을
+        폐기하지 않고 같은 계열의 새 토큰을 발급합니다.
+        """
+        if not settings.REFRESH_TOKEN_ENABLED:
+            raise AuthenticationError("리프레시 토큰을 사용할 수 없습니다")
+
+        token_id, token_hash = _split_refresh_token(refresh_token)
+        try:
+            record = await self.refresh_store.consume(token_id, token_hash)
+            if record is None:
+                used = await self.refresh_store.find_used(token_id, token_hash)
+                if used is None:
+                    raise AuthenticationError("유효하지 않은 리프레시 토큰입니다")
+                if not _within_reuse_grace(used):
+                    await self.refresh_store.revoke_family(used["family_id"])
+                    raise AuthenticationError("이미 사용된 리프레시 토큰입니다. 다시 로그인해주세요")
+                record = used
+
+            claims = record["claims"]
+            new_token = await self._issue_refresh_token(record["user_id"], record["family_id"], claims)
+        except AuthenticationError:
+            raise
+        except Exception as e:
+            raise AuthenticationError(f"토큰 갱신 실패: {str(e)}")
+
+        return self._token_response(claims, new_token)
+
+    async def revoke_session(self, refresh_token: str):
+        """로그아웃: 리프레시 토큰 계열 전체 폐기 (유효하지 않은 토큰, 저장소 오류는 무시)"""
+        if not settings.REFRESH_TOKEN_ENABLED:
+            return
+
+        try:
+            token_id, token_hash = _split_refresh_token(refresh_token)
+        except AuthenticationError:
+            return
+
+        # 저장소 장애 시에도 로그아웃은 성공으로 처리 (토큰은 만료 시각에 무효화됨)
+        try:
+            record = await self.refresh_store.consume(token_id, token_hash)
+            if record is None:
+                record = await self.refresh_store.find_used(token_id, token_hash)
+            if record is not None:
+                await self.refresh_store.revoke_family(record["family_id"])
+        except Exception as e:
+            logger.warning("refresh token revoke failed on logout: %s", e)
+
+    async def purge_expired_refresh_tokens(self) -> int:
+        """만료된 리프레시 토큰 정리 (배치)"""
+        return await self.refresh_store.purge_expired()
+
+    async def _issue_refresh_token(self, user_id: str, family_id: str, claims: dict) -> str:
+        """리프레시 토큰 발급 ("{id}.{secret}", 저장소에는 secret의 해시만 저장)"""
+        token_id = str(uuid.uuid4())
+        secret = secrets.token_urlsafe(32)
+        expires_at = datetime.now(timezone.utc) + timedelta(days=settings.REFRESH_TOKEN_EXPIRY_DAYS)
+
+        await self.refresh_store.save({
+            "id": token_id,
+            "user_id": user_id,
+            "family_id": family_id,
+            "token_hash": _hash_secret(secret),
+            "claims": claims,
+            "expires_at": expires_at.isoformat()
+        })
+        return f"{token_id}.{secret}"
+
+    def _token_response(self, claims: dict, refresh_token: Optional[str]) -> TokenResponse:
+        return TokenResponse(
+            access_token=self.create_access_token(claims),
+            expires_in=access_token_expiry_seconds(),
+            refresh_token=refresh_token,
+            refresh_expires_in=settings.REFRESH_TOKEN_EXPIRY_DAYS * 86400 if refresh_token else None
+        )
+
     def verify_token(self, token: str) -> Optional[dict]:
         """토큰 검증"""
         try:
@@ -50,15 +158,44 @@ class AuthService:
         except JWTError:
             return None
 
+    def get_user_id_from_token(self, token: str) -> str:
+        """토큰에서 사용자 ID 추출 (네트워크 I/O 없음)"""
+        payload = self.verify_token(token)
+        if not payload:
+            raise AuthenticationError("유효하지 않은 토큰입니다")
+
+        user_id = payload.get("sub")
+        if not user_id:
+            raise AuthenticationError("토큰에서 사용자 ID를 찾을 수 없습니다")
+
+        return user_id
+
+    async def invalidate_principal(self, user_id: str):
+        """사용자 캐시 무효화 (공유 캐시 버전 교체라 모든 워커에 반영)"""
+        await cache.invalidate(user_id, PRINCIPAL_SCOPE)
+
+    async def _get_cached_principal(self, user_id: str) -> Optional[UserResponse]:
+        if not cache.enabled:
+            return None
+        key = await cache.build_key("principal", user_id, PRINCIPAL_SCOPE)
+        value = await cache.get(key)
+        return UserResponse.model_validate(value) if value is not None else None
+
+    async def _cache_principal(self, user: UserResponse, profile: dict):
+        # 프로필 행이 아직 없으면(가입 직후 생성 작업 대기 중) 이름 등이 비어 있으므로 캐시하지 않음
+        if not cache.enabled or not profile:
+            return
+        key = await cache.build_key("principal", user.id, PRINCIPAL_SCOPE)
+        await cache.set(key, user.model_dump(mode="json"), settings.PRINCIPAL_CACHE_TTL_SECONDS)
+
     async def sign_up_with_email(self, signup_data: SignUpRequest) -> dict:
         """이메일 회원가입"""
         try:
             client = get_supabase()
 
             # Supabase 회원가입
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: client.auth.sign_up({
+            async with track_db_call("auth", "sign_up"):
+                response = await client.auth.sign_up({
                     "email": signup_data.email,
                     "password": signup_data.password,
                     "options": {
@@ -68,30 +205,29 @@ class AuthService:
                         }
                     }
                 })
-            )
 
             if response.user:
-                # 사용자 프로필 테이블에 추가 정보 저장
-                await self._create_user_profile(
-                    user_id=response.user.id,
+                # 사용자 프로필 테이블에 추가 정보 저장 (백그라운드 작업)
+                await enqueue(
+                    create_user_profile,
+                    response.user.id,
+                    response.user.email,
+                    signup_data.name,
+                    "email"
+                )
+
+                user = UserResponse(
+                    id=response.user.id,
                     email=response.user.email,
                     name=signup_data.name,
-                    login_method="email"
+                    login_method="email",
+                    created_at=datetime.utcnow(),
+                    is_email_verified=response.user.email_confirmed_at is not None
                 )
 
                 return {
-                    "user": UserResponse(
-                        id=response.user.id,
-                        email=response.user.email,
-                        name=signup_data.name,
-                        login_method="email",
-                        created_at=datetime.utcnow(),
-                        is_email_verified=response.user.email_confirmed_at is not None
-                    ),
-                    "token": TokenResponse(
-                        access_token=self.create_access_token({"sub": response.user.id}),
-                        expires_in=settings.JWT_EXPIRY_HOURS * 3600
-                    )
+                    "user": user,
+                    "token": await self.create_session(user)
                 }
             else:
                 raise AuthenticationError("회원가입에 실패했습니다")
@@ -106,34 +242,30 @@ class AuthService:
         try:
             client = get_supabase()
 
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: client.auth.sign_in_with_password({
+            async with track_db_call("auth", "sign_in"):
+                response = await client.auth.sign_in_with_password({
                     "email": login_data.email,
                     "password": login_data.password
                 })
-            )
 
             if response.user:
                 # 사용자 프로필 정보 가져오기
                 profile = await self._get_user_profile(response.user.id)
 
+                user = UserResponse(
+                    id=response.user.id,
+                    email=response.user.email,
+                    name=profile.get("name"),
+                    profile_image_url=profile.get("profile_image_url"),
+                    login_method=profile.get("login_method", "email"),
+                    created_at=_parse_timestamp(response.user.created_at),
+                    is_email_verified=response.user.email_confirmed_at is not None
+                )
+                await self._cache_principal(user, profile)
+
                 return {
-                    "user": UserResponse(
-                        id=response.user.id,
-                        email=response.user.email,
-                        name=profile.get("name"),
-                        profile_image_url=profile.get("profile_image_url"),
-                        login_method=profile.get("login_method", "email"),
-                        created_at=datetime.fromisoformat(
-                            response.user.created_at.replace("Z", "+00:00")
-                        ),
-                        is_email_verified=response.user.email_confirmed_at is not None
-                    ),
-                    "token": TokenResponse(
-                        access_token=self.create_access_token({"sub": response.user.id}),
-                        expires_in=settings.JWT_EXPIRY_HOURS * 3600
-                    )
+                    "user": user,
+                    "token": await self.create_session(user)
                 }
             else:
                 raise AuthenticationError("로그인에 실패했습니다")
@@ -153,14 +285,16 @@ class AuthService:
         if not user_id:
             raise AuthenticationError("토큰에서 사용자 ID를 찾을 수 없습니다")
 
+        # local 모드: 검증된 클레임 + 사용자 캐시로 Supabase 조회 생략
+        if settings.AUTH_MODE == "local" and payload.get("email"):
+            return await self._get_local_principal(user_id, payload)
+
         client = get_supabase()
 
         # Supabase에서 사용자 정보 가져오기
         try:
-            response = await asyncio.get_event_loop().run_in_executor(
-                None,
-                lambda: client.auth.get_user()
-            )
+            async with track_db_call("auth", "get_user"):
+                response = await client.auth.get_user(token)
 
             if response.user:
                 profile = await self._get_user_profile(user_id)
@@ -171,9 +305,7 @@ class AuthService:
                     name=profile.get("name"),
                     profile_image_url=profile.get("profile_image_url"),
                     login_method=profile.get("login_method", "email"),
-                    created_at=datetime.fromisoformat(
-                        response.user.created_at.replace("Z", "+00:00")
-                    ),
+                    created_at=_parse_timestamp(response.user.created_at),
                     is_email_verified=response.user.email_confirmed_at is not None
                 )
             else:
@@ -182,6 +314,58 @@ class AuthService:
         except Exception as e:
             raise AuthenticationError(f"사용자 정보 조회 실패: {str(e)}")
 
+    async def _get_local_principal(self, user_id: str, payload: dict) -> UserResponse:
+        """JWT 클레임과 캐시로 사용자 정보 구성 (캐시 미스 시 프로필만 조회)"""
+        user = await self._get_cached_principal(user_id)
+        if user is not None:
+            return user
+
+        try:
+            profile = await self._get_user_profile(user_id)
+        except Exception as e:
+            raise AuthenticationError(f"사용자 정보 조회 실패: {str(e)}")
+
+        user = UserResponse(
+            id=user_id,
+            email=payload["email"],
+            name=profile.get("name"),
+            profile_image_url=profile.get("profile_image_url"),
+            login_method=profile.get("login_method", "email"),
+            created_at=datetime.fromisoformat(payload["created_at"]),
+            is_email_verified=payload.get("email_verified", False)
+        )
+        await self._cache_principal(user, profile)
+        return user
+
+    async def update_user_profile(
+        self,
+        current_user: UserResponse,
+        profile_data: UserProfileUpdate
+    ) -> UserResponse:
+        """사용자 프로필 업데이트"""
+        update_data = {
+            k: v for k, v in profile_data.model_dump(exclude_unset=True).items()
+            if v is not None
+        }
+        if not update_data:
+            return current_user
+
+        client = get_service_supabase()
+
+        response = await execute(
+            client.table("user_profiles")
+            .update(update_data)
+            .eq("user_id", current_user.id)
+        )
+
+        if not response.data:
+            raise NotFoundError("사용자 프로필을 찾을 수 없습니다")
+
+        # 프로필이 바뀌었으므로 캐시된 사용자 정보 무효화
+        await self.invalidate_principal(current_user.id)
+
+        return current_user.model_copy(update=update_data)
+
     async def _create_user_profile(
         self,
         user_id: str,
@@ -189,30 +373,86 @@ class AuthService:
         name: Optional[str],
         login_method: str
     ):
-        """사용자 프로필 생성"""
+        """사용자 프로필 생성 (작업 재시도 시에도 안전하도록 이미 있으면 무시)"""
         client = get_service_supabase()
 
-        await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: client.table("user_profiles").insert({
-                "user_id": user_id,
-                "email": email,
-                "name": name,
-                "login_method": login_method,
-                "created_at": datetime.utcnow().isoformat()
-            }).execute()
+        await execute(
+            client.table("user_profiles").upsert(
+                {
+                    "user_id": user_id,
+                    "email": email,
+                    "name": name,
+                    "login_method": login_method,
+                    "created_at": datetime.utcnow().isoformat()
+                },
+                on_conflict="user_id",
+                ignore_duplicates=True
+            )
         )
 
     async def _get_user_profile(self, user_id: str) -> dict:
         """사용자 프로필 가져오기"""
         client = get_service_supabase()
 
-        response = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: client.table("user_profiles").select("*").eq("user_id", user_id).single().execute()
+        # 회원가입 직후에는 프로필 생성 작업이 아직 끝나지 않았을 수 있음
+        response = await execute(
+            client.table("user_profiles").select("*").eq("user_id", user_id).maybe_single()
         )
 
-        return response.data if response.data else {}
+        return response.data if response and response.data else {}
+
+
+def access_token_expiry_seconds() -> int:
+    """액세스 토큰 유효 시간 (리프레시 토큰을 쓰면 분 단위로 짧게)"""
+    if settings.REFRESH_TOKEN_ENABLED:
+        return settings.JWT_ACCESS_TOKEN_EXPIRY_MINUTES * 60
+    return settings.JWT_EXPIRY_HOURS * 3600
+
+
+def _within_reuse_grace(record: dict) -> bool:
+    """사용된 토큰의 재시도 허용 여부 (계열이 폐기/만료되지 않았고 사용 직후인 경우)"""
+    if record["revoked"]:
+        return False
+    try:
+        used_at = datetime.fromisoformat(record["used_at"])
+        expires_at = datetime.fromisoformat(record["expires_at"])
+    except (TypeError, ValueError):
+        return False
+    now = datetime.now(timezone.utc)
+    return now < expires_at and now - used_at <= timedelta(seconds=settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS)
+
+
+def _user_claims(user: UserResponse) -> dict:
+    """액세스 토큰 클레임 (local 인증 모드에서 사용자 정보로 사용)"""
+    return {
+        "sub": user.id,
+        "email": user.email,
+        "email_verified": user.is_email_verified,
+        "created_at": user.created_at.isoformat()
+    }
+
+
+def _split_refresh_token(refresh_token: str) -> tuple:
+    """리프레시 토큰을 (id, secret 해시)로 분리"""
+    token_id, _, secret = refresh_token.partition(".")
+    try:
+        uuid.UUID(token_id)
+    except ValueError:
+        raise AuthenticationError("유효하지 않은 리프레시 토큰입니다")
+    if not secret:
+        raise AuthenticationError("유효하지 않은 리프레시 토큰입니다")
+    return token_id, _hash_secret(secret)
+
+
+def _hash_secret(secret: str) -> str:
+    return hashlib.sha256(secret.encode()).hexdigest()
+
+
+def _parse_timestamp(value) -> datetime:
+    """Supabase Auth 시각 (gotrue 버전에 따라 문자열 또는 datetime)"""
+    if isinstance(value, datetime):
+        return value
+    return datetime.fromisoformat(value.replace("Z", "+00:00"))
 
 
 auth_service = AuthService()
\ No newline at end of file
@@ -0,0 +1,205 @@
+import logging
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, Iterator, List, NamedTuple, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.database import execute, get_service_supabase, with_returning
+from app.utils.dosage import normalize_dosage_times, normalize_time
+
+
+logger = logging.getLogger(__name__)
+
+# 야간 배치에서 한 번에 조회할 약물 수
+MEDICATION_PAGE_SIZE = 1000
+
+# 한 번에 upsert할 미복용 기록 수
+MISSED_INSERT_CHUNK_SIZE = 500
+
+
+class ExpectedDose(NamedTuple):
+    """복용 일정상 예정된 복용 (기록 여부와 무관)"""
+    date: date
+    time: str  # HH:MM
+    medication_id: str
+    user_id: str
+
+
+class DoseTemplate(NamedTuple):
+    """약물별 하루 복용 일정 (복용 시간, 일정 적용 시작 시각)"""
+    medication_id: str
+    user_id: str
+    times: List[str]
+    start: Tuple[str, str]  # (YYYY-MM-DD, HH:MM) 현지 시간, 이 시각 이후 복용만 예정
+
+
+def dose_template(medication: dict, tz: ZoneInfo) -> Optional[DoseTemplate]:
+    """약물 정보로 하루 복용 일정 생성 (지속 복용이 아니면 예정 복용 없음)
+
+    is_continuous가 false인 약물은 종료일 정보가 없어 필요할 때 복용하는 약으로 보고
+    미복용을 만들지 않습니다. 복용 시간은 daily_dosage_count개까지만 사용합니다.
+    현재 복용 시간은 일정이 마지막으로 바뀐 시각(schedule_updated_at, 없으면 created_at)부터만
+    적용하므로, 그 이전 날짜에는 바뀐 시간으로 예정 복용을 만들지 않습니다.
+    """
+    if not medication.get("is_continuous", True):
+        return None
+
+    times = normalize_dosage_times(medication.get("dosage_times") or [])
+    count = medication.get("daily_dosage_count")
+    if count:
+        times = times[:count]
+    if not times:
+        return None
+
+    effective_at = max(
+        _local_datetime(value, tz)
+        for value in (medication["created_at"], medication.get("schedule_updated_at"))
+        if value is not None
+    )
+
+    return DoseTemplate(
+        medication_id=medication["id"],
+        user_id=medication.get("user_id", ""),
+        times=times,
+        start=(effective_at.date().isoformat(), effective_at.strftime("%H:%M"))
+    )
+
+
+def _local_datetime(value, tz: ZoneInfo) -> datetime:
+    if isinstance(value, str):
+        value = datetime.fromisoformat(value.replace("Z", "+00:00"))
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.astimezone(tz)
+
+
+def expand_expected_doses(
+    templates: Iterable[DoseTemplate],
+    start_date: date,
+    end_date: date
+) -> Iterator[ExpectedDose]:
+    """기간(양 끝 포함)의 예정 복용을 (날짜, 시간, 약물 ID) 순으로 생성"""
+    slots = sorted(
+        (dosage_time, template.medication_id, template.user_id, template.start)
+        for template in templates
+        for dosage_time in template.times
+    )
+
+    day = start_date
+    while day <= end_date:
+        day_str = day.isoformat()
+        for dosage_time, medication_id, user_id, start in slots:
+            if (day_str, dosage_time) >= start:
+                yield ExpectedDose(day, dosage_time, medication_id, user_id)
+        day += timedelta(days=1)
+
+
+def merge_doses(
+    expected: Iterable[ExpectedDose],
+    records: Iterable[dict]
+) -> Iterator[Tuple[Optional[ExpectedDose], Optional[dict]]]:
+    """예정 복용과 실제 기록을 한 번에 병합 (둘 다 (날짜, 시간, 약물 ID) 순 정렬 필요)
+
+    (예정, 기록) 쌍을 반환하며, 기록이 없는 예정 복용은 (예정, None),
+    일정에 없는 기록은 (None, 기록)입니다.
+    """
+    expected_iter = iter(expected)
+    record_iter = iter(records)
+    dose = next(expected_iter, None)
+    record = next(record_iter, None)
+
+    while dose is not None or record is not None:
+        dose_key = (dose.date.isoformat(), dose.time, dose.medication_id) if dose is not None else None
+        # 예정 복용과 같은 HH:MM으로 비교 (형식이 다른 예전 기록: "9:00" 등)
+        record_key = (
+            str(record["date"])[:10], normalize_time(record["time"]) or record["time"], record["medication_id"]
+        ) if record is not None else None
+
+        if record_key is None or (dose_key is not None and dose_key < record_key):
+            yield dose, None
+            dose = next(expected_iter, None)
+        elif dose_key is None or record_key < dose_key:
+            yield None, record
+            record = next(record_iter, None)
+        else:
+            yield dose, record
+            dose = next(expected_iter, None)
+            record = next(record_iter, None)
+
+
+class DoseScheduleService:
+    """복용 일정 서비스 (예정 복용 계산, 미복용 기록 생성)"""
+
+    def __init__(self):
+        self.tz = ZoneInfo(settings.APP_TIMEZONE)
+
+    def local_now(self) -> datetime:
+        """현지 현재 시각"""
+        return datetime.now(self.tz)
+
+    async def materialize_missed_doses(self, target_date: date) -> int:
+        """야간 배치: target_date의 예정 복용 중 기록이 없는 것을 missed로 일괄 생성
+
+        전체 사용자의 지속 복용 약물을 id 순으로 나눠 읽고, 예정 복용을 청크 단위로
+        upsert합니다(기존 기록은 그대로 두는 ON CONFLICT DO NOTHING). 여러 번 실행해도
+        같은 결과이며 새로 생성된 기록 수를 반환합니다.
+        """
+        client = get_service_supabase()
+        day_end = datetime.combine(target_date + timedelta(days=1), datetime.min.time(), tzinfo=self.tz)
+
+        inserted = 0
+        last_id = None
+        while True:
+            query = (
+                client.table("medications")
+                .select("id, user_id, dosage_times, daily_dosage_count, is_continuous, created_at, schedule_updated_at")
+                .eq("is_continuous", True)
+                .lt("created_at", day_end.isoformat())
+                .order("id")
+                .limit(MEDICATION_PAGE_SIZE)
+            )
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            response = await execute(query)
+
+            templates = [t for t in (dose_template(m, self.tz) for m in response.data) if t]
+            rows = [
+                {
+                    "user_id": dose.user_id,
+                    "medication_id": dose.medication_id,
+                    "date": dose.date.isoformat(),
+                    "time": dose.time,
+                    "status": "missed",
+                }
+                for dose in expand_expected_doses(templates, target_date, target_date)
+            ]
+            for i in range(0, len(rows), MISSED_INSERT_CHUNK_SIZE):
+                inserted += await self._insert_missed(client, rows[i:i + MISSED_INSERT_CHUNK_SIZE])
+
+            if len(response.data) < MEDICATION_PAGE_SIZE:
+                break
+            last_id = response.data[-1]["id"]
+
+        logger.info("missed doses materialized for %s: %d", target_date, inserted)
+        return inserted
+
+    async def _insert_missed(self, client, rows: List[dict]) -> int:
+        """미복용 기록 upsert (이미 있는 기록은 건너뜀), 새로 생긴 사용자별 캐시 무효화"""
+        response = await execute(
+            with_returning(
+                client.table("medication_records").upsert(
+                    rows,
+                    on_conflict="user_id,medication_id,date,time",
+                    ignore_duplicates=True
+                ),
+                "user_id"
+            )
+        )
+
+        for user_id in {row["user_id"] for row in response.data}:
+            await cache.invalidate(user_id, "records", "statistics")
+        return len(response.data)
+
+
+dose_schedule_service = DoseScheduleService()
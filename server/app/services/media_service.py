@@ -0,0 +1,300 @@
+import asyncio
+import logging
+import multiprocessing
+import shutil
+import tempfile
+import uuid
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import AsyncIterator, Dict, List, Optional, Tuple
+
+import aiofiles
+import aiofiles.os
+import httpx
+from multipart.exceptions import MultipartParseError
+from multipart.multipart import MultipartParser, parse_options_header
+from storage3.utils import StorageException
+
+from app.core.config import settings
+from app.core.database import get_service_supabase
+from app.core.exceptions import ExternalServiceError, NotFoundError, PayloadTooLargeError, ValidationError
+from app.core.metrics import track_db_call
+from app.schemas.medication import MedicationImageResponse
+from app.utils.images import SIGNATURE_LENGTH, VARIANT_FORMAT, make_variants, sniff_image_type
+
+
+logger = logging.getLogger(__name__)
+
+# 업로드 폼의 파일 필드 이름
+UPLOAD_FIELD = "file"
+
+# 원본 이미지 이름 (형식은 업로드 시 파일 앞부분으로 판별해 content-type으로 저장)
+ORIGINAL_VARIANT = "original"
+
+# 작업 파일을 저장소로 보낼 때 읽는 단위
+UPLOAD_CHUNK_SIZE = 64 * 1024
+
+
+def variant_sizes() -> Dict[str, int]:
+    """파생 이미지 이름 -> 긴 변 최대 픽셀"""
+    return {"thumbnail": settings.MEDIA_THUMBNAIL_SIZE, "medium": settings.MEDIA_MEDIUM_SIZE}
+
+
+class _UploadPart:
+    """multipart 파서 콜백 상태 (파일 필드 본문만 모음)"""
+
+    def __init__(self):
+        self.header_field = b""
+        self.header_value = b""
+        self.headers: Dict[bytes, bytes] = {}
+        self.active = False
+        self.found = False
+        self.done = False
+        self.pending = bytearray()
+
+    def callbacks(self) -> dict:
+        return {
+            "on_part_begin": self.on_part_begin,
+            "on_header_field": self.on_header_field,
+            "on_header_value": self.on_header_value,
+            "on_header_end": self.on_header_end,
+            "on_headers_finished": self.on_headers_finished,
+            "on_part_data": self.on_part_data,
+            "on_part_end": self.on_part_end,
+        }
+
+    def on_part_begin(self):
+        self.headers = {}
+
+    def on_header_field(self, data: bytes, start: int, end: int):
+        self.header_field += data[start:end]
+
+    def on_header_value(self, data: bytes, start: int, end: int):
+        self.header_value += data[start:end]
+
+    def on_header_end(self):
+        self.headers[self.header_field.lower()] = self.header_value
+        self.header_field = b""
+        self.header_value = b""
+
+    def on_headers_finished(self):
+        _, options = parse_options_header(self.headers.get(b"content-disposition", b""))
+        # 첫 번째 파일 필드만 저장하고 나머지 필드는 버림
+        self.active = not self.found and options.get(b"name") == UPLOAD_FIELD.encode() and b"filename" in options
+        self.found = self.found or self.active
+
+    def on_part_data(self, data: bytes, start: int, end: int):
+        if self.active:
+            self.pending += data[start:end]
+
+    def on_part_end(self):
+        if self.active:
+            self.active = False
+            self.done = True
+
+
+class MediaService:
+    """약물 이미지 업로드/조회 서비스
+
+    multipart 본문을 받는 대로 파싱해 파일 필드만 청크 단위로 파드 로컬 작업
+    디렉터리(MEDIA_WORK_DIR)에 쓰므로 업로드 전체를 메모리에 모으지 않습니다.
+    썸네일 생성은 워커별 프로세스 풀에서 실행해 이벤트 루프를 막지 않습니다.
+    원본과 파생 이미지는 Supabase Storage 비공개 버킷(MEDIA_STORAGE_BUCKET)의
+    medications/<user_id>/<image_id>/<variant>에 올린 뒤 작업 파일을 지우므로
+    어느 파드에서든 조회할 수 있습니다. 저장소 업로드/조회 모두 청크 단위로 비동기
+    스트리밍하므로 이미지 전체를 메모리에 올리거나 이벤트 루프를 막지 않습니다.
+    객체는 다시 쓰지 않으므로 조회 응답은 길게 캐시할 수 있습니다.
+    """
+
+    def __init__(self):
+        self._executor: Optional[ProcessPoolExecutor] = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor:
+        # 워커 프로세스에서 처음 사용할 때 생성 (spawn: 이벤트 루프/스레드 상태를 복제하지 않음)
+        if self._executor is None:
+            self._executor = ProcessPoolExecutor(
+                max_workers=settings.MEDIA_PROCESS_WORKERS,
+                mp_context=multiprocessing.get_context("spawn")
+            )
+        return self._executor
+
+    async def save_upload(
+        self,
+        user_id: str,
+        content_type: str,
+        content_length: Optional[int],
+        stream: AsyncIterator[bytes]
+    ) -> MedicationImageResponse:
+        """multipart/form-data 본문의 file 필드를 저장하고 파생 이미지 생성"""
+        media_type, options = parse_options_header(content_type)
+        if media_type != b"multipart/form-data" or b"boundary" not in options:
+            raise ValidationError("multipart/form-data 형식으로 file 필드를 보내주세요")
+        # 폼 경계/헤더 몫으로 조금 여유를 둠
+        if content_length is not None and content_length > settings.MEDIA_MAX_UPLOAD_BYTES + 16384:
+            raise PayloadTooLargeError(self._too_large_message())
+
+        image_id = str(uuid.uuid4())
+        work_dir = Path(tempfile.mkdtemp(prefix="upload-", dir=settings.MEDIA_WORK_DIR))
+        try:
+            original = work_dir / ORIGINAL_VARIANT
+            await self._receive(options[b"boundary"], stream, original)
+
+            loop = asyncio.get_running_loop()
+            variants = await loop.run_in_executor(
+                self.executor, make_variants, str(original), variant_sizes(), settings.MEDIA_MAX_IMAGE_PIXELS
+            )
+            try:
+                await asyncio.gather(
+                    self._store(user_id, image_id, ORIGINAL_VARIANT, original),
+                    *(self._store(user_id, image_id, name, Path(path)) for name, path in variants.items())
+                )
+            except ExternalServiceError:
+                # 일부만 올라간 객체 정리
+                await self._remove(user_id, image_id, [ORIGINAL_VARIANT, *variants])
+                raise
+        except MultipartParseError:
+            raise ValidationError("multipart 본문 형식이 올바르지 않습니다")
+        except ValueError:
+            # make_variants: 디코딩할 수 없거나 너무 큰 이미지
+            raise ValidationError("이미지 파일을 읽을 수 없습니다")
+        finally:
+            shutil.rmtree(work_dir, ignore_errors=True)
+
+        image_path = f"/v1/medications/images/{image_id}"
+        return MedicationImageResponse(
+            image_id=image_id,
+            image_path=image_path,
+            variants={name: f"{image_path}/{name}" for name in [*variant_sizes(), ORIGINAL_VARIANT]}
+        )
+
+    async def _receive(self, boundary: bytes, stream: AsyncIterator[bytes], path: Path):
+        """본문을 파싱하며 파일 필드를 path에 기록 (허용 형식이 아니면 ValidationError)"""
+        part = _UploadPart()
+        parser = MultipartParser(boundary, part.callbacks())
+        sniffed = False
+        written = 0
+
+        async with aiofiles.open(path, "wb") as file:
+            async for chunk in stream:
+                parser.write(chunk)
+                if not sniffed:
+                    # 형식 판별 전에는 시그니처 길이만큼 모일 때까지 기다림
+                    if len(part.pending) < SIGNATURE_LENGTH and not part.done:
+                        continue
+                    if sniff_image_type(bytes(part.pending[:SIGNATURE_LENGTH])) is None:
+                        raise ValidationError("JPEG, PNG, WebP 이미지만 업로드할 수 있습니다")
+                    sniffed = True
+
+                if part.pending:
+                    written += len(part.pending)
+                    if written > settings.MEDIA_MAX_UPLOAD_BYTES:
+                        raise PayloadTooLargeError(self._too_large_message())
+                    await file.write(bytes(part.pending))
+                    part.pending.clear()
+            parser.finalize()
+
+        if not part.done or not sniffed:
+            raise ValidationError(f"{UPLOAD_FIELD} 필드에 이미지 파일이 필요합니다")
+
+    async def open_variant(self, user_id: str, image_id: str, variant: str) -> Tuple[AsyncIterator[bytes], str]:
+        """본인 이미지의 파생/원본 내용 스트림과 미디어 타입 (없으면 NotFoundError)
+
+        반환한 스트림은 끝까지 읽거나 닫아야 저장소 연결이 풀로 돌아갑니다.
+        """
+        try:
+            image_id = str(uuid.UUID(image_id))
+        except ValueError:
+            raise NotFoundError("이미지를 찾을 수 없습니다")
+        if variant != ORIGINAL_VARIANT and variant not in variant_sizes():
+            raise NotFoundError("이미지를 찾을 수 없습니다")
+
+        session = _storage_session()
+        request = session.build_request("GET", _object_url(user_id, image_id, variant))
+        try:
+            async with track_db_call(f"storage/{settings.MEDIA_STORAGE_BUCKET}", "GET"):
+                response = await session.send(request, stream=True)
+        except httpx.HTTPError:
+            raise ExternalServiceError("이미지 저장소 조회에 실패했습니다")
+
+        if response.is_error:
+            await response.aclose()
+            # Storage API는 없는 객체를 400 또는 404로 응답
+            if response.status_code in (400, 404):
+                raise NotFoundError("이미지를 찾을 수 없습니다")
+            raise ExternalServiceError("이미지 저장소 조회에 실패했습니다")
+
+        return _iter_response(response), response.headers.get("content-type", VARIANT_FORMAT[1])
+
+    async def _store(self, user_id: str, image_id: str, variant: str, path: Path):
+        """작업 파일을 저장소에 업로드 (파일을 비동기로 읽어 청크 단위 전송)"""
+        async with aiofiles.open(path, "rb") as file:
+            content_type = sniff_image_type(await file.read(SIGNATURE_LENGTH))[1]
+        size = (await aiofiles.os.stat(path)).st_size
+
+        headers = {
+            "content-type": content_type,
+            "content-length": str(size),
+            "cache-control": f"max-age={settings.MEDIA_CACHE_MAX_AGE_SECONDS}",
+            "x-upsert": "false",
+        }
+        try:
+            async with track_db_call(f"storage/{settings.MEDIA_STORAGE_BUCKET}", "POST"):
+                response = await _storage_session().post(
+                    _object_url(user_id, image_id, variant), content=_read_chunks(path), headers=headers
+                )
+                response.raise_for_status()
+        except httpx.HTTPError:
+            raise ExternalServiceError("이미지 저장소 업로드에 실패했습니다")
+
+    async def _remove(self, user_id: str, image_id: str, variants: List[str]):
+        bucket = get_service_supabase().storage.from_(settings.MEDIA_STORAGE_BUCKET)
+        try:
+            async with track_db_call(f"storage/{settings.MEDIA_STORAGE_BUCKET}", "DELETE"):
+                await bucket.remove([_object_path(user_id, image_id, variant) for variant in variants])
+        except StorageException as e:
+            logger.warning("medication image cleanup failed for %s: %s", image_id, e)
+
+    def _too_large_message(self) -> str:
+        return f"이미지는 {settings.MEDIA_MAX_UPLOAD_BYTES // (1024 * 1024)}MB 이하만 업로드할 수 있습니다"
+
+    def reset(self):
+        """fork 직후 부모 프로세스에서 물려받은 프로세스 풀 참조 폐기"""
+        self._executor = None
+
+    def shutdown(self):
+        if self._executor is not None:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+            self._executor = None
+
+
+def _object_path(user_id: str, image_id: str, variant: str) -> str:
+    return f"medications/{user_id}/{image_id}/{variant}"
+
+
+def _object_url(user_id: str, image_id: str, variant: str) -> str:
+    """Storage API 객체 경로 (세션 base_url 기준)"""
+    return f"/object/{settings.MEDIA_STORAGE_BUCKET}/{_object_path(user_id, image_id, variant)}"
+
+
+def _storage_session() -> httpx.AsyncClient:
+    """Storage API HTTP 세션 (서비스 역할 인증 헤더 포함, 워커별 연결 풀)"""
+    return get_service_supabase().storage.session
+
+
+async def _read_chunks(path: Path) -> AsyncIterator[bytes]:
+    async with aiofiles.open(path, "rb") as file:
+        while chunk := await file.read(UPLOAD_CHUNK_SIZE):
+            yield chunk
+
+
+async def _iter_response(response: httpx.Response) -> AsyncIterator[bytes]:
+    try:
+        async for chunk in response.aiter_bytes():
+            yield chunk
+    finally:
+        await response.aclose()
+
+
+# 싱글톤 인스턴스
+media_service = MediaService()
@@ -1,20 +1,58 @@
-import asyncio
 from datetime import datetime, date
-from typing import List, Optional
-from supabase import Client
+from typing import AsyncIterator, Iterable, List, Optional
 
-from app.core.database import get_service_supabase
-from app.core.exceptions import NotFoundError, ValidationError
+from postgrest.exceptions import APIError
+
+from app.core.cache import cache, cached
+from app.core.celery_app import enqueue
+from app.core.config import settings
+from app.core.database import execute, get_service_supabase, with_returning
+from app.core.exceptions import ConflictError, NotFoundError, ValidationError
+from app.jobs.tasks import recompute_monthly_statistics
 from app.schemas.medication import (
     MedicationCreate, MedicationUpdate, MedicationResponse,
     MedicationRecordCreate, MedicationRecordUpdate,
+    MedicationRecordBatchItemResult, MedicationRecordBatchResponse,
     DailyMedicationRecord, MedicationDoseResponse,
-    MonthlyStatistics, MedicationStatus
+    MonthlyStatistics, StreakResponse, MedicationStatus, DailyAdherence,
+    MedicationPage, MedicationRecordItem, MedicationRecordPage
+)
+from app.services.medication_store import create_medication_store
+from app.services.dose_schedule_service import (
+    dose_schedule_service, dose_template, expand_expected_doses, merge_doses
 )
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_filter
+from app.utils.serialization import build_model
+
+
+# 내보내기 시 한 번에 조회할 기록 수
+EXPORT_PAGE_SIZE = 1000
+
+# Postgres unique_violation 오류 코드
+UNIQUE_VIOLATION = "23505"
+
+
+def _statistics_ttl(user_id: str, year: int, month: int) -> int:
+    """월간 통계 캐시 TTL (지난 달은 기록이 거의 바뀌지 않으므로 길게)"""
+    today = date.today()
+    if (year, month) < (today.year, today.month):
+        return settings.STATISTICS_PAST_MONTH_CACHE_TTL_SECONDS
+    return settings.STATISTICS_CACHE_TTL_SECONDS
 
 
 class MedicationService:
-    """약물 관리 서비스"""
+    """약물 관리 서비스
+
+    조회 결과는 공유 캐시에 저장되며, 쓰기 메서드가 범위별로 무효화합니다.
+    - medications: 약물 목록/상세
+    - records: 일별 기록, 일별 집계
+    - statistics: 월간 통계 (기록이 바뀐 달만 삭제)
+
+    주요 조회는 STORAGE_BACKEND에 따라 PostgREST 또는 Postgres 직접 연결 저장소를 사용합니다.
+    """
+
+    def __init__(self):
+        self.store = create_medication_store()
 
     async def create_medication(self, user_id: str, medication_data: MedicationCreate) -> MedicationResponse:
         """약물 등록"""
@@ -27,49 +65,78 @@ class MedicationService:
             "updated_at": datetime.utcnow().isoformat()
         })
 
-        response = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: client.table("medications").insert(medication_dict).execute()
+        response = await execute(
+            client.table("medications").insert(medication_dict)
         )
 
         if not response.data:
             raise ValidationError("약물 등록에 실패했습니다")
 
+        # 새 약물의 예정 복용이 일별 기록에 반영되도록 records도 무효화
+        await cache.invalidate(user_id, "medications", "records")
+
         return MedicationResponse(**response.data[0])
 
+    @cached("medications", scope="medications")
     async def get_medications(self, user_id: str) -> List[MedicationResponse]:
         """사용자의 약물 목록 조회"""
+        rows = await self.store.list_medications(user_id)
+
+        return [build_model(MedicationResponse, item) for item in rows]
+
+    @cached("medications_page", scope="medications")
+    async def get_medications_page(
+        self,
+        user_id: str,
+        limit: int,
+        cursor: Optional[str] = None,
+        fields: Optional[List[str]] = None
+    ) -> MedicationPage:
+        """사용자의 약물 목록 조회 ((created_at, id) 키셋 페이지네이션, 필드 선택)"""
         client = get_service_supabase()
 
-        response = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: client.table("medications")
-            .select("*")
-            .eq("user_id", user_id)
-            .order("created_at", desc=True)
-            .execute()
+        if fields:
+            unknown = set(fields) - set(MedicationResponse.model_fields)
+            if unknown:
+                raise ValidationError(f"알 수 없는 필드입니다: {', '.join(sorted(unknown))}")
+            # 커서 생성에 필요한 정렬 키는 항상 포함
+            columns = ", ".join(sorted(set(fields) | {"id", "created_at"}))
+        else:
+            columns = "*"
+
+        query = client.table("medications").select(columns).eq("user_id", user_id)
+        if cursor:
+            query = query.or_(
+                keyset_filter(("created_at", "id"), decode_cursor(cursor, 2), descending=True)
+            )
+
+        # 다음 페이지 존재 여부 확인을 위해 한 행 더 조회
+        response = await execute(
+            query.order("created_at", desc=True).order("id", desc=True).limit(limit + 1)
         )
 
-        return [MedicationResponse(**item) for item in response.data]
+        rows = response.data[:limit]
+        next_cursor = None
+        if len(response.data) > limit:
+            next_cursor = encode_cursor([rows[-1]["created_at"], rows[-1]["id"]])
+
+        if not fields:
+            if settings.FAST_SERIALIZATION:
+                rows = [{name: row.get(name) for name in MedicationResponse.model_fields} for row in rows]
+            else:
+                rows = [MedicationResponse(**row).model_dump(mode="json") for row in rows]
+
+        return build_model(MedicationPage, {"items": rows, "next_cursor": next_cursor})
 
+    @cached("medication", scope="medications")
     async def get_medication(self, user_id: str, medication_id: str) -> MedicationResponse:
         """특정 약물 조회"""
-        client = get_service_supabase()
+        medication = await self.store.get_medication(user_id, medication_id)
 
-        response = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: client.table("medications")
-            .select("*")
-            .eq("user_id", user_id)
-            .eq("id", medication_id)
-            .single()
-            .execute()
-        )
-
-        if not response.data:
+        if not medication:
             raise NotFoundError("약물을 찾을 수 없습니다")
 
-        return MedicationResponse(**response.data)
+        return build_model(MedicationResponse, medication)
 
     async def update_medication(
         self,
@@ -87,34 +154,38 @@ class MedicationService:
         }
         update_data["updated_at"] = datetime.utcnow().isoformat()
 
-        response = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: client.table("medications")
+        response = await execute(
+            client.table("medications")
             .update(update_data)
             .eq("user_id", user_id)
             .eq("id", medication_id)
-            .execute()
         )
 
         if not response.data:
             raise NotFoundError("약물을 찾을 수 없습니다")
 
+        # 일별 기록 응답에 약물 이름이 포함되므로 records 범위도 무효화
+        await cache.invalidate(user_id, "medications", "records")
+
         return MedicationResponse(**response.data[0])
 
     async def delete_medication(self, user_id: str, medication_id: str) -> bool:
         """약물 삭제"""
         client = get_service_supabase()
 
-        response = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: client.table("medications")
+        response = await execute(
+            client.table("medications")
             .delete()
             .eq("user_id", user_id)
             .eq("id", medication_id)
-            .execute()
         )
 
-        return len(response.data) > 0
+        if not response.data:
+            return False
+
+        # 삭제된 약물의 복용 기록도 함께 삭제되므로(ON DELETE CASCADE) 사용자 캐시 전체 무효화
+        await cache.invalidate(user_id, "medications", "records", "statistics")
+        return True
 
     async def create_medication_record(
         self,
@@ -122,6 +193,8 @@ class MedicationService:
         record_data: MedicationRecordCreate
     ) -> MedicationDoseResponse:
         """복용 기록 생성"""
+        # 쓰기 전에 본인 약물인지 확인 (캐시된 약물 조회, 이름도 함께 사용)
+        medication = await self.get_medication(user_id, record_data.medication_id)
         client = get_service_supabase()
 
         record_dict = record_data.model_dump()
@@ -132,19 +205,37 @@ class MedicationService:
             "created_at": datetime.utcnow().isoformat()
         })
 
-        response = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: client.table("medication_records").insert(record_dict).execute()
-        )
+        try:
+            response = await execute(client.table("medication_records").insert(record_dict))
+        except APIError as e:
+            if e.code != UNIQUE_VIOLATION:
+                raise
+            # 같은 (약물, 날짜, 시간) 기록이 이미 있음: 야간 배치가 만든 missed 기록이면
+            # 늦게 온 기록으로 갱신하고, 그 밖의 기록(Idempotency-Key 없이 재시도 등)은 충돌
+            response = await execute(
+                client.table("medication_records")
+                .update({
+                    "status": record_data.status.value,
+                    "delay_reason": record_dict["delay_reason"],
+                    "taken_at": record_dict["taken_at"],
+                })
+                .eq("user_id", user_id)
+                .eq("medication_id", record_data.medication_id)
+                .eq("date", record_dict["date"])
+                .eq("time", record_data.time)
+                .eq("status", MedicationStatus.MISSED.value)
+            )
+            if not response.data:
+                raise ConflictError("이미 같은 시간의 복용 기록이 있습니다")
 
         if not response.data:
             raise ValidationError("복용 기록 생성에 실패했습니다")
 
-        # 약물 이름 가져오기
-        medication = await self.get_medication(user_id, record_data.medication_id)
+        await self._invalidate_records(user_id, [record_dict["date"]])
 
         return MedicationDoseResponse(
             id=response.data[0]["id"],
+            medication_id=record_data.medication_id,
             medication_name=medication.name,
             time=record_data.time,
             status=record_data.status,
@@ -152,35 +243,142 @@ class MedicationService:
             taken_at=datetime.fromisoformat(response.data[0]["taken_at"]) if response.data[0]["taken_at"] else None
         )
 
-    async def get_daily_records(self, user_id: str, target_date: date) -> DailyMedicationRecord:
-        """특정 날짜의 복용 기록 조회"""
+    async def create_medication_records_batch(
+        self,
+        user_id: str,
+        records: List[MedicationRecordCreate]
+    ) -> MedicationRecordBatchResponse:
+        """복용 기록 일괄 생성 (UNIQUE(user_id, medication_id, date, time) 기준 upsert)"""
         client = get_service_supabase()
 
-        date_str = target_date.isoformat()
-
-        response = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: client.table("medication_records")
-            .select("""
-                *,
-                medications(name, dosage_unit, single_dosage_amount)
-            """)
+        # 약물 이름 조회 (IN 쿼리 1회, 본인 약물인지 검증도 겸함)
+        medication_ids = list({record.medication_id for record in records})
+        medications_response = await execute(
+            client.table("medications")
+            .select("id, name")
             .eq("user_id", user_id)
-            .eq("date", date_str)
-            .order("time")
-            .execute()
+            .in_("id", medication_ids)
         )
+        medication_names = {item["id"]: item["name"] for item in medications_response.data}
+
+        # 같은 키의 중복 항목은 마지막 값으로 합침 (한 upsert 문에서 같은 행을 두 번 갱신할 수 없음)
+        now = datetime.utcnow().isoformat()
+        rows = {}
+        for record_data in records:
+            if record_data.medication_id not in medication_names:
+                continue
+            key = (record_data.medication_id, record_data.date.date().isoformat(), record_data.time)
+            rows[key] = {
+                "user_id": user_id,
+                "medication_id": record_data.medication_id,
+                "date": key[1],
+                "time": record_data.time,
+                "status": record_data.status.value,
+                "delay_reason": record_data.delay_reason,
+                "taken_at": now if record_data.status == MedicationStatus.TAKEN else None
+            }
+
+        saved = {}
+        if rows:
+            response = await execute(
+                client.table("medication_records")
+                .upsert(list(rows.values()), on_conflict="user_id,medication_id,date,time")
+            )
+            for record in response.data:
+                saved[(record["medication_id"], record["date"], record["time"])] = record
+            await self._invalidate_records(user_id, [key[1] for key in rows])
+
+        results = []
+        for index, record_data in enumerate(records):
+            if record_data.medication_id not in medication_names:
+                results.append(MedicationRecordBatchItemResult(
+                    index=index, success=False, error="약물을 찾을 수 없습니다"
+                ))
+                continue
+
+            key = (record_data.medication_id, record_data.date.date().isoformat(), record_data.time)
+            record = saved.get(key)
+            if record is None:
+                results.append(MedicationRecordBatchItemResult(
+                    index=index, success=False, error="복용 기록 생성에 실패했습니다"
+                ))
+                continue
+
+            results.append(MedicationRecordBatchItemResult(
+                index=index,
+                success=True,
+                record=MedicationDoseResponse(
+                    id=record["id"],
+                    medication_id=record_data.medication_id,
+                    medication_name=medication_names[record_data.medication_id],
+                    time=record["time"],
+                    status=MedicationStatus(record["status"]),
+                    delay_reason=record.get("delay_reason"),
+                    taken_at=datetime.fromisoformat(record["taken_at"]) if record.get("taken_at") else None
+                )
+            ))
+
+        success_count = len([r for r in results if r.success])
+        return MedicationRecordBatchResponse(
+            results=results,
+            success_count=success_count,
+            failure_count=len(results) - success_count
+        )
+
+    async def get_daily_records(self, user_id: str, target_date: date) -> DailyMedicationRecord:
+        """특정 날짜의 복용 기록 조회
+
+        복용 일정상 시간이 지났는데 기록이 없는 복용은 missed(id 없음)로 포함하므로
+        앱을 열지 않은 날도 완료율이 실제 일정 기준으로 계산됩니다.
+        missed 여부가 현재 시각에 따라 바뀌는 오늘/이후 날짜는 캐시하지 않습니다.
+        """
+        if target_date < dose_schedule_service.local_now().date():
+            return await self._get_past_daily_records(user_id, target_date)
+        return await self._build_daily_records(user_id, target_date)
+
+    @cached("daily_records", scope="records")
+    async def _get_past_daily_records(self, user_id: str, target_date: date) -> DailyMedicationRecord:
+        """지난 날짜의 복용 기록 (모든 예정 복용이 지났으므로 결과가 현재 시각과 무관)"""
+        return await self._build_daily_records(user_id, target_date)
+
+    async def _build_daily_records(self, user_id: str, target_date: date) -> DailyMedicationRecord:
+        records = await self.store.list_daily_records(user_id, target_date)
+
+        medications = await self.get_medications(user_id)
+        medication_names = {medication.id: medication.name for medication in medications}
+        templates = [
+            template for template in (
+                dose_template(dict(medication), dose_schedule_service.tz)
+                for medication in medications
+            ) if template
+        ]
+
+        now = dose_schedule_service.local_now()
+        now_key = (now.date().isoformat(), now.strftime("%H:%M"))
 
         doses = []
-        for record in response.data:
-            doses.append(MedicationDoseResponse(
-                id=record["id"],
-                medication_name=record["medications"]["name"],
-                time=record["time"],
-                status=MedicationStatus(record["status"]),
-                delay_reason=record.get("delay_reason"),
-                taken_at=datetime.fromisoformat(record["taken_at"]) if record.get("taken_at") else None
-            ))
+        for expected, record in merge_doses(
+            expand_expected_doses(templates, target_date, target_date),
+            records
+        ):
+            if record is not None:
+                doses.append(build_model(MedicationDoseResponse, {
+                    "id": record["id"],
+                    "medication_id": record["medication_id"],
+                    "medication_name": record["medications"]["name"],
+                    "time": record["time"],
+                    "status": MedicationStatus(record["status"]),
+                    "delay_reason": record.get("delay_reason"),
+                    "taken_at": record.get("taken_at")
+                }))
+            elif (expected.date.isoformat(), expected.time) <= now_key:
+                # 시간이 지났는데 기록이 없는 예정 복용
+                doses.append(build_model(MedicationDoseResponse, {
+                    "medication_id": expected.medication_id,
+                    "medication_name": medication_names[expected.medication_id],
+                    "time": expected.time,
+                    "status": MedicationStatus.MISSED
+                }))
 
         # 완료율 계산
         total_doses = len(doses)
@@ -195,12 +393,124 @@ class MedicationService:
         else:
             overall_status = MedicationStatus.DELAYED
 
-        return DailyMedicationRecord(
-            date=datetime.combine(target_date, datetime.min.time()),
-            doses=doses,
-            completion_rate=completion_rate,
-            overall_status=overall_status
+        return build_model(DailyMedicationRecord, {
+            "date": datetime.combine(target_date, datetime.min.time()),
+            "doses": doses,
+            "completion_rate": completion_rate,
+            "overall_status": overall_status
+        })
+
+    @cached("records_page", scope="records")
+    async def get_records_page(
+        self,
+        user_id: str,
+        start_date: date,
+        end_date: date,
+        limit: int,
+        cursor: Optional[str] = None
+    ) -> MedicationRecordPage:
+        """기간별 복용 기록 조회 ((date, time, id) 키셋 페이지네이션, 양 끝 날짜 포함)"""
+        client = get_service_supabase()
+
+        query = (
+            client.table("medication_records")
+            .select("id, medication_id, date, time, status, delay_reason, taken_at, medications(name)")
+            .eq("user_id", user_id)
+            .gte("date", start_date.isoformat())
+            .lte("date", end_date.isoformat())
         )
+        if cursor:
+            query = query.or_(keyset_filter(("date", "time", "id"), decode_cursor(cursor, 3)))
+
+        response = await execute(
+            query.order("date").order("time").order("id").limit(limit + 1)
+        )
+
+        rows = response.data[:limit]
+        next_cursor = None
+        if len(response.data) > limit:
+            next_cursor = encode_cursor([rows[-1]["date"], rows[-1]["time"], rows[-1]["id"]])
+
+        return build_model(MedicationRecordPage, {
+            "items": [
+                build_model(MedicationRecordItem, {
+                    "id": row["id"],
+                    "medication_id": row["medication_id"],
+                    "medication_name": row["medications"]["name"],
+                    "date": row["date"],
+                    "time": row["time"],
+                    "status": MedicationStatus(row["status"]),
+                    "delay_reason": row.get("delay_reason"),
+                    "taken_at": row.get("taken_at")
+                })
+                for row in rows
+            ],
+            "next_cursor": next_cursor
+        })
+
+    async def iter_record_pages(
+        self,
+        user_id: str,
+        start_date: Optional[date] = None,
+        end_date: Optional[date] = None,
+        page_size: int = EXPORT_PAGE_SIZE
+    ) -> AsyncIterator[List[dict]]:
+        """전체 복용 기록을 (date, time, id) 키셋으로 페이지 단위 순회 (내보내기용, 캐시 없음)
+
+        한 번에 한 페이지만 메모리에 두므로 기록 수와 무관하게 메모리 사용량이 일정합니다.
+        """
+        client = get_service_supabase()
+        last = None
+
+        while True:
+            query = (
+                client.table("medication_records")
+                .select("id, medication_id, date, time, status, delay_reason, taken_at, medications(name)")
+                .eq("user_id", user_id)
+            )
+            if start_date:
+                query = query.gte("date", start_date.isoformat())
+            if end_date:
+                query = query.lte("date", end_date.isoformat())
+            if last is not None:
+                query = query.or_(keyset_filter(("date", "time", "id"), last))
+
+            response = await execute(
+                query.order("date").order("time").order("id").limit(page_size)
+            )
+            rows = response.data
+            if not rows:
+                return
+
+            yield [
+                {
+                    "date": row["date"],
+                    "time": row["time"],
+                    "medication_id": row["medication_id"],
+                    "medication_name": (row.get("medications") or {}).get("name"),
+                    "status": row["status"],
+                    "delay_reason": row.get("delay_reason"),
+                    "taken_at": row.get("taken_at"),
+                    "id": row["id"],
+                }
+                for row in rows
+            ]
+
+            if len(rows) < page_size:
+                return
+            last = (rows[-1]["date"], rows[-1]["time"], rows[-1]["id"])
+
+    @cached("daily_adherence", scope="records")
+    async def get_daily_adherence(
+        self,
+        user_id: str,
+        start_date: date,
+        end_date: date
+    ) -> List[DailyAdherence]:
+        """기간별 일별 복용 집계 조회 (daily_adherence, 양 끝 날짜 포함)"""
+        rows = await self.store.list_daily_adherence(user_id, start_date, end_date)
+
+        return [DailyAdherence(**row) for row in rows]
 
     async def update_medication_record(
         self,
@@ -214,118 +524,60 @@ class MedicationService:
         update_dict = update_data.model_dump()
         update_dict["taken_at"] = datetime.utcnow().isoformat() if update_data.status == MedicationStatus.TAKEN else None
 
-        response = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: client.table("medication_records")
-            .update(update_dict)
-            .eq("user_id", user_id)
-            .eq("id", record_id)
-            .execute()
+        # 약물 이름은 반환 행에 임베딩해서 같은 요청으로 받음
+        response = await execute(
+            with_returning(
+                client.table("medication_records")
+                .update(update_dict)
+                .eq("user_id", user_id)
+                .eq("id", record_id),
+                "*, medications(name)"
+            )
         )
 
         if not response.data:
             raise NotFoundError("복용 기록을 찾을 수 없습니다")
 
         record = response.data[0]
-
-        # 약물 정보 가져오기
-        medication_response = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: client.table("medications")
-            .select("name")
-            .eq("id", record["medication_id"])
-            .single()
-            .execute()
-        )
+        await self._invalidate_records(user_id, [record["date"]])
 
         return MedicationDoseResponse(
             id=record["id"],
-            medication_name=medication_response.data["name"],
+            medication_id=record["medication_id"],
+            medication_name=record["medications"]["name"],
             time=record["time"],
             status=MedicationStatus(record["status"]),
             delay_reason=record.get("delay_reason"),
             taken_at=datetime.fromisoformat(record["taken_at"]) if record.get("taken_at") else None
         )
 
+    @cached("monthly_statistics", scope="statistics", ttl=_statistics_ttl)
     async def get_monthly_statistics(self, user_id: str, year: int, month: int) -> MonthlyStatistics:
-        """월간 통계 조회"""
-        client = get_service_supabase()
+        """월간 통계 조회 (DB 함수 get_monthly_statistics로 집계)"""
+        statistics = await self.store.get_monthly_statistics(user_id, year, month)
 
-        # 해당 월의 시작일과 종료일
-        start_date = date(year, month, 1)
-        if month == 12:
-            end_date = date(year + 1, 1, 1)
-        else:
-            end_date = date(year, month + 1, 1)
+        return MonthlyStatistics(**statistics)
 
-        response = await asyncio.get_event_loop().run_in_executor(
-            None,
-            lambda: client.table("medication_records")
-            .select("status, date, time")
-            .eq("user_id", user_id)
-            .gte("date", start_date.isoformat())
-            .lt("date", end_date.isoformat())
-            .execute()
-        )
+    @cached("streak", scope="records")
+    async def get_streak(self, user_id: str) -> StreakResponse:
+        """연속 복용 현황 조회 (기록 변경 시 DB 트리거가 갱신한 user_streaks 한 행)"""
+        streak = await self.store.get_streak(user_id)
+        if streak is None:
+            return StreakResponse(current_streak=0, longest_streak=0)
 
-        records = response.data
-        total_records = len(records)
+        return StreakResponse(**streak)
 
-        if total_records == 0:
-            return MonthlyStatistics(
-                average_completion_rate=0.0,
-                consecutive_days=0,
-                best_time="아침",
-                total_days=0,
-                completed_days=0
-            )
+    async def _invalidate_records(self, user_id: str, record_dates: Iterable[str]):
+        """복용 기록 변경 시 기록 캐시와 해당 달의 월간 통계 캐시 무효화
 
-        # 완료된 기록 수
-        completed_records = len([r for r in records if r["status"] == "taken"])
-        average_completion_rate = completed_records / total_records
-
-        # 연속 복용일 계산 (간단한 버전)
-        date_status = {}
-        for record in records:
-            record_date = record["date"]
-            if record_date not in date_status:
-                date_status[record_date] = []
-            date_status[record_date].append(record["status"])
-
-        consecutive_days = 0
-        for record_date in sorted(date_status.keys(), reverse=True):
-            day_statuses = date_status[record_date]
-            if all(status == "taken" for status in day_statuses):
-                consecutive_days += 1
-            else:
-                break
-
-        # 가장 많이 복용한 시간대
-        time_counts = {}
-        for record in records:
-            if record["status"] == "taken":
-                time_key = record["time"]
-                time_counts[time_key] = time_counts.get(time_key, 0) + 1
-
-        best_time = "아침"
-        if time_counts:
-            most_common_time = max(time_counts.keys(), key=lambda k: time_counts[k])
-            hour = int(most_common_time.split(":")[0])
-            if 6 <= hour < 12:
-                best_time = "아침"
-            elif 12 <= hour < 18:
-                best_time = "점심"
-            else:
-                best_time = "저녁"
-
-        return MonthlyStatistics(
-            average_completion_rate=average_completion_rate,
-            consecutive_days=consecutive_days,
-            best_time=best_time,
-            total_days=len(date_status),
-            completed_days=len([d for d, statuses in date_status.items()
-                              if all(s == "taken" for s in statuses)])
-        )
+        통계 재계산은 백그라운드 작업으로 넘겨 다음 조회가 캐시에서 응답되도록 합니다.
+        """
+        await cache.invalidate(user_id, "records")
+
+        for year, month in {(int(d[:4]), int(d[5:7])) for d in record_dates}:
+            await cache.delete_cached("monthly_statistics", user_id, "statistics", year, month)
+            if cache.enabled:
+                await enqueue(recompute_monthly_statistics, user_id, year, month)
 
 
 medication_service = MedicationService()
\ No newline at end of file
@@ -0,0 +1,340 @@
+import json
+import uuid
+from abc import ABC, abstractmethod
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any, List, Optional, Sequence
+
+from app.core.config import settings
+from app.core.database import execute, get_service_supabase, pg_fetch
+from app.utils.pagination import keyset_filter
+
+
+# 델타 동기화 대상 테이블: (변경 시각 컬럼, 조회 컬럼)
+SYNC_TABLES = {
+    "medications": ("updated_at", "*"),
+    "medication_records": (
+        "updated_at", "id, medication_id, date, time, status, delay_reason, taken_at, updated_at"
+    ),
+    "sync_tombstones": ("deleted_at", "id, entity_type, entity_id, deleted_at"),
+}
+
+
+class MedicationStore(ABC):
+    """MedicationService 주요 조회 쿼리의 저장소 인터페이스
+
+    반환 행은 PostgREST 응답과 같은 형태(dict, UUID/날짜는 문자열)여서
+    서비스 코드는 백엔드와 무관하게 동작합니다.
+    """
+
+    @abstractmethod
+    async def list_medications(self, user_id: str) -> List[dict]:
+        ...
+
+    @abstractmethod
+    async def get_medication(self, user_id: str, medication_id: str) -> Optional[dict]:
+        ...
+
+    @abstractmethod
+    async def list_daily_records(self, user_id: str, target_date: date) -> List[dict]:
+        """특정 날짜 기록 ((time, medication_id) 순, medications에 약물 정보 임베딩)"""
+
+    @abstractmethod
+    async def list_daily_adherence(self, user_id: str, start_date: date, end_date: date) -> List[dict]:
+        ...
+
+    @abstractmethod
+    async def get_monthly_statistics(self, user_id: str, year: int, month: int) -> dict:
+        ...
+
+    @abstractmethod
+    async def get_streak(self, user_id: str) -> Optional[dict]:
+        """연속 복용 상태 (user_streaks, 기록이 없던 사용자는 None)"""
+
+    @abstractmethod
+    async def list_analytics_records(
+        self, start_date: date, end_date: date, after: Optional[Sequence[str]], limit: int
+    ) -> List[Any]:
+        """전체 사용자 기간 내 기록을 (date, id) 순으로 after 이후 limit개 조회 (집계 배치용)
+
+        행은 user_id, date, id, time, status, form, dosage_unit(문자열)을 이름으로 읽을 수 있습니다.
+        """
+
+    @abstractmethod
+    async def list_changes(self, table: str, user_id: str, after: Sequence[str], limit: int) -> List[dict]:
+        """(변경 시각, id)가 after보다 큰 행을 그 순서로 limit개 조회 (SYNC_TABLES의 테이블)"""
+
+    @abstractmethod
+    async def get_db_time(self) -> str:
+        """DB 현재 시각 (ISO 문자열, 변경 시각 컬럼과 같은 시계)"""
+
+
+class PostgrestMedicationStore(MedicationStore):
+    """Supabase PostgREST(HTTP) 경유 저장소"""
+
+    async def list_medications(self, user_id: str) -> List[dict]:
+        client = get_service_supabase()
+        response = await execute(
+            client.table("medications")
+            .select("*")
+            .eq("user_id", user_id)
+            .order("created_at", desc=True)
+        )
+        return response.data
+
+    async def get_medication(self, user_id: str, medication_id: str) -> Optional[dict]:
+        client = get_service_supabase()
+        response = await execute(
+            client.table("medications")
+            .select("*")
+            .eq("user_id", user_id)
+            .eq("id", medication_id)
+            .maybe_single()
+        )
+        return response.data if response else None
+
+    async def list_daily_records(self, user_id: str, target_date: date) -> List[dict]:
+        client = get_service_supabase()
+        response = await execute(
+            client.table("medication_records")
+            .select("""
+                *,
+                medications(name, dosage_unit, single_dosage_amount)
+            """)
+            .eq("user_id", user_id)
+            .eq("date", target_date.isoformat())
+            .order("time")
+            .order("medication_id")
+        )
+        return response.data
+
+    async def list_daily_adherence(self, user_id: str, start_date: date, end_date: date) -> List[dict]:
+        client = get_service_supabase()
+        response = await execute(
+            client.table("daily_adherence")
+            .select("date, total_doses, taken_count, completion_rate, overall_status, updated_at")
+            .eq("user_id", user_id)
+            .gte("date", start_date.isoformat())
+            .lte("date", end_date.isoformat())
+            .order("date")
+        )
+        return response.data
+
+    async def get_monthly_statistics(self, user_id: str, year: int, month: int) -> dict:
+        client = get_service_supabase()
+        response = await execute(
+            client.rpc("get_monthly_statistics", {
+                "p_user_id": user_id,
+                "p_year": year,
+                "p_month": month
+            })
+        )
+        return response.data
+
+    async def get_streak(self, user_id: str) -> Optional[dict]:
+        client = get_service_supabase()
+        response = await execute(
+            client.table("user_streaks")
+            .select("current_streak, longest_streak, last_completed_date")
+            .eq("user_id", user_id)
+            .maybe_single()
+        )
+        return response.data if response else None
+
+    async def list_analytics_records(
+        self, start_date: date, end_date: date, after: Optional[Sequence[str]], limit: int
+    ) -> List[Any]:
+        client = get_service_supabase()
+        query = (
+            client.table("medication_records")
+            .select("id, user_id, date, time, status, medications(form, dosage_unit)")
+            .gte("date", start_date.isoformat())
+            .lte("date", end_date.isoformat())
+            .order("date")
+            .order("id")
+            .limit(limit)
+        )
+        if after is not None:
+            query = query.or_(keyset_filter(("date", "id"), after))
+        response = await execute(query)
+
+        rows = response.data
+        for row in rows:
+            medication = row.pop("medications") or {}
+            row["form"] = medication.get("form")
+            row["dosage_unit"] = medication.get("dosage_unit")
+        return rows
+
+    async def list_changes(self, table: str, user_id: str, after: Sequence[str], limit: int) -> List[dict]:
+        client = get_service_supabase()
+        column, columns = SYNC_TABLES[table]
+        response = await execute(
+            client.table(table)
+            .select(columns)
+            .eq("user_id", user_id)
+            .or_(keyset_filter((column, "id"), after))
+            .order(column)
+            .order("id")
+            .limit(limit)
+        )
+        return response.data
+
+    async def get_db_time(self) -> str:
+        client = get_service_supabase()
+        response = await execute(client.rpc("get_db_time", {}))
+        return response.data
+
+
+# asyncpg 저장소 SQL (상수로 두어 커넥션별 prepared statement 캐시를 재사용)
+LIST_MEDICATIONS_SQL = """
+    SELECT * FROM medications
+    WHERE user_id = $1
+    ORDER BY created_at DESC
+"""
+
+GET_MEDICATION_SQL = """
+    SELECT * FROM medications
+    WHERE user_id = $1 AND id = $2
+"""
+
+LIST_DAILY_RECORDS_SQL = """
+    SELECT r.*, m.name AS medication_name, m.dosage_unit, m.single_dosage_amount
+    FROM medication_records r
+    JOIN medications m ON m.id = r.medication_id
+    WHERE r.user_id = $1 AND r.date = $2
+    ORDER BY r.time, r.medication_id
+"""
+
+LIST_DAILY_ADHERENCE_SQL = """
+    SELECT date, total_doses, taken_count, completion_rate, overall_status, updated_at
+    FROM daily_adherence
+    WHERE user_id = $1 AND date BETWEEN $2 AND $3
+    ORDER BY date
+"""
+
+MONTHLY_STATISTICS_SQL = "SELECT get_monthly_statistics($1, $2, $3) AS statistics"
+
+GET_STREAK_SQL = """
+    SELECT current_streak, longest_streak, last_completed_date
+    FROM user_streaks
+    WHERE user_id = $1
+"""
+
+# 집계 배치용 (date, id) 키셋 조회, 값은 문자열로 받아 PostgREST 경로와 같은 형태로 사용
+LIST_ANALYTICS_RECORDS_SQL = """
+    SELECT r.id::text AS id, r.user_id::text AS user_id, r.date::text AS date,
+           r.time, r.status, m.form, m.dosage_unit
+    FROM medication_records r
+    LEFT JOIN medications m ON m.id = r.medication_id
+    WHERE r.date BETWEEN $1 AND $2 AND (r.date, r.id) > ($3, $4)
+    ORDER BY r.date, r.id
+    LIMIT $5
+"""
+
+LIST_CHANGES_SQL = {
+    table: f"""
+        SELECT {columns} FROM {table}
+        WHERE user_id = $1 AND ({column}, id) > ($2, $3)
+        ORDER BY {column}, id
+        LIMIT $4
+    """
+    for table, (column, columns) in SYNC_TABLES.items()
+}
+
+DB_TIME_SQL = "SELECT NOW() AS now"
+
+
+class AsyncpgMedicationStore(MedicationStore):
+    """asyncpg 풀로 Postgres에 직접 연결하는 저장소 (HTTP 홉 없음, 서비스 역할 전용)"""
+
+    async def list_medications(self, user_id: str) -> List[dict]:
+        rows = await pg_fetch("medications", LIST_MEDICATIONS_SQL, _uuid(user_id))
+        return [_row(row) for row in rows]
+
+    async def get_medication(self, user_id: str, medication_id: str) -> Optional[dict]:
+        medication_uuid = _uuid(medication_id)
+        if medication_uuid is None:
+            return None
+        rows = await pg_fetch("medications", GET_MEDICATION_SQL, _uuid(user_id), medication_uuid)
+        return _row(rows[0]) if rows else None
+
+    async def list_daily_records(self, user_id: str, target_date: date) -> List[dict]:
+        rows = await pg_fetch("medication_records", LIST_DAILY_RECORDS_SQL, _uuid(user_id), target_date)
+        records = []
+        for row in rows:
+            record = _row(row)
+            record["medications"] = {
+                "name": record.pop("medication_name"),
+                "dosage_unit": record.pop("dosage_unit"),
+                "single_dosage_amount": record.pop("single_dosage_amount"),
+            }
+            records.append(record)
+        return records
+
+    async def list_daily_adherence(self, user_id: str, start_date: date, end_date: date) -> List[dict]:
+        rows = await pg_fetch(
+            "daily_adherence", LIST_DAILY_ADHERENCE_SQL, _uuid(user_id), start_date, end_date
+        )
+        return [_row(row) for row in rows]
+
+    async def get_monthly_statistics(self, user_id: str, year: int, month: int) -> dict:
+        rows = await pg_fetch(
+            "rpc/get_monthly_statistics", MONTHLY_STATISTICS_SQL, _uuid(user_id), year, month
+        )
+        return json.loads(rows[0]["statistics"])
+
+    async def get_streak(self, user_id: str) -> Optional[dict]:
+        rows = await pg_fetch("user_streaks", GET_STREAK_SQL, _uuid(user_id))
+        return _row(rows[0]) if rows else None
+
+    async def list_analytics_records(
+        self, start_date: date, end_date: date, after: Optional[Sequence[str]], limit: int
+    ) -> List[Any]:
+        after_date, after_id = (
+            (date.fromisoformat(after[0]), _uuid(after[1])) if after else (date.min, uuid.UUID(int=0))
+        )
+        # 행 변환 없이 Record를 그대로 반환 (행 수가 많아 이름 접근만 사용)
+        return await pg_fetch(
+            "medication_records", LIST_ANALYTICS_RECORDS_SQL,
+            start_date, end_date, after_date, after_id, limit
+        )
+
+    async def list_changes(self, table: str, user_id: str, after: Sequence[str], limit: int) -> List[dict]:
+        rows = await pg_fetch(
+            table, LIST_CHANGES_SQL[table],
+            _uuid(user_id), datetime.fromisoformat(after[0]), _uuid(after[1]), limit
+        )
+        return [_row(row) for row in rows]
+
+    async def get_db_time(self) -> str:
+        rows = await pg_fetch("db_time", DB_TIME_SQL)
+        return rows[0]["now"].isoformat()
+
+
+def _uuid(value: str) -> Optional[uuid.UUID]:
+    try:
+        return uuid.UUID(value)
+    except (ValueError, TypeError):
+        return None
+
+
+def _row(record: Any) -> dict:
+    """asyncpg Record를 PostgREST 응답과 같은 JSON 형태의 dict로 변환"""
+    return {key: _jsonable(value) for key, value in record.items()}
+
+
+def _jsonable(value: Any) -> Any:
+    if isinstance(value, uuid.UUID):
+        return str(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    if isinstance(value, Decimal):
+        return float(value)
+    return value
+
+
+def create_medication_store() -> MedicationStore:
+    """설정에 따라 저장소 생성 (STORAGE_BACKEND=asyncpg이면 Postgres 직접 연결)"""
+    if settings.STORAGE_BACKEND == "asyncpg":
+        return AsyncpgMedicationStore()
+    return PostgrestMedicationStore()
@@ -0,0 +1,143 @@
+import hmac
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from typing import Optional
+
+from app.core.cache import CacheBackend, cache
+from app.core.config import settings
+from app.core.database import execute, get_service_supabase
+
+
+class RefreshTokenStore(ABC):
+    """리프레시 토큰 저장소 인터페이스 (발급/1회 사용/계열 폐기)
+
+    토큰 원문 대신 해시만 저장합니다. 레코드는
+    id, user_id, family_id, token_hash, claims(액세스 토큰 클레임), expires_at(ISO 문자열)입니다.
+    """
+
+    @abstractmethod
+    async def save(self, record: dict):
+        ...
+
+    @abstractmethod
+    async def consume(self, token_id: str, token_hash: str) -> Optional[dict]:
+        """해시가 맞고 만료/폐기/사용되지 않은 토큰을 사용 처리 후 반환 (원자적, 아니면 None)"""
+
+    @abstractmethod
+    async def find_used(self, token_id: str, token_hash: str) -> Optional[dict]:
+        """이미 사용된 토큰이면 레코드에 used_at(ISO 문자열)과 revoked(계열 폐기 여부)를 더해 반환 (재사용 감지용)"""
+
+    @abstractmethod
+    async def revoke_family(self, family_id: str):
+        """같은 로그인에서 이어진 토큰 전체 폐기"""
+
+    async def purge_expired(self) -> int:
+        """만료된 토큰 삭제, 삭제한 수 반환 (TTL로 만료되는 저장소는 0)"""
+        return 0
+
+
+class CacheRefreshTokenStore(RefreshTokenStore):
+    """공유 캐시 백엔드(Redis) 저장소, 만료는 키 TTL로 처리"""
+
+    def __init__(self, backend: CacheBackend, prefix: str = "healthplus:refresh"):
+        self.backend = backend
+        self.prefix = prefix
+        # 사용/폐기 표시는 계열의 어떤 토큰보다 오래 유지
+        self.marker_ttl = settings.REFRESH_TOKEN_EXPIRY_DAYS * 86400
+
+    async def save(self, record: dict):
+        expires_at = datetime.fromisoformat(record["expires_at"])
+        ttl = max(int((expires_at - datetime.now(timezone.utc)).total_seconds()), 1)
+        await self.backend.set(f"{self.prefix}:token:{record['id']}", record, ttl)
+
+    async def _get(self, token_id: str, token_hash: str) -> Optional[dict]:
+        record = await self.backend.get(f"{self.prefix}:token:{token_id}")
+        if record is None or not hmac.compare_digest(record["token_hash"], token_hash):
+            return None
+        return record
+
+    async def consume(self, token_id: str, token_hash: str) -> Optional[dict]:
+        record = await self._get(token_id, token_hash)
+        if record is None:
+            return None
+        if await self.backend.get(f"{self.prefix}:revoked:{record['family_id']}") is not None:
+            return None
+        used_at = datetime.now(timezone.utc).isoformat()
+        if not await self.backend.add(f"{self.prefix}:used:{token_id}", used_at, self.marker_ttl):
+            return None
+        return record
+
+    async def find_used(self, token_id: str, token_hash: str) -> Optional[dict]:
+        record = await self._get(token_id, token_hash)
+        if record is None:
+            return None
+        used_at = await self.backend.get(f"{self.prefix}:used:{token_id}")
+        if used_at is None:
+            return None
+        revoked = await self.backend.get(f"{self.prefix}:revoked:{record['family_id']}") is not None
+        return {**record, "used_at": used_at, "revoked": revoked}
+
+    async def revoke_family(self, family_id: str):
+        await self.backend.set(f"{self.prefix}:revoked:{family_id}", 1, self.marker_ttl)
+
+
+class PostgrestRefreshTokenStore(RefreshTokenStore):
+    """refresh_tokens 테이블 저장소 (REDIS_URL이 없을 때, 워커/파드 간 공유)"""
+
+    async def save(self, record: dict):
+        client = get_service_supabase()
+        await execute(client.table("refresh_tokens").insert(record))
+
+    async def consume(self, token_id: str, token_hash: str) -> Optional[dict]:
+        client = get_service_supabase()
+        now = datetime.now(timezone.utc).isoformat()
+        # 조건부 UPDATE 한 문장으로 검증과 사용 처리를 같이 해 동시 요청 중 하나만 성공
+        response = await execute(
+            client.table("refresh_tokens")
+            .update({"used_at": now})
+            .eq("id", token_id)
+            .eq("token_hash", token_hash)
+            .gt("expires_at", now)
+            .is_("used_at", "null")
+            .is_("revoked_at", "null")
+        )
+        return response.data[0] if response.data else None
+
+    async def find_used(self, token_id: str, token_hash: str) -> Optional[dict]:
+        client = get_service_supabase()
+        response = await execute(
+            client.table("refresh_tokens")
+            .select("id, user_id, family_id, claims, expires_at, used_at, revoked_at")
+            .eq("id", token_id)
+            .eq("token_hash", token_hash)
+            .not_.is_("used_at", "null")
+        )
+        if not response.data:
+            return None
+        record = response.data[0]
+        return {**record, "revoked": record["revoked_at"] is not None}
+
+    async def revoke_family(self, family_id: str):
+        client = get_service_supabase()
+        await execute(
+            client.table("refresh_tokens")
+            .update({"revoked_at": datetime.now(timezone.utc).isoformat()})
+            .eq("family_id", family_id)
+            .is_("revoked_at", "null")
+        )
+
+    async def purge_expired(self) -> int:
+        client = get_service_supabase()
+        response = await execute(
+            client.table("refresh_tokens")
+            .delete()
+            .lt("expires_at", datetime.now(timezone.utc).isoformat())
+        )
+        return len(response.data)
+
+
+def create_refresh_token_store() -> RefreshTokenStore:
+    """설정에 따라 저장소 생성 (REDIS_URL이 있으면 Redis, 없으면 DB)"""
+    if settings.REDIS_URL:
+        return CacheRefreshTokenStore(cache.backend)
+    return PostgrestRefreshTokenStore()
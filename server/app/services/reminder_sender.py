@@ -0,0 +1,45 @@
+import importlib
+import logging
+from abc import ABC, abstractmethod
+from typing import List
+
+from app.core.config import settings
+from app.schemas.reminder import Reminder
+
+
+logger = logging.getLogger(__name__)
+
+
+class ReminderSender(ABC):
+    """복용 알림 발송 인터페이스
+
+    REMINDER_SENDER에 "모듈:클래스" 형식으로 구현체를 지정할 수 있습니다.
+    """
+
+    @abstractmethod
+    async def send(self, reminders: List[Reminder]):
+        """알림 일괄 발송"""
+
+
+class LogReminderSender(ReminderSender):
+    """로그로만 남기는 로컬 발송기 (푸시 연동 전/개발용)"""
+
+    async def send(self, reminders: List[Reminder]):
+        for reminder in reminders:
+            logger.info(
+                "reminder user=%s medication=%s(%s) dose_at=%s",
+                reminder.user_id,
+                reminder.medication_name,
+                reminder.medication_id,
+                reminder.dose_at.isoformat()
+            )
+
+
+def create_reminder_sender() -> ReminderSender:
+    """설정에 따라 알림 발송기 생성 (푸시 알림 비활성화 시 로그 발송기)"""
+    if not settings.PUSH_NOTIFICATION_ENABLED or settings.REMINDER_SENDER == "log":
+        return LogReminderSender()
+
+    module_name, _, class_name = settings.REMINDER_SENDER.partition(":")
+    sender_class = getattr(importlib.import_module(module_name), class_name)
+    return sender_class()
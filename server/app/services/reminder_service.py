@@ -0,0 +1,426 @@
+import asyncio
+import heapq
+import logging
+import time as clock
+from datetime import datetime, time, timedelta, timezone
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+from zoneinfo import ZoneInfo
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.database import execute, get_service_supabase
+from app.core.leader import LeaderLock, create_leader_lock
+from app.core.metrics import REMINDERS_DISPATCHED
+from app.schemas.reminder import Reminder
+from app.services.reminder_sender import ReminderSender, create_reminder_sender
+from app.utils.dosage import normalize_dosage_times
+from app.utils.pagination import keyset_filter
+
+
+logger = logging.getLogger(__name__)
+
+# 알림 계산에 필요한 약물 컬럼 (알림 설정 임베딩)
+MEDICATION_COLUMNS = "id, user_id, name, dosage_times, notification_settings(is_enabled, reminder_minutes_before)"
+
+# 전체 적재/변경 조회 페이지 크기
+LOAD_PAGE_SIZE = 1000
+
+# id IN (...) 조회 한 번에 넣을 id 수 (URL 길이 제한)
+IN_CHUNK_SIZE = 100
+
+# 변경 조회 시 워터마크 이전까지 겹쳐 조회할 시간 (커밋 지연/시계 차이 보정, 재계산은 멱등)
+SYNC_OVERLAP = timedelta(seconds=60)
+
+# 마지막 발송 시각 워터마크 캐시 키 (리더 교체 시 이어받음)
+DISPATCHED_UNTIL_KEY = "reminders:dispatched_until"
+
+ReminderKey = Tuple[str, str]  # (medication_id, dosage_time)
+
+
+class ReminderSchedule:
+    """(약물, 복용 시간)별 다음 알림 시각 최소 힙
+
+    항목을 바꾸면 새 세대로 다시 넣고, 예전 힙 항목은 꺼낼 때 버립니다(지연 삭제).
+    다음 알림 시각은 현재 시각이 아니라 발송 워터마크(dispatched_until) 이후로 계산하므로
+    도래했지만 아직 꺼내지 않은 알림이 약물 수정/재적재로 다음 날로 밀리지 않습니다.
+    """
+
+    def __init__(self, tz: ZoneInfo):
+        self.tz = tz
+        self._heap: List[Tuple[datetime, int, ReminderKey]] = []
+        self._entries: Dict[ReminderKey, Tuple[datetime, int]] = {}
+        self._medications: Dict[str, dict] = {}
+        self._seq = 0
+        # 이 시각까지 도래한 항목은 모두 꺼냄 (None이면 upsert의 now 기준)
+        self.dispatched_until: Optional[datetime] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get_medication(self, medication_id: str) -> Optional[dict]:
+        return self._medications.get(medication_id)
+
+    def upsert(self, medication: dict, now: datetime):
+        """약물 하나의 알림 항목 재계산 (다른 약물 항목은 건드리지 않음)"""
+        medication_id = medication["id"]
+        setting = _notification_setting(medication)
+
+        if not setting["is_enabled"]:
+            self.remove(medication_id)
+            return
+
+        dosage_times = set(normalize_dosage_times(medication.get("dosage_times") or []))
+        previous = self._medications.get(medication_id)
+        if previous is not None:
+            for dosage_time in previous["dosage_times"] - dosage_times:
+                self._entries.pop((medication_id, dosage_time), None)
+
+        info = {
+            "user_id": medication["user_id"],
+            "name": medication["name"],
+            "dosage_times": dosage_times,
+            "minutes_before": setting["reminder_minutes_before"],
+        }
+        self._medications[medication_id] = info
+
+        after = self.dispatched_until or now
+        for dosage_time in dosage_times:
+            key = (medication_id, dosage_time)
+            entry = self._entries.get(key)
+            if entry is None:
+                self._push(key, self.next_fire_at(dosage_time, info["minutes_before"], after))
+            elif entry[0] > now and previous["minutes_before"] != info["minutes_before"]:
+                # 같은 복용 회차를 유지하고 알림 분만 반영 (이미 지났으면 바로 발송)
+                shift = timedelta(minutes=previous["minutes_before"] - info["minutes_before"])
+                self._push(key, entry[0] + shift)
+            # 복용 시간이 그대로인 항목(도래했지만 아직 꺼내지 않은 항목 포함)은 유지
+
+        self._compact()
+
+    def remove(self, medication_id: str):
+        """약물의 알림 항목 모두 제거"""
+        info = self._medications.pop(medication_id, None)
+        if info is None:
+            return
+        for dosage_time in info["dosage_times"]:
+            self._entries.pop((medication_id, dosage_time), None)
+
+    def peek(self) -> Optional[datetime]:
+        """가장 이른 알림 시각"""
+        self._discard_stale()
+        return self._heap[0][0] if self._heap else None
+
+    def pop_due(self, now: datetime, limit: int) -> List[Tuple[ReminderKey, datetime]]:
+        """now까지 도래한 알림을 최대 limit개 꺼내고 다음 날 시각으로 다시 예약"""
+        due = []
+        while True:
+            self._discard_stale()
+            if not self._heap or self._heap[0][0] > now:
+                self.dispatched_until = now
+                break
+            if len(due) >= limit:
+                # 남은 도래 항목 직전까지만 꺼낸 것으로 기록
+                self.dispatched_until = self._heap[0][0] - timedelta(microseconds=1)
+                break
+
+            fire_at, _, key = heapq.heappop(self._heap)
+            due.append((key, fire_at))
+
+            info = self._medications[key[0]]
+            self._push(key, self.next_fire_at(key[1], info["minutes_before"], fire_at))
+        return due
+
+    def next_fire_at(self, dosage_time: str, minutes_before: int, after: datetime) -> datetime:
+        """after 이후 첫 알림 시각 (현지 시간 기준 복용 시각 - 알림 분)"""
+        hour, minute = map(int, dosage_time.split(":"))
+        offset = timedelta(minutes=minutes_before)
+        day = after.astimezone(self.tz).date() - timedelta(days=offset.days + 1)
+        while True:
+            fire_at = datetime.combine(day, time(hour, minute), tzinfo=self.tz) - offset
+            if fire_at > after:
+                return fire_at.astimezone(timezone.utc)
+            day += timedelta(days=1)
+
+    def _push(self, key: ReminderKey, fire_at: datetime):
+        self._seq += 1
+        self._entries[key] = (fire_at, self._seq)
+        heapq.heappush(self._heap, (fire_at, self._seq, key))
+
+    def _discard_stale(self):
+        while self._heap:
+            fire_at, seq, key = self._heap[0]
+            if self._entries.get(key) == (fire_at, seq):
+                return
+            heapq.heappop(self._heap)
+
+    def _compact(self):
+        # 버려진 항목이 많이 쌓이면 힙 재구성
+        if len(self._heap) > 2 * len(self._entries) + 1024:
+            self._heap = [(fire_at, seq, key) for key, (fire_at, seq) in self._entries.items()]
+            heapq.heapify(self._heap)
+
+
+class ReminderService:
+    """복용 알림 스케줄러
+
+    리더 워커 하나만 실행합니다. 시작 시 약물을 한 번 적재해 힙을 만들고, 이후에는
+    updated_at 워터마크로 바뀐 약물/알림 설정만 다시 계산합니다. 다음 알림 시각까지
+    대기하다가 도래한 알림을 묶어서 발송합니다.
+
+    리더 잠금은 별도 태스크가 LEADER_LOCK_TTL_SECONDS / 3마다 갱신하므로 적재/조회/발송이
+    오래 걸려도 잠금이 만료되지 않고, 발송 묶음마다 잠금 유효 시간이 남았는지 확인해
+    잃었으면 발송하지 않습니다.
+    """
+
+    def __init__(self):
+        self.schedule = ReminderSchedule(ZoneInfo(settings.APP_TIMEZONE))
+        self._leader: Optional[LeaderLock] = None
+        self._sender: Optional[ReminderSender] = None
+        self._task: Optional[asyncio.Task] = None
+        self._lease_task: Optional[asyncio.Task] = None
+        # 리더 잠금이 유효하다고 볼 수 있는 시각 (time.monotonic 기준, 0이면 리더 아님)
+        self._lease_until = 0.0
+        self._loaded = False
+        self._watermark: Optional[datetime] = None
+
+    @property
+    def is_leader(self) -> bool:
+        return clock.monotonic() < self._lease_until
+
+    def start(self):
+        """스케줄러 시작 (워커마다 호출되며 리더만 알림을 발송)"""
+        if self._task is None:
+            self._leader = create_leader_lock("reminders")
+            self._sender = create_reminder_sender()
+            self._lease_task = asyncio.create_task(self._renew_lease())
+            self._task = asyncio.create_task(self._run())
+
+    async def stop(self):
+        """스케줄러 종료"""
+        for task in (self._task, self._lease_task):
+            if task is not None:
+                task.cancel()
+                try:
+                    await task
+                except asyncio.CancelledError:
+                    pass
+        self._task = self._lease_task = None
+        self._lease_until = 0.0
+        if self._leader is not None:
+            await self._leader.release()
+
+    async def _renew_lease(self):
+        """리더 잠금 획득/갱신 (발송 루프와 별도로 주기 실행)"""
+        renew_interval = settings.LEADER_LOCK_TTL_SECONDS / 3
+        while True:
+            started = clock.monotonic()
+            try:
+                if await self._leader.acquire():
+                    # 요청 전 시각 기준 TTL에서 갱신 주기만큼 여유를 둠 (발송 한 묶음이 끝날 시간)
+                    self._lease_until = started + settings.LEADER_LOCK_TTL_SECONDS - renew_interval
+                else:
+                    self._lease_until = 0.0
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # 갱신하지 못하면 기존 유효 시각이 지나는 대로 리더가 아닌 것으로 처리
+                logger.warning("leader lease renewal failed: %s", e)
+            await asyncio.sleep(renew_interval)
+
+    async def _run(self):
+        renew_interval = settings.LEADER_LOCK_TTL_SECONDS / 3
+        while True:
+            try:
+                if not self.is_leader:
+                    self._reset()
+                    await asyncio.sleep(min(renew_interval, 1.0))
+                    continue
+
+                if not self._loaded:
+                    await self.load_all()
+
+                # 도래한 알림을 먼저 꺼내 발송한 뒤 변경분을 반영
+                now = _utcnow()
+                due = self.schedule.pop_due(now, settings.REMINDER_BATCH_SIZE)
+                if due:
+                    await self.dispatch(due)
+                    continue
+
+                if now - self._watermark >= timedelta(seconds=settings.REMINDER_SYNC_INTERVAL_SECONDS):
+                    await self.sync_changes()
+                    await self._save_dispatched_until()
+                    continue
+
+                wake_at = now + timedelta(seconds=renew_interval)
+                next_fire = self.schedule.peek()
+                if next_fire is not None:
+                    wake_at = min(wake_at, next_fire)
+                await asyncio.sleep(max((wake_at - _utcnow()).total_seconds(), 0.05))
+
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.exception("reminder scheduler error: %s", e)
+                await asyncio.sleep(5)
+
+    def _reset(self):
+        # 리더가 아니면 메모리 상태를 버리고, 다시 리더가 되면 새로 적재
+        if self._loaded:
+            self.schedule = ReminderSchedule(self.schedule.tz)
+            self._loaded = False
+
+    async def load_all(self):
+        """전체 약물 적재 (리더가 된 직후 한 번, id 키셋 페이지네이션)
+
+        이전 리더가 기록한 발송 워터마크부터 다음 알림 시각을 계산하므로
+        리더가 없던 동안 도래한 알림도 발송합니다 (최대 REMINDER_CATCHUP_SECONDS 전까지).
+        """
+        started_at = _utcnow()
+        self.schedule.dispatched_until = await self._load_dispatched_until(started_at)
+        client = get_service_supabase()
+        last_id = None
+        while True:
+            query = client.table("medications").select(MEDICATION_COLUMNS).order("id").limit(LOAD_PAGE_SIZE)
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            response = await execute(query)
+
+            for medication in response.data:
+                self.schedule.upsert(medication, started_at)
+            if len(response.data) < LOAD_PAGE_SIZE:
+                break
+            last_id = response.data[-1]["id"]
+
+        self._watermark = started_at
+        self._loaded = True
+        logger.info("reminder schedule loaded: %d entries", len(self.schedule))
+
+    async def sync_changes(self):
+        """워터마크 이후 바뀐 약물/알림 설정의 항목만 재계산"""
+        started_at = _utcnow()
+        since = (self._watermark - SYNC_OVERLAP).isoformat()
+        client = get_service_supabase()
+
+        async for medication in self._iter_changed(
+            lambda: client.table("medications").select(MEDICATION_COLUMNS + ", updated_at"),
+            since
+        ):
+            self.schedule.upsert(medication, started_at)
+
+        setting_medication_ids = [
+            row["medication_id"]
+            async for row in self._iter_changed(
+                lambda: client.table("notification_settings").select("id, medication_id, updated_at"),
+                since
+            )
+            if row.get("medication_id")
+        ]
+        await self._refresh_medications(setting_medication_ids, started_at)
+
+        self._watermark = started_at
+
+    async def dispatch(self, due: List[Tuple[ReminderKey, datetime]]):
+        """도래한 알림을 최신 약물 정보로 확인 후 일괄 발송"""
+        now = _utcnow()
+        current = await self._refresh_medications({key[0] for key, _ in due}, now)
+
+        reminders = []
+        for (medication_id, dosage_time), fire_at in due:
+            info = self.schedule.get_medication(medication_id)
+            if medication_id not in current or info is None or dosage_time not in info["dosage_times"]:
+                continue  # 삭제/비활성화/시간 변경된 약물
+            reminders.append(Reminder(
+                user_id=info["user_id"],
+                medication_id=medication_id,
+                medication_name=info["name"],
+                dosage_time=dosage_time,
+                dose_at=fire_at + timedelta(minutes=info["minutes_before"]),
+                fire_at=fire_at
+            ))
+
+        if not reminders:
+            return
+        if not self.is_leader:
+            # 조회하는 동안 잠금을 잃었으면 새 리더가 발송하도록 중단
+            logger.warning("leader lease lost, %d reminders not dispatched", len(reminders))
+            self._reset()
+            return
+        try:
+            await self._sender.send(reminders)
+            REMINDERS_DISPATCHED.labels("sent").inc(len(reminders))
+        except Exception as e:
+            REMINDERS_DISPATCHED.labels("failed").inc(len(reminders))
+            logger.exception("reminder send failed: %s", e)
+        await self._save_dispatched_until()
+
+    async def _load_dispatched_until(self, now: datetime) -> datetime:
+        """공유 캐시의 발송 워터마크 (없으면 now, 너무 오래됐으면 REMINDER_CATCHUP_SECONDS 전)"""
+        if not cache.shared:
+            return now
+        stored = await cache.get(f"{cache.prefix}:{DISPATCHED_UNTIL_KEY}")
+        if stored is None:
+            return now
+        earliest = now - timedelta(seconds=settings.REMINDER_CATCHUP_SECONDS)
+        return min(max(datetime.fromisoformat(stored), earliest), now)
+
+    async def _save_dispatched_until(self):
+        """발송 워터마크를 공유 캐시에 기록 (다음 리더가 이어받음)"""
+        if cache.shared and self.schedule.dispatched_until is not None:
+            await cache.set(
+                f"{cache.prefix}:{DISPATCHED_UNTIL_KEY}",
+                self.schedule.dispatched_until.isoformat(),
+                settings.REMINDER_CATCHUP_SECONDS
+            )
+
+    async def _refresh_medications(self, medication_ids: Iterable[str], now: datetime) -> Set[str]:
+        """지정한 약물만 다시 조회해 항목 재계산 (없어진 약물은 제거), 존재하는 id 반환"""
+        medication_ids = list(dict.fromkeys(medication_ids))
+        client = get_service_supabase()
+        found = set()
+
+        for i in range(0, len(medication_ids), IN_CHUNK_SIZE):
+            chunk = medication_ids[i:i + IN_CHUNK_SIZE]
+            response = await execute(
+                client.table("medications").select(MEDICATION_COLUMNS).in_("id", chunk)
+            )
+            for medication in response.data:
+                found.add(medication["id"])
+                self.schedule.upsert(medication, now)
+            for medication_id in set(chunk) - found:
+                self.schedule.remove(medication_id)
+
+        return found
+
+    async def _iter_changed(self, query_factory, since: str):
+        """updated_at >= since 인 행을 (updated_at, id) 키셋으로 순회"""
+        last = None
+        while True:
+            query = query_factory().gte("updated_at", since).order("updated_at").order("id").limit(LOAD_PAGE_SIZE)
+            if last is not None:
+                query = query.or_(keyset_filter(("updated_at", "id"), last))
+            response = await execute(query)
+
+            for row in response.data:
+                yield row
+            if len(response.data) < LOAD_PAGE_SIZE:
+                return
+            last = (response.data[-1]["updated_at"], response.data[-1]["id"])
+
+
+def _notification_setting(medication: dict) -> dict:
+    """약물에 임베딩된 알림 설정 (없으면 기본값: 활성, 0분 전)"""
+    embedded = medication.get("notification_settings") or []
+    if isinstance(embedded, dict):
+        embedded = [embedded]
+    setting = embedded[0] if embedded else {}
+    return {
+        "is_enabled": setting.get("is_enabled", True) is not False,
+        "reminder_minutes_before": setting.get("reminder_minutes_before") or 0,
+    }
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+reminder_service = ReminderService()
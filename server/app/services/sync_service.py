@@ -0,0 +1,126 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional
+
+from postgrest.types import ReturnMethod
+
+from app.core.config import settings
+from app.core.database import execute, get_service_supabase
+from app.core.exceptions import GoneError, ValidationError
+from app.schemas.medication import MedicationResponse
+from app.schemas.sync import SyncRecordItem, SyncResponse, SyncTombstone
+from app.services.medication_store import SYNC_TABLES, create_medication_store
+from app.utils.pagination import decode_cursor, encode_cursor
+from app.utils.serialization import build_model
+
+
+# 커서에 위치를 담는 순서 (발급 시각 다음에 테이블별 (변경 시각, id))
+SYNC_STREAMS = ("medications", "medication_records", "sync_tombstones")
+
+# since 없이 처음 동기화할 때의 시작 위치 (모든 행보다 앞)
+SYNC_ORIGIN = ["0001-01-01T00:00:00+00:00", "00000000-0000-0000-0000-000000000000"]
+
+# 삭제 기록 정리 한 번에 지울 수 (id IN (...) 조건의 URL 길이 제한)
+PURGE_BATCH_SIZE = 100
+
+
+class SyncService:
+    """델타 동기화 서비스
+
+    테이블별로 (updated_at, id) 키셋 위치를 커서에 담아 그 이후 변경분만 조회합니다.
+    변경이 없으면 테이블당 인덱스 범위 조회 한 번(빈 결과)으로 끝납니다.
+    다 읽은 테이블의 위치는 조회 시점의 DB 시각 - SYNC_SAFETY_WINDOW_SECONDS로 두어
+    조회 시점에 아직 커밋되지 않았던 쓰기도 다음 동기화에서 읽습니다(중복 전달 가능).
+    변경 시각 컬럼이 DB의 NOW()로 기록되므로 위치도 앱 서버 시계가 아닌 DB 시각으로 정합니다.
+    """
+
+    def __init__(self):
+        self.store = create_medication_store()
+
+    async def get_changes(self, user_id: str, since: Optional[str], limit: int) -> SyncResponse:
+        """since 커서 이후 생성/수정/삭제된 약물과 복용 기록 조회"""
+        positions = self._decode_positions(since, datetime.now(timezone.utc))
+
+        # DB 시각은 변경 조회와 동시에 가져옴 (조회 사이의 차이는 안전 구간으로 보정)
+        # 다음 페이지 존재 여부 확인을 위해 한 행 더 조회
+        db_time, *results = await asyncio.gather(
+            self.store.get_db_time(),
+            *(
+                self.store.list_changes(table, user_id, positions[table], limit + 1)
+                for table in SYNC_STREAMS
+            )
+        )
+
+        started_at = datetime.fromisoformat(db_time)
+        caught_up = [
+            (started_at - timedelta(seconds=settings.SYNC_SAFETY_WINDOW_SECONDS)).isoformat(),
+            SYNC_ORIGIN[1]
+        ]
+        rows: Dict[str, List[dict]] = {}
+        next_positions = [started_at.isoformat()]
+        has_more = False
+        for table, data in zip(SYNC_STREAMS, results):
+            rows[table] = data[:limit]
+            if len(data) > limit:
+                has_more = True
+                next_positions += [rows[table][-1][SYNC_TABLES[table][0]], rows[table][-1]["id"]]
+            else:
+                next_positions += caught_up
+
+        return build_model(SyncResponse, {
+            "medications": [build_model(MedicationResponse, row) for row in rows["medications"]],
+            "records": [build_model(SyncRecordItem, row) for row in rows["medication_records"]],
+            "deleted": [build_model(SyncTombstone, row) for row in rows["sync_tombstones"]],
+            "next_cursor": encode_cursor(next_positions),
+            "has_more": has_more,
+        })
+
+    def _decode_positions(self, since: Optional[str], now: datetime) -> Dict[str, List[str]]:
+        """커서를 테이블별 위치로 해석 (발급 후 삭제 기록 보존 기간이 지났으면 410)"""
+        if not since:
+            return {table: SYNC_ORIGIN for table in SYNC_STREAMS}
+
+        values = decode_cursor(since, 1 + len(SYNC_STREAMS) * 2)
+        try:
+            issued_at = datetime.fromisoformat(values[0])
+            for value in values[1::2]:
+                datetime.fromisoformat(value)
+            if issued_at.tzinfo is None:
+                raise ValueError(values[0])
+        except (TypeError, ValueError):
+            raise ValidationError("유효하지 않은 커서입니다")
+
+        if issued_at < now - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS):
+            raise GoneError("동기화 커서가 만료되었습니다. since 없이 전체 동기화해주세요")
+        return {table: values[1 + i * 2:3 + i * 2] for i, table in enumerate(SYNC_STREAMS)}
+
+    async def purge_tombstones(self) -> int:
+        """보존 기간이 지난 삭제 기록을 PURGE_BATCH_SIZE개씩 정리, 삭제한 수 반환
+
+        한 번에 지우지 않고 오래된 순으로 id를 골라 나눠 삭제하므로 긴 잠금/큰 응답이 없습니다.
+        """
+        client = get_service_supabase()
+        cutoff = datetime.now(timezone.utc) - timedelta(days=settings.SYNC_TOMBSTONE_RETENTION_DAYS)
+
+        deleted = 0
+        while True:
+            response = await execute(
+                client.table("sync_tombstones")
+                .select("id")
+                .lt("deleted_at", cutoff.isoformat())
+                .order("deleted_at")
+                .limit(PURGE_BATCH_SIZE)
+            )
+            ids = [row["id"] for row in response.data]
+            if not ids:
+                return deleted
+
+            await execute(
+                client.table("sync_tombstones")
+                .delete(returning=ReturnMethod.minimal)
+                .in_("id", ids)
+            )
+            deleted += len(ids)
+
+# 싱글톤 인스턴스
+sync_service = SyncService()
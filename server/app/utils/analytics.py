@@ -0,0 +1,170 @@
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+# 시간대 구분 (get_monthly_statistics의 best_time과 같은 기준: 6~11시 아침, 12~17시 점심, 나머지 저녁)
+TIME_OF_DAY_BUCKETS = ("아침", "점심", "저녁")
+
+# 사용자별 완료율 분포 구간 수 (10%씩)
+ADHERENCE_BUCKET_COUNT = 10
+
+# 사용자별 완료율 백분위
+ADHERENCE_PERCENTILES = (10, 25, 50, 75, 90)
+
+
+class Factorizer:
+    """문자열 값을 0부터 시작하는 정수 코드로 변환 (청크가 바뀌어도 같은 값은 같은 코드)
+
+    청크는 np.unique(return_inverse=True)로 고유값 코드로 바꾸고, 사전 조회는
+    고유값에만 해서 청크 코드를 누적 코드로 옮깁니다 (행 단위 파이썬 반복 없음).
+    """
+
+    def __init__(self):
+        self.index: Dict[str, int] = {}
+
+    def encode(self, values: Sequence[str]) -> np.ndarray:
+        uniques, inverse = np.unique(np.asarray(values, dtype=str), return_inverse=True)
+        codes = np.fromiter(
+            (self.index.setdefault(value, len(self.index)) for value in uniques.tolist()),
+            dtype=np.int64, count=len(uniques)
+        )
+        return codes[inverse.reshape(-1)]
+
+    @property
+    def labels(self) -> List[str]:
+        return list(self.index)
+
+
+class GroupCounter:
+    """그룹 코드별 전체/완료 건수 누적 (코드가 늘어나면 배열 확장)"""
+
+    def __init__(self):
+        self.total = np.zeros(0, dtype=np.int64)
+        self.taken = np.zeros(0, dtype=np.int64)
+
+    def add(self, codes: np.ndarray, taken: np.ndarray):
+        if not len(codes):
+            return
+        size = int(codes.max()) + 1
+        if size > len(self.total):
+            self.total = np.pad(self.total, (0, size - len(self.total)))
+            self.taken = np.pad(self.taken, (0, size - len(self.taken)))
+        self.total[:size] += np.bincount(codes, minlength=size)
+        self.taken[:size] += np.bincount(codes[taken], minlength=size)
+
+
+class PopulationAggregator:
+    """전체 사용자 복용 기록 집계 (청크 단위로 넣고 마지막에 요약)
+
+    기록 한 건은 (user_id, time "HH:MM", status, form, dosage_unit) 컬럼으로 받으며
+    청크마다 정수 코드 배열로 바꿔 bincount로 그룹별 건수를 더합니다.
+    메모리는 전체 행 수가 아니라 사용자/그룹 수에 비례합니다.
+    """
+
+    def __init__(self):
+        self.users = Factorizer()
+        self.times = Factorizer()
+        self._time_buckets = np.zeros(0, dtype=np.int64)
+        self.forms = Factorizer()
+        self.units = Factorizer()
+        self.by_user = GroupCounter()
+        self.by_time = GroupCounter()
+        self.by_form = GroupCounter()
+        self.by_unit = GroupCounter()
+        self.rows = 0
+
+    def add_chunk(
+        self,
+        user_ids: Sequence[str],
+        times: Sequence[str],
+        statuses: Sequence[str],
+        forms: Sequence[str],
+        units: Sequence[str],
+    ):
+        """기록 청크 추가 (컬럼별 같은 길이의 시퀀스)"""
+        if not len(user_ids):
+            return
+
+        taken = np.asarray(statuses, dtype=str) == "taken"
+        # "HH:MM" 값은 종류가 적으므로 값별 시간대 표를 만들어 코드로 찾음
+        time_codes = self.times.encode(times)
+        if len(self._time_buckets) < len(self.times.index):
+            self._time_buckets = np.array([_time_of_day(label) for label in self.times.labels], dtype=np.int64)
+
+        self.by_user.add(self.users.encode(user_ids), taken)
+        self.by_time.add(self._time_buckets[time_codes], taken)
+        self.by_form.add(self.forms.encode(forms), taken)
+        self.by_unit.add(self.units.encode(units), taken)
+        self.rows += len(user_ids)
+
+    def summary(self) -> List[dict]:
+        """요약 행 목록 (dimension, bucket, user_count, total_doses, taken_count, completion_rate)
+
+        - overall: 전체 합계
+        - adherence_distribution: 사용자별 완료율 10% 구간별 사용자 수와 그 사용자들의 합계
+        - adherence_percentile: 사용자별 완료율 백분위 (p10~p90)
+        - time_of_day / form / dosage_unit: 그룹별 합계 (user_count 없음)
+        """
+        user_total, user_taken = self.by_user.total, self.by_user.taken
+        active = user_total > 0
+        rates = user_taken[active] / user_total[active]
+
+        rows = [_summary_row(
+            "overall", "all", int(active.sum()), int(user_total.sum()), int(user_taken.sum())
+        )]
+
+        buckets = np.minimum((rates * ADHERENCE_BUCKET_COUNT).astype(np.int64), ADHERENCE_BUCKET_COUNT - 1)
+        bucket_users = np.bincount(buckets, minlength=ADHERENCE_BUCKET_COUNT)
+        bucket_total = np.bincount(buckets, weights=user_total[active], minlength=ADHERENCE_BUCKET_COUNT)
+        bucket_taken = np.bincount(buckets, weights=user_taken[active], minlength=ADHERENCE_BUCKET_COUNT)
+        step = 100 // ADHERENCE_BUCKET_COUNT
+        for i in range(ADHERENCE_BUCKET_COUNT):
+            rows.append(_summary_row(
+                "adherence_distribution", f"{i * step}-{(i + 1) * step}%",
+                int(bucket_users[i]), int(bucket_total[i]), int(bucket_taken[i])
+            ))
+
+        if len(rates):
+            for percentile, value in zip(ADHERENCE_PERCENTILES, np.percentile(rates, ADHERENCE_PERCENTILES)):
+                rows.append({
+                    "dimension": "adherence_percentile",
+                    "bucket": f"p{percentile}",
+                    "user_count": len(rates),
+                    "total_doses": None,
+                    "taken_count": None,
+                    "completion_rate": round(float(value), 4),
+                })
+
+        for dimension, labels, counter in (
+            ("time_of_day", TIME_OF_DAY_BUCKETS, self.by_time),
+            ("form", self.forms.labels, self.by_form),
+            ("dosage_unit", self.units.labels, self.by_unit),
+        ):
+            for code, label in enumerate(labels):
+                if code < len(counter.total) and counter.total[code]:
+                    rows.append(_summary_row(
+                        dimension, label, None, int(counter.total[code]), int(counter.taken[code])
+                    ))
+        return rows
+
+
+def _time_of_day(value: str) -> int:
+    """"HH:MM" -> TIME_OF_DAY_BUCKETS 인덱스"""
+    hour = int(value[:2])
+    if 6 <= hour <= 11:
+        return 0
+    if 12 <= hour <= 17:
+        return 1
+    return 2
+
+
+def _summary_row(dimension: str, bucket: str, user_count: Optional[int], total: int, taken: int) -> dict:
+    return {
+        "dimension": dimension,
+        "bucket": bucket,
+        "user_count": user_count,
+        "total_doses": total,
+        "taken_count": taken,
+        "completion_rate": round(taken / total, 4) if total else 0.0,
+    }
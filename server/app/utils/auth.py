@@ -2,6 +2,7 @@ from typing import Optional
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
 
+from app.core.config import settings
 from app.services.auth_service import auth_service
 from app.schemas.auth import UserResponse
 
@@ -25,6 +26,20 @@ async def get_current_user(
         )
 
 
-def get_current_user_id(user: UserResponse = Depends(get_current_user)) -> str:
+async def get_current_user_id(
+    credentials: HTTPAuthorizationCredentials = Depends(security)
+) -> str:
     """현재 사용자 ID 가져오기"""
+    # local 모드에서는 토큰 검증만으로 사용자 ID 확인 (네트워크 I/O 없음)
+    if settings.AUTH_MODE == "local":
+        try:
+            return auth_service.get_user_id_from_token(credentials.credentials)
+        except Exception:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="인증이 필요합니다",
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+
+    user = await get_current_user(credentials)
     return user.id
\ No newline at end of file
@@ -0,0 +1,30 @@
+import logging
+from datetime import time
+from typing import Iterable, List, Optional
+
+
+logger = logging.getLogger(__name__)
+
+
+def normalize_time(value: str) -> Optional[str]:
+    """시각 문자열을 HH:MM 형식으로 정규화 ("9:00", "09:00:00" 허용, 잘못된 값은 None)"""
+    try:
+        parts = value.split(":")
+        if len(parts) not in (2, 3):
+            return None
+        parsed = time(*map(int, parts))
+    except (ValueError, AttributeError, TypeError):
+        return None
+    return f"{parsed.hour:02d}:{parsed.minute:02d}"
+
+
+def normalize_dosage_times(dosage_times: Iterable[str]) -> List[str]:
+    """복용 시간을 HH:MM 형식으로 정규화 (잘못된 값은 제외, 정렬/중복 제거)"""
+    valid = set()
+    for dosage_time in dosage_times:
+        normalized = normalize_time(dosage_time)
+        if normalized is None:
+            logger.warning("invalid dosage time skipped: %r", dosage_time)
+            continue
+        valid.add(normalized)
+    return sorted(valid)
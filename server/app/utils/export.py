@@ -0,0 +1,26 @@
+import csv
+import io
+import json
+from typing import AsyncIterator, List, Sequence
+
+
+async def ndjson_chunks(pages: AsyncIterator[List[dict]]) -> AsyncIterator[bytes]:
+    """페이지 단위 행을 NDJSON 청크로 변환 (한 줄에 JSON 객체 하나)"""
+    async for rows in pages:
+        yield "".join(
+            json.dumps(row, ensure_ascii=False, default=str) + "\n" for row in rows
+        ).encode()
+
+
+async def csv_chunks(pages: AsyncIterator[List[dict]], columns: Sequence[str]) -> AsyncIterator[bytes]:
+    """페이지 단위 행을 CSV 청크로 변환 (헤더를 먼저 보내고 Excel용 BOM 포함)"""
+    buffer = io.StringIO()
+    writer = csv.DictWriter(buffer, fieldnames=columns, extrasaction="ignore")
+    writer.writeheader()
+    yield ("\ufeff" + buffer.getvalue()).encode()
+
+    async for rows in pages:
+        buffer.seek(0)
+        buffer.truncate()
+        writer.writerows(rows)
+        yield buffer.getvalue().encode()
@@ -0,0 +1,91 @@
+import hashlib
+from datetime import datetime, timezone
+from email.utils import format_datetime, parsedate_to_datetime
+from typing import Any, AsyncIterator, Awaitable, Callable, Dict, Optional, Tuple
+
+import orjson
+from fastapi import Request, Response
+from fastapi.responses import StreamingResponse
+from fastapi.encoders import jsonable_encoder
+
+from app.core.config import settings
+from app.utils.serialization import type_adapter
+
+
+def conditional_json_response(
+    request: Request,
+    content: Any,
+    last_modified: Optional[datetime] = None,
+) -> Response:
+    """ETag/Last-Modified 기반 조건부 JSON 응답 (변경 없으면 304)"""
+    # 응답 본문을 한 번만 직렬화해 ETag 계산과 전송에 같이 사용
+    body = orjson.dumps(jsonable_encoder(content), option=orjson.OPT_SORT_KEYS)
+    etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+
+    headers = {"ETag": etag, "Cache-Control": "private, no-cache"}
+    if last_modified is not None:
+        if last_modified.tzinfo is None:
+            last_modified = last_modified.replace(tzinfo=timezone.utc)
+        headers["Last-Modified"] = format_datetime(last_modified.astimezone(timezone.utc), usegmt=True)
+
+    if _is_not_modified(request, etag, last_modified):
+        return Response(status_code=304, headers=headers)
+
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+def model_response(content: Any, response_type: Any, headers: Optional[Dict[str, str]] = None) -> Any:
+    """응답 모델을 한 번에 JSON 직렬화 (FastAPI response_model 재검증/재직렬화 생략)
+
+    response_type은 라우트의 response_model과 같은 타입이어야 합니다(문서용으로 계속 지정).
+    FAST_SERIALIZATION이 꺼져 있으면 content를 그대로 반환해 FastAPI가 처리합니다.
+    """
+    if not settings.FAST_SERIALIZATION:
+        return content
+
+    return Response(
+        content=type_adapter(response_type).dump_json(content, warnings=False),
+        media_type="application/json",
+        headers=headers
+    )
+
+
+async def immutable_response(
+    request: Request,
+    etag: str,
+    load: Callable[[], Awaitable[Tuple[AsyncIterator[bytes], str]]],
+) -> Response:
+    """다시 쓰지 않는 객체 스트리밍 응답 (MEDIA_CACHE_MAX_AGE_SECONDS 동안 캐시, If-None-Match면 304)
+
+    내용이 바뀌지 않으므로 ETag는 호출하는 쪽에서 객체 식별자로 만들고,
+    304면 load(내용 스트림, 미디어 타입 조회)를 호출하지 않습니다.
+    """
+    headers = {
+        "ETag": etag,
+        "Cache-Control": f"private, max-age={settings.MEDIA_CACHE_MAX_AGE_SECONDS}, immutable",
+    }
+    if _is_not_modified(request, etag, None):
+        return Response(status_code=304, headers=headers)
+
+    chunks, media_type = await load()
+    return StreamingResponse(chunks, media_type=media_type, headers=headers)
+
+
+def _is_not_modified(request: Request, etag: str, last_modified: Optional[datetime]) -> bool:
+    """조건부 요청 헤더 확인 (If-None-Match가 있으면 If-Modified-Since보다 우선)"""
+    if_none_match = request.headers.get("if-none-match")
+    if if_none_match is not None:
+        candidates = [tag.strip().removeprefix("W/") for tag in if_none_match.split(",")]
+        return "*" in candidates or etag in candidates
+
+    if_modified_since = request.headers.get("if-modified-since")
+    if if_modified_since and last_modified is not None:
+        try:
+            since = parsedate_to_datetime(if_modified_since)
+        except (TypeError, ValueError):
+            return False
+        if since.tzinfo is None:
+            since = since.replace(tzinfo=timezone.utc)
+        return last_modified.replace(microsecond=0) <= since
+
+    return False
@@ -0,0 +1,100 @@
+import hashlib
+from typing import Any, Awaitable, Callable, Optional
+
+from fastapi import Header, HTTPException, Response
+from pydantic import BaseModel
+
+from app.core.cache import cache
+from app.core.config import settings
+from app.core.metrics import IDEMPOTENT_REPLAYS
+from app.utils.serialization import type_adapter
+
+
+# 키 최대 길이 (UUID 등 클라이언트가 만든 임의 문자열)
+MAX_KEY_LENGTH = 255
+
+# 저장된 응답을 재생했음을 알리는 응답 헤더
+REPLAYED_HEADER = "Idempotent-Replayed"
+
+
+async def get_idempotency_key(
+    idempotency_key: Optional[str] = Header(None, alias="Idempotency-Key")
+) -> Optional[str]:
+    """Idempotency-Key 헤더 의존성 (없으면 None)"""
+    if idempotency_key is None:
+        return None
+
+    key = idempotency_key.strip()
+    if not key or len(key) > MAX_KEY_LENGTH or not key.isascii():
+        raise HTTPException(
+            status_code=422,
+            detail=f"Idempotency-Key는 1~{MAX_KEY_LENGTH}자의 ASCII 문자열이어야 합니다"
+        )
+    return key
+
+
+async def idempotent(
+    key: Optional[str],
+    user_id: str,
+    operation: str,
+    payload: Any,
+    handler: Callable[[], Awaitable[Any]],
+    response_type: Any,
+) -> Any:
+    """Idempotency-Key가 있으면 첫 성공 응답을 저장하고 재시도에는 DB 접근 없이 재생
+
+    payload는 요청을 구분하는 값(본문 모델, 경로 ID 또는 그 튜플)입니다.
+    키는 사용자별로 구분하며, 같은 키를 다른 작업/본문에 쓰면 422,
+    첫 요청이 아직 처리 중이면 409를 반환합니다. 실패한 요청은 저장하지 않으므로
+    같은 키로 다시 시도할 수 있습니다. 캐시 장애 시에는 키 없이 처리합니다.
+    """
+    if key is None or not settings.IDEMPOTENCY_ENABLED:
+        return await handler()
+
+    cache_key = f"{cache.prefix}:idempotency:{user_id}:{key}"
+    fingerprint = _fingerprint(operation, payload)
+
+    stored = await cache.get(cache_key)
+    if stored is None:
+        pending = {"fingerprint": fingerprint, "pending": True}
+        if not await cache.add(cache_key, pending, settings.IDEMPOTENCY_LOCK_TTL_SECONDS):
+            stored = await cache.get(cache_key) or pending
+
+    if stored is not None:
+        if stored["fingerprint"] != fingerprint:
+            raise HTTPException(status_code=422, detail="Idempotency-Key가 다른 요청에 이미 사용되었습니다")
+        if stored.get("pending"):
+            raise HTTPException(
+                status_code=409,
+                detail="같은 Idempotency-Key의 요청을 처리 중입니다",
+                headers={"Retry-After": "1"}
+            )
+
+        IDEMPOTENT_REPLAYS.labels(operation).inc()
+        return Response(
+            content=stored["body"],
+            status_code=stored["status_code"],
+            media_type="application/json",
+            headers={REPLAYED_HEADER: "true"}
+        )
+
+    try:
+        result = await handler()
+    except BaseException:
+        await cache.delete(cache_key)
+        raise
+
+    body = type_adapter(response_type).dump_json(result, warnings=False)
+    await cache.set(
+        cache_key,
+        {"fingerprint": fingerprint, "status_code": 200, "body": body.decode()},
+        settings.IDEMPOTENCY_TTL_SECONDS
+    )
+    return Response(content=body, media_type="application/json")
+
+
+def _fingerprint(operation: str, payload: Any) -> str:
+    """작업 이름 + 요청 값(경로 ID, 본문) 해시 (같은 키의 다른 요청 구분)"""
+    parts = payload if isinstance(payload, tuple) else (payload,)
+    serialized = [part.model_dump_json() if isinstance(part, BaseModel) else str(part) for part in parts]
+    return hashlib.sha256("\n".join([operation, *serialized]).encode()).hexdigest()
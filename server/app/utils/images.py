@@ -0,0 +1,57 @@
+"""약물 이미지 변환 (MediaService의 프로세스 풀에서 실행)
+
+spawn된 프로세스가 이 모듈만 import하도록 앱 설정/클라이언트에 의존하지 않습니다.
+"""
+from pathlib import Path
+from typing import Dict, Optional
+
+from PIL import Image, ImageOps, UnidentifiedImageError
+
+
+# 업로드 허용 형식: 파일 앞부분 시그니처 -> (확장자, 미디어 타입)
+IMAGE_SIGNATURES = (
+    (b"\xff\xd8\xff", ("jpg", "image/jpeg")),
+    (b"\x89PNG\r\n\x1a\n", ("png", "image/png")),
+)
+
+# 시그니처 판별에 필요한 최소 바이트 수 (WebP: RIFF....WEBP)
+SIGNATURE_LENGTH = 12
+
+# 파생 이미지 형식
+VARIANT_FORMAT = ("webp", "image/webp")
+
+
+def sniff_image_type(head: bytes) -> Optional[tuple]:
+    """파일 앞부분으로 형식 판별, 허용 형식이 아니면 None"""
+    for signature, image_type in IMAGE_SIGNATURES:
+        if head.startswith(signature):
+            return image_type
+    if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+        return ("webp", "image/webp")
+    return None
+
+
+def make_variants(source: str, sizes: Dict[str, int], max_pixels: int) -> Dict[str, str]:
+    """원본에서 긴 변이 size 이하인 WebP 파생 이미지를 같은 디렉터리에 생성, {이름: 경로} 반환
+
+    디코딩할 수 없거나 max_pixels를 넘는 이미지는 ValueError.
+    """
+    Image.MAX_IMAGE_PIXELS = max_pixels
+    source_path = Path(source)
+    try:
+        with Image.open(source_path) as image:
+            # JPEG는 가장 큰 파생 크기에 맞춰 축소 디코딩 (전체 해상도로 풀지 않음)
+            image.draft("RGB", (max(sizes.values()),) * 2)
+            image = ImageOps.exif_transpose(image)
+            if image.mode not in ("RGB", "RGBA"):
+                image = image.convert("RGBA" if "transparency" in image.info else "RGB")
+
+            paths = {}
+            for name, size in sorted(sizes.items(), key=lambda item: -item[1]):
+                image.thumbnail((size, size), Image.LANCZOS)
+                path = source_path.with_name(f"{name}.{VARIANT_FORMAT[0]}")
+                image.save(path, "WEBP", quality=80, method=4)
+                paths[name] = str(path)
+            return paths
+    except (UnidentifiedImageError, Image.DecompressionBombError, OSError) as e:
+        raise ValueError(str(e)) from None
@@ -0,0 +1,47 @@
+import base64
+import json
+from typing import Any, List, Sequence
+
+from app.core.exceptions import ValidationError
+
+
+def encode_cursor(values: Sequence[Any]) -> str:
+    """키셋 페이지네이션 커서 생성 (마지막 행의 정렬 키 값)"""
+    raw = json.dumps(list(values), separators=(",", ":"), default=str).encode()
+    return base64.urlsafe_b64encode(raw).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str, size: int) -> List[Any]:
+    """커서 해석"""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        values = json.loads(base64.urlsafe_b64decode(padded.encode()))
+    except (ValueError, TypeError):
+        raise ValidationError("유효하지 않은 커서입니다")
+
+    if not isinstance(values, list) or len(values) != size:
+        raise ValidationError("유효하지 않은 커서입니다")
+    return values
+
+
+def keyset_filter(columns: Sequence[str], values: Sequence[Any], descending: bool = False) -> str:
+    """(c1, c2, ...) > (v1, v2, ...) 조건을 PostgREST or 필터 문자열로 변환
+
+    예: ("date", "id") -> date.gt.v1,and(date.eq.v1,id.gt.v2)
+    """
+    operator = "lt" if descending else "gt"
+    conditions = []
+    for i, column in enumerate(columns):
+        parts = [f"{columns[j]}.eq.{_quote(values[j])}" for j in range(i)]
+        parts.append(f"{column}.{operator}.{_quote(values[i])}")
+        if len(parts) == 1:
+            conditions.append(parts[0])
+        else:
+            conditions.append(f"and({','.join(parts)})")
+    return ",".join(conditions)
+
+
+def _quote(value: Any) -> str:
+    # PostgREST 논리 필터에서 예약 문자(,.:()) 포함 값은 큰따옴표로 감쌈
+    text = str(value).replace("\\", "\\\\").replace('"', '\\"')
+    return f'"{text}"'
@@ -0,0 +1,26 @@
+import functools
+from typing import Any, Type, TypeVar
+
+from pydantic import BaseModel, TypeAdapter
+
+from app.core.config import settings
+
+
+ModelT = TypeVar("ModelT", bound=BaseModel)
+
+
+@functools.lru_cache(maxsize=None)
+def type_adapter(tp: Any) -> TypeAdapter:
+    """타입별 TypeAdapter (스키마 빌드는 타입당 한 번)"""
+    return TypeAdapter(tp)
+
+
+def build_model(model: Type[ModelT], data: dict) -> ModelT:
+    """신뢰하는 DB 행/서비스 값으로 응답 모델 생성
+
+    FAST_SERIALIZATION이면 검증 없이 model_construct로 만들고(값은 DB 응답 형태 그대로),
+    아니면 일반 생성자로 검증합니다. 정의되지 않은 키는 버립니다.
+    """
+    if settings.FAST_SERIALIZATION:
+        return model.model_construct(**data)
+    return model(**data)
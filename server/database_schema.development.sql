@@ -45,6 +45,7 @@ CREATE TABLE medication_records (
     delay_reason TEXT,
     taken_at TIMESTAMP WITH TIME ZONE,
     created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
     UNIQUE(user_id, medication_id, date, time)
 );
 
@@ -72,10 +73,14 @@ CREATE TABLE dev_test_data (
 CREATE INDEX idx_user_profiles_user_id ON user_profiles(user_id);
 CREATE INDEX idx_medications_user_id ON medications(user_id);
 CREATE INDEX idx_medications_created_at ON medications(created_at DESC);
+CREATE INDEX IF NOT EXISTS idx_medications_user_created_id ON medications(user_id, created_at DESC, id DESC);
 CREATE INDEX idx_medication_records_user_id ON medication_records(user_id);
 CREATE INDEX idx_medication_records_date ON medication_records(date DESC);
 CREATE INDEX idx_medication_records_user_date ON medication_records(user_id, date);
+CREATE INDEX IF NOT EXISTS idx_medication_records_user_date_time ON medication_records(user_id, date, time, id);
 CREATE INDEX idx_notification_settings_user_id ON notification_settings(user_id);
+CREATE INDEX IF NOT EXISTS idx_medications_updated_at ON medications(updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_notification_settings_updated_at ON notification_settings(updated_at, id);
 CREATE INDEX idx_dev_test_data_test_name ON dev_test_data(test_name);
 
 -- RLS (Row Level Security) 정책 활성화
@@ -156,7 +161,372 @@ CREATE TRIGGER update_medications_updated_at BEFORE UPDATE ON medications
 CREATE TRIGGER update_notification_settings_updated_at BEFORE UPDATE ON notification_settings
     FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
 
+-- 일별 복용 집계 테이블 (medication_records 변경 시 트리거로 갱신)
+-- 통계/달력 조회는 원본 기록 대신 이 테이블을 (user_id, date) 인덱스로 조회
+CREATE TABLE IF NOT EXISTS daily_adherence (
+    user_id UUID REFERENCES auth.users(id) ON DELETE CASCADE,
+    date DATE NOT NULL,
+    total_doses INTEGER NOT NULL DEFAULT 0 CHECK (total_doses >= 0),
+    taken_count INTEGER NOT NULL DEFAULT 0 CHECK (taken_count >= 0),
+    completion_rate DECIMAL(5, 4) NOT NULL DEFAULT 0,
+    overall_status VARCHAR(20) NOT NULL CHECK (overall_status IN ('taken', 'missed', 'delayed')),
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    PRIMARY KEY (user_id, date)
+);
+
+ALTER TABLE daily_adherence ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view own daily adherence" ON daily_adherence;
+CREATE POLICY "Users can view own daily adherence" ON daily_adherence
+    FOR SELECT USING (auth.uid() = user_id);
+
+-- 사용자별 연속 복용 상태 (일별 집계가 바뀔 때 refresh_user_streak로 증분 갱신)
+-- 연속 복용일: 가장 최근의 미완료일(anchor_date) 이후 완료된 날짜 수 (기록 없는 날은 건너뜀)
+CREATE TABLE IF NOT EXISTS user_streaks (
+    user_id UUID PRIMARY KEY REFERENCES auth.users(id) ON DELETE CASCADE,
+    current_streak INTEGER NOT NULL DEFAULT 0 CHECK (current_streak >= 0),
+    longest_streak INTEGER NOT NULL DEFAULT 0 CHECK (longest_streak >= 0),
+    last_completed_date DATE,
+    anchor_date DATE,
+    -- 끝난(미완료일로 끊긴) 구간 중 가장 긴 구간의 길이와 마지막 완료일
+    longest_closed INTEGER NOT NULL DEFAULT 0,
+    longest_closed_end DATE,
+    updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+ALTER TABLE user_streaks ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view own streak" ON user_streaks;
+CREATE POLICY "Users can view own streak" ON user_streaks
+    FOR SELECT USING (auth.uid() = user_id);
+
+-- 함수: p_date의 완료 여부가 바뀐 뒤 연속 복용 상태 재계산 (영향받는 뒤쪽 구간만 다시 읽음)
+-- - p_date가 현재 구간(anchor_date 이후)이면 anchor_date 이후만 읽음
+-- - 지난 날짜면 p_date 직전 미완료일 이후만 읽되, 가장 긴 구간이 그 뒤에 있으면 전체를 읽음
+-- - p_date가 NULL이면 전체 재계산
+CREATE OR REPLACE FUNCTION refresh_user_streak(p_user_id UUID, p_date DATE)
+RETURNS VOID AS $$
+DECLARE
+    v_state user_streaks%ROWTYPE;
+    v_from DATE;
+    v_longest INTEGER := 0;
+    v_longest_end DATE;
+    v_run INTEGER := 0;
+    v_anchor DATE;
+    v_last_completed DATE;
+    v_day RECORD;
+BEGIN
+    SELECT * INTO v_state FROM user_streaks WHERE user_id = p_user_id FOR UPDATE;
+
+    IF FOUND AND p_date IS NOT NULL AND (v_state.anchor_date IS NULL OR p_date > v_state.anchor_date) THEN
+        v_from := v_state.anchor_date;
+        v_longest := v_state.longest_closed;
+        v_longest_end := v_state.longest_closed_end;
+    ELSIF FOUND AND p_date IS NOT NULL THEN
+        SELECT MAX(date)
+        INTO v_from
+        FROM daily_adherence
+        WHERE user_id = p_user_id
+          AND date < p_date
+          AND overall_status <> 'taken';
+
+        IF v_from IS NOT NULL AND v_state.longest_closed_end < v_from THEN
+            v_longest := v_state.longest_closed;
+            v_longest_end := v_state.longest_closed_end;
+        ELSIF v_state.longest_closed > 0 THEN
+            v_from := NULL;
+        END IF;
+    END IF;
+
+    v_anchor := v_from;
+    FOR v_day IN
+        SELECT date, overall_status = 'taken' AS completed
+        FROM daily_adherence
+        WHERE user_id = p_user_id
+          AND (v_from IS NULL OR date > v_from)
+        ORDER BY date
+    LOOP
+        IF v_day.completed THEN
+            v_run := v_run + 1;
+            v_last_completed := v_day.date;
+        ELSE
+            IF v_run > v_longest THEN
+                v_longest := v_run;
+                v_longest_end := v_last_completed;
+            END IF;
+            v_run := 0;
+            v_anchor := v_day.date;
+        END IF;
+    END LOOP;
+
+    IF v_last_completed IS NULL THEN
+        SELECT MAX(date)
+        INTO v_last_completed
+        FROM daily_adherence
+        WHERE user_id = p_user_id
+          AND overall_status = 'taken';
+    END IF;
+
+    INSERT INTO user_streaks (
+        user_id, current_streak, longest_streak, last_completed_date,
+        anchor_date, longest_closed, longest_closed_end, updated_at
+    )
+    VALUES (
+        p_user_id, v_run, GREATEST(v_longest, v_run), v_last_completed,
+        v_anchor, v_longest, v_longest_end, NOW()
+    )
+    ON CONFLICT (user_id) DO UPDATE SET
+        current_streak = EXCLUDED.current_streak,
+        longest_streak = EXCLUDED.longest_streak,
+        last_completed_date = EXCLUDED.last_completed_date,
+        anchor_date = EXCLUDED.anchor_date,
+        longest_closed = EXCLUDED.longest_closed,
+        longest_closed_end = EXCLUDED.longest_closed_end,
+        updated_at = EXCLUDED.updated_at;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- 함수: 특정 사용자/날짜의 일별 집계 재계산
+CREATE OR REPLACE FUNCTION refresh_daily_adherence(p_user_id UUID, p_date DATE)
+RETURNS VOID AS $$
+DECLARE
+    v_total INTEGER;
+    v_taken INTEGER;
+    v_old_status VARCHAR(20);
+    v_new_status VARCHAR(20);
+BEGIN
+    SELECT overall_status
+    INTO v_old_status
+    FROM daily_adherence
+    WHERE user_id = p_user_id
+      AND date = p_date;
+
+    SELECT COUNT(*), COUNT(*) FILTER (WHERE status = 'taken')
+    INTO v_total, v_taken
+    FROM medication_records
+    WHERE user_id = p_user_id
+      AND date = p_date;
+
+    IF v_total = 0 THEN
+        DELETE FROM daily_adherence WHERE user_id = p_user_id AND date = p_date;
+    ELSE
+        v_new_status := CASE
+            WHEN v_taken = v_total THEN 'taken'
+            WHEN v_taken = 0 THEN 'missed'
+            ELSE 'delayed'
+        END;
+
+        INSERT INTO daily_adherence (
+            user_id, date, total_doses, taken_count, completion_rate, overall_status, updated_at
+        )
+        VALUES (
+            p_user_id,
+            p_date,
+            v_total,
+            v_taken,
+            v_taken::DECIMAL / v_total,
+            v_new_status,
+            NOW()
+        )
+        ON CONFLICT (user_id, date) DO UPDATE SET
+            total_doses = EXCLUDED.total_doses,
+            taken_count = EXCLUDED.taken_count,
+            completion_rate = EXCLUDED.completion_rate,
+            overall_status = EXCLUDED.overall_status,
+            updated_at = EXCLUDED.updated_at;
+    END IF;
+
+    -- 그날의 완료 여부(기록 없음/완료/미완료)가 바뀐 경우에만 연속 복용 상태 갱신
+    IF (v_old_status = 'taken') IS DISTINCT FROM (v_new_status = 'taken') THEN
+        PERFORM refresh_user_streak(p_user_id, p_date);
+    END IF;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- 트리거 함수: 변경된 (user_id, date)만 문장 단위로 한 번씩 재계산
+CREATE OR REPLACE FUNCTION update_daily_adherence()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        PERFORM refresh_daily_adherence(t.user_id, t.date)
+        FROM (SELECT DISTINCT user_id, date FROM new_records) t;
+    ELSIF TG_OP = 'UPDATE' THEN
+        PERFORM refresh_daily_adherence(t.user_id, t.date)
+        FROM (
+            SELECT user_id, date FROM old_records
+            UNION
+            SELECT user_id, date FROM new_records
+        ) t;
+    ELSE
+        PERFORM refresh_daily_adherence(t.user_id, t.date)
+        FROM (SELECT DISTINCT user_id, date FROM old_records) t;
+    END IF;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+-- 일별 집계 트리거 생성 (전이 테이블은 이벤트별로 하나의 트리거만 가능)
+DROP TRIGGER IF EXISTS medication_records_daily_adherence_insert ON medication_records;
+CREATE TRIGGER medication_records_daily_adherence_insert
+    AFTER INSERT ON medication_records
+    REFERENCING NEW TABLE AS new_records
+    FOR EACH STATEMENT EXECUTE FUNCTION update_daily_adherence();
+
+DROP TRIGGER IF EXISTS medication_records_daily_adherence_update ON medication_records;
+CREATE TRIGGER medication_records_daily_adherence_update
+    AFTER UPDATE ON medication_records
+    REFERENCING OLD TABLE AS old_records NEW TABLE AS new_records
+    FOR EACH STATEMENT EXECUTE FUNCTION update_daily_adherence();
+
+DROP TRIGGER IF EXISTS medication_records_daily_adherence_delete ON medication_records;
+CREATE TRIGGER medication_records_daily_adherence_delete
+    AFTER DELETE ON medication_records
+    REFERENCING OLD TABLE AS old_records
+    FOR EACH STATEMENT EXECUTE FUNCTION update_daily_adherence();
+
+-- 기존 복용 기록으로 일별 집계 채우기 (기존 DB에 적용할 때)
+INSERT INTO daily_adherence (user_id, date, total_doses, taken_count, completion_rate, overall_status)
+SELECT user_id,
+       date,
+       COUNT(*),
+       COUNT(*) FILTER (WHERE status = 'taken'),
+       COUNT(*) FILTER (WHERE status = 'taken')::DECIMAL / COUNT(*),
+       CASE
+           WHEN COUNT(*) FILTER (WHERE status = 'taken') = COUNT(*) THEN 'taken'
+           WHEN COUNT(*) FILTER (WHERE status = 'taken') = 0 THEN 'missed'
+           ELSE 'delayed'
+       END
+FROM medication_records
+GROUP BY user_id, date
+ON CONFLICT (user_id, date) DO NOTHING;
+
+-- 기존 일별 집계로 연속 복용 상태 채우기 (기존 DB에 적용할 때)
+SELECT refresh_user_streak(user_id, NULL)
+FROM (SELECT DISTINCT user_id FROM daily_adherence) users;
+
+-- 델타 동기화 (GET /v1/sync)
+-- 약물/복용 기록은 (user_id, updated_at, id) 인덱스 범위 조회로 변경분만 읽고,
+-- 삭제는 sync_tombstones에 남겨 함께 전달
+ALTER TABLE medication_records ADD COLUMN IF NOT EXISTS updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(); -- 기존 DB에 적용할 때
+
+DROP TRIGGER IF EXISTS update_medication_records_updated_at ON medication_records;
+CREATE TRIGGER update_medication_records_updated_at BEFORE UPDATE ON medication_records
+    FOR EACH ROW EXECUTE FUNCTION update_updated_at_column();
+
+CREATE INDEX IF NOT EXISTS idx_medications_user_updated_id ON medications(user_id, updated_at, id);
+CREATE INDEX IF NOT EXISTS idx_medication_records_user_updated_id ON medication_records(user_id, updated_at, id);
+
+-- 삭제 기록 (SYNC_TOMBSTONE_RETENTION_DAYS가 지나면 python -m app.jobs.sync_tombstones로 정리)
+-- user_id는 외래 키 없이 저장 (사용자 삭제로 인한 연쇄 삭제 중에도 기록할 수 있도록)
+CREATE TABLE IF NOT EXISTS sync_tombstones (
+    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    user_id UUID NOT NULL,
+    entity_type VARCHAR(30) NOT NULL CHECK (entity_type IN ('medication')),
+    entity_id UUID NOT NULL,
+    deleted_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_sync_tombstones_user_deleted_id ON sync_tombstones(user_id, deleted_at, id);
+CREATE INDEX IF NOT EXISTS idx_sync_tombstones_deleted_at ON sync_tombstones(deleted_at);
+
+ALTER TABLE sync_tombstones ENABLE ROW LEVEL SECURITY;
+
+DROP POLICY IF EXISTS "Users can view own sync tombstones" ON sync_tombstones;
+CREATE POLICY "Users can view own sync tombstones" ON sync_tombstones
+    FOR SELECT USING (auth.uid() = user_id);
+
+-- 트리거 함수: 삭제된 약물을 문장 단위로 한 번에 기록
+-- (복용 기록은 약물과 함께 연쇄 삭제되므로 약물 삭제 기록만 남김)
+CREATE OR REPLACE FUNCTION record_medication_tombstones()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO sync_tombstones (user_id, entity_type, entity_id)
+    SELECT user_id, 'medication', id
+    FROM deleted_medications
+    WHERE user_id IS NOT NULL;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql SECURITY DEFINER;
+
+DROP TRIGGER IF EXISTS medications_sync_tombstones ON medications;
+CREATE TRIGGER medications_sync_tombstones
+    AFTER DELETE ON medications
+    REFERENCING OLD TABLE AS deleted_medications
+    FOR EACH STATEMENT EXECUTE FUNCTION record_medication_tombstones();
+
+-- 리프레시 토큰 (REDIS_URL이 없을 때 저장소, 서비스 역할로만 접근)
+-- 토큰 원문 대신 해시만 저장하고, 사용하면 used_at을 기록해 같은 계열(family_id)의 새 토큰으로 교체
+CREATE TABLE IF NOT EXISTS refresh_tokens (
+    id UUID PRIMARY KEY,
+    user_id UUID REFERENCES auth.users(id) ON DELETE CASCADE,
+    family_id UUID NOT NULL,
+    token_hash VARCHAR(64) NOT NULL,
+    claims JSONB NOT NULL,
+    expires_at TIMESTAMP WITH TIME ZONE NOT NULL,
+    used_at TIMESTAMP WITH TIME ZONE,
+    revoked_at TIMESTAMP WITH TIME ZONE,
+    created_at TIMESTAMP WITH TIME ZONE DEFAULT NOW()
+);
+
+CREATE INDEX IF NOT EXISTS idx_refresh_tokens_family_id ON refresh_tokens(family_id);
+CREATE INDEX IF NOT EXISTS idx_refresh_tokens_expires_at ON refresh_tokens(expires_at);
+
+ALTER TABLE refresh_tokens ENABLE ROW LEVEL SECURITY;
+
+-- 전체 사용자 복용 통계 요약 (python -m app.jobs.population_analytics, 서비스 역할로만 접근)
+-- dimension: overall, adherence_distribution, adherence_percentile, time_of_day, form, dosage_unit
+CREATE TABLE IF NOT EXISTS adherence_analytics (
+    id UUID DEFAULT gen_random_uuid() PRIMARY KEY,
+    period_start DATE NOT NULL,
+    period_end DATE NOT NULL,
+    dimension VARCHAR(30) NOT NULL,
+    bucket VARCHAR(30) NOT NULL,
+    user_count INTEGER,
+    total_doses BIGINT,
+    taken_count BIGINT,
+    completion_rate DECIMAL(5,4) NOT NULL,
+    computed_at TIMESTAMP WITH TIME ZONE DEFAULT NOW(),
+    UNIQUE(period_start, period_end, dimension, bucket)
+);
+
+ALTER TABLE adherence_analytics ENABLE ROW LEVEL SECURITY;
+
+-- 집계 배치가 기간 내 기록을 (date, id) 순으로 나눠 읽기 위한 인덱스
+CREATE INDEX IF NOT EXISTS idx_medication_records_date_id ON medication_records(date, id);
+
+-- 약물 이미지 저장 버킷 (비공개, 서버가 service role로 업로드/조회)
+INSERT INTO storage.buckets (id, name, public)
+VALUES ('medication-images', 'medication-images', false)
+ON CONFLICT (id) DO NOTHING;
+
+-- 함수: DB 현재 시각 (델타 동기화 커서 위치를 변경 시각 컬럼과 같은 시계로 계산)
+CREATE OR REPLACE FUNCTION get_db_time()
+RETURNS TIMESTAMP WITH TIME ZONE AS $$
+    SELECT NOW();
+$$ LANGUAGE sql STABLE;
+
+-- 복용 일정 적용 시작 시각 (예정 복용/미복용 계산은 이 시각 이후만, 복용 시간이 바뀌면 갱신)
+ALTER TABLE medications ADD COLUMN IF NOT EXISTS schedule_updated_at TIMESTAMP WITH TIME ZONE DEFAULT NOW();
+UPDATE medications SET schedule_updated_at = created_at WHERE schedule_updated_at > created_at; -- 기존 DB에 적용할 때
+
+CREATE OR REPLACE FUNCTION update_medication_schedule_updated_at()
+RETURNS TRIGGER AS $$
+BEGIN
+    IF NEW.dosage_times IS DISTINCT FROM OLD.dosage_times
+        OR NEW.daily_dosage_count IS DISTINCT FROM OLD.daily_dosage_count
+        OR NEW.is_continuous IS DISTINCT FROM OLD.is_continuous THEN
+        NEW.schedule_updated_at = NOW();
+    END IF;
+    RETURN NEW;
+END;
+$$ LANGUAGE plpgsql;
+
+DROP TRIGGER IF EXISTS update_medications_schedule_updated_at ON medications;
+CREATE TRIGGER update_medications_schedule_updated_at BEFORE UPDATE ON medications
+    FOR EACH ROW EXECUTE FUNCTION update_medication_schedule_updated_at();
+
 -- 함수: 월간 통계 계산
+-- MedicationService.get_monthly_statistics에서 RPC로 호출 (집계 결과 JSON만 반환)
 CREATE OR REPLACE FUNCTION get_monthly_statistics(
     p_user_id UUID,
     p_year INTEGER,
@@ -170,17 +540,18 @@ DECLARE
     completed_records INTEGER;
     avg_completion_rate DECIMAL;
     consecutive_days INTEGER;
+    total_days INTEGER;
+    completed_days INTEGER;
     best_time VARCHAR(10);
-    result JSON;
 BEGIN
     -- 월의 시작일과 종료일 계산
-    start_date := DATE(p_year || '-' || p_month || '-01');
-    end_date := start_date + INTERVAL '1 month';
+    start_date := MAKE_DATE(p_year, p_month, 1);
+    end_date := (start_date + INTERVAL '1 month')::DATE;
 
-    -- 총 기록 수와 완료된 기록 수
-    SELECT COUNT(*), COUNT(*) FILTER (WHERE status = 'taken')
+    -- 총 기록 수와 완료된 기록 수 (일별 집계 테이블 사용)
+    SELECT COALESCE(SUM(total_doses), 0), COALESCE(SUM(taken_count), 0)
     INTO total_records, completed_records
-    FROM medication_records
+    FROM daily_adherence
     WHERE user_id = p_user_id
       AND date >= start_date
       AND date < end_date;
@@ -192,27 +563,26 @@ BEGIN
         avg_completion_rate := 0;
     END IF;
 
-    -- 연속 복용일 계산 (간단한 버전)
+    -- 일별 완료 여부 (해당 날짜의 모든 기록이 taken이면 완료)
+    -- 연속 복용일: 가장 최근의 미완료일 이후 완료된 날짜 수
     WITH daily_completion AS (
-        SELECT date,
-               CASE WHEN COUNT(*) = COUNT(*) FILTER (WHERE status = 'taken')
-                    THEN 1 ELSE 0 END AS completed
-        FROM medication_records
+        SELECT date, overall_status = 'taken' AS completed
+        FROM daily_adherence
         WHERE user_id = p_user_id
           AND date >= start_date
           AND date < end_date
-        GROUP BY date
-        ORDER BY date DESC
     )
-    SELECT COUNT(*)
-    INTO consecutive_days
-    FROM (
-        SELECT date, completed,
-               ROW_NUMBER() OVER (ORDER BY date DESC) as rn
-        FROM daily_completion
-        WHERE completed = 1
-    ) t
-    WHERE rn = (SELECT COUNT(*) FROM daily_completion WHERE completed = 1 LIMIT rn);
+    SELECT COUNT(*),
+           COUNT(*) FILTER (WHERE completed),
+           COUNT(*) FILTER (
+               WHERE completed
+                 AND date > COALESCE(
+                     (SELECT MAX(date) FROM daily_completion WHERE NOT completed),
+                     '-infinity'::DATE
+                 )
+           )
+    INTO total_days, completed_days, consecutive_days
+    FROM daily_completion;
 
     -- 가장 많이 복용한 시간대
     SELECT time
@@ -223,7 +593,7 @@ BEGIN
       AND date < end_date
       AND status = 'taken'
     GROUP BY time
-    ORDER BY COUNT(*) DESC
+    ORDER BY COUNT(*) DESC, time
     LIMIT 1;
 
     IF best_time IS NULL THEN
@@ -240,18 +610,13 @@ BEGIN
     END IF;
 
     -- JSON 결과 생성
-    result := JSON_BUILD_OBJECT(
+    RETURN JSON_BUILD_OBJECT(
         'average_completion_rate', avg_completion_rate,
-        'consecutive_days', COALESCE(consecutive_days, 0),
+        'consecutive_days', consecutive_days,
         'best_time', best_time,
-        'total_days', (SELECT COUNT(DISTINCT date) FROM medication_records
-                      WHERE user_id = p_user_id AND date >= start_date AND date < end_date),
-        'completed_days', (SELECT COUNT(DISTINCT date) FROM medication_records
-                          WHERE user_id = p_user_id AND date >= start_date AND date < end_date
-                          GROUP BY date HAVING COUNT(*) = COUNT(*) FILTER (WHERE status = 'taken'))
+        'total_days', total_days,
+        'completed_days', completed_days
     );
-
-    RETURN result;
 END;
 $$ LANGUAGE plpgsql SECURITY DEFINER;
 
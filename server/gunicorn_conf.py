@@ -1,5 +1,6 @@
 import os
 import multiprocessing
+import shutil
 
 # Server socket
 bind = f"{os.getenv('HOST', '0.0.0.0')}:{os.getenv('PORT', '8000')}"
@@ -24,6 +25,15 @@ access_log_format = os.getenv(
     '%(h)s %(l)s %(u)s %(t)s "%(r)s" %(s)s %(b)s "%(f)s" "%(a)s" %(D)s'
 )
 
+# Prometheus multiprocess mode: each worker writes metric files here and
+# /metrics aggregates them. Must be prepared before the app is (pre)loaded,
+# which happens before on_starting.
+prometheus_multiproc_dir = os.environ.setdefault(
+    'PROMETHEUS_MULTIPROC_DIR', '/tmp/healthplus_prometheus'
+)
+shutil.rmtree(prometheus_multiproc_dir, ignore_errors=True)  # stale files from a previous run
+os.makedirs(prometheus_multiproc_dir, exist_ok=True)
+
 # Process naming
 proc_name = os.getenv('GUNICORN_PROC_NAME', 'healthplus')
 
@@ -51,6 +61,20 @@ secure_scheme_headers = {
     'X-FORWARDED-SSL': 'on'
 }
 
+def on_starting(server):
+    """Called just before the master process is initialized."""
+    from app.core.config import settings
+
+    # The in-process cache fallback keeps invalidation versions per worker, so
+    # other workers would keep serving stale responses until the TTL expires.
+    if (
+        settings.CACHE_ENABLED and not settings.REDIS_URL
+        and settings.CACHE_IN_PROCESS_FALLBACK and server.cfg.workers > 1
+    ):
+        raise RuntimeError(
+            "CACHE_IN_PROCESS_FALLBACK requires GUNICORN_WORKERS=1; set REDIS_URL for multiple workers"
+        )
+
 def when_ready(server):
     """Called just after the server is started."""
     server.log.info("Server is ready. Spawning workers")
@@ -67,6 +91,17 @@ def post_fork(server, worker):
     """Called just after a worker has been forked."""
     server.log.info("Worker spawned (pid: %s)", worker.pid)
 
+    # Drop client/pool references inherited from the preloaded master; the
+    # worker reopens and warms them on its own event loop during lifespan
+    # startup, before it starts accepting connections.
+    from app.core.lifecycle import reset_after_fork
+    reset_after_fork()
+
 def worker_abort(worker):
     """Called when a worker receives the SIGABRT signal."""
-    worker.log.info("worker received SIGABRT signal")
\ No newline at end of file
+    worker.log.info("worker received SIGABRT signal")
+
+def child_exit(server, worker):
+    """Called just after a worker has been exited, in the master process."""
+    from prometheus_client import multiprocess
+    multiprocess.mark_process_dead(worker.pid)
\ No newline at end of file
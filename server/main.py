@@ -5,23 +5,46 @@ from typing import AsyncGenerator
 import uvicorn
 from fastapi import FastAPI, Request
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, ORJSONResponse, Response
+from prometheus_client import CONTENT_TYPE_LATEST
 
 from app.core.config import settings
-from app.core.database import init_db
+from app.core.database import close_db, init_db
 from app.api.v1.router import api_router
+from app.core.admission import AdmissionMiddleware
 from app.core.exceptions import APIException
+from app.core.metrics import MetricsMiddleware, monitor_event_loop_lag, render_metrics
+from app.core.readiness import readiness
+from app.services.media_service import media_service
+from app.services.reminder_service import reminder_service
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI) -> AsyncGenerator[None, None]:
     """앱 시작/종료 시 실행되는 코드"""
-    # 애플리케이션 시작 시
+    # 애플리케이션 시작 시 (워커마다 실행, 완료 전에는 요청을 받지 않음)
     await init_db()
+    await readiness.run_checks()
+    readiness.start()
+    lag_monitor = None
+    if settings.METRICS_ENABLED:
+        lag_monitor = asyncio.create_task(
+            monitor_event_loop_lag(settings.EVENT_LOOP_LAG_INTERVAL_SECONDS)
+        )
+    if settings.NOTIFICATION_ENABLED and settings.REMINDER_SCHEDULER_ENABLED:
+        reminder_service.start()
+        print("⏰ 복용 알림 스케줄러 시작")
     print("🚀 HealthPlus API 서버가 시작되었습니다")
 
     yield
 
+    await readiness.stop()
+    await reminder_service.stop()
+    media_service.shutdown()
+    await close_db()
+    if lag_monitor is not None:
+        lag_monitor.cancel()
+
     # 애플리케이션 종료 시
     print("⛔ HealthPlus API 서버가 종료됩니다")
 
@@ -33,8 +56,12 @@ app = FastAPI(
     docs_url="/v1/docs" if settings.DEBUG else None,
     redoc_url="/v1/redoc" if settings.DEBUG else None,
     lifespan=lifespan,
+    default_response_class=ORJSONResponse,
 )
 
+# 부하 제어 (CORS 안쪽: 거절 응답에도 CORS 헤더 포함)
+app.add_middleware(AdmissionMiddleware)
+
 # CORS 미들웨어 설정
 app.add_middleware(
     CORSMiddleware,
@@ -44,6 +71,9 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# 메트릭 미들웨어 (가장 바깥에서 전체 처리 시간 측정)
+app.add_middleware(MetricsMiddleware)
+
 
 @app.exception_handler(APIException)
 async def api_exception_handler(request: Request, exc: APIException):
@@ -60,6 +90,23 @@ async def health_check():
     return {"status": "healthy", "message": "HealthPlus API is running"}
 
 
+@app.get("/ready", include_in_schema=False)
+async def readiness_check():
+    """준비 상태 엔드포인트 (워밍업 완료 + 캐시된 의존성 확인 결과, 준비 안 됐으면 503)"""
+    return JSONResponse(
+        status_code=200 if readiness.is_ready() else 503,
+        content=readiness.snapshot()
+    )
+
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus 메트릭 엔드포인트"""
+    if not settings.METRICS_ENABLED:
+        return JSONResponse(status_code=404, content={"detail": "Not Found"})
+    return Response(content=render_metrics(), headers={"Content-Type": CONTENT_TYPE_LATEST})
+
+
 # API 라우터 등록
 app.include_router(api_router, prefix="/v1")
 
@@ -0,0 +1,158 @@
+"""전체 사용자 복용 통계 집계 벤치마크
+
+합성 복용 기록(DB 조회 결과와 같은 문자열 컬럼)을 청크 단위로 넣어 집계 처리량을 비교합니다.
+- vectorized: PopulationAggregator (청크별 NumPy 배열 + bincount)
+- python_loop: 행마다 사전에 더하는 기존 방식 (--baseline-rows 이하 행 수에서만 실행)
+두 방식의 요약 결과가 같은지도 확인합니다. 합성 데이터 생성 시간은 제외합니다.
+
+실행 (server 디렉터리에서):
+    python scripts/benchmarks/analytics_benchmark.py --rows 1000000 10000000
+"""
+import argparse
+import json
+import platform
+import resource
+import sys
+import time
+from collections import defaultdict
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Iterator, List, Tuple
+
+import numpy as np
+
+SERVER_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(SERVER_DIR))
+
+from app.utils.analytics import PopulationAggregator, TIME_OF_DAY_BUCKETS  # noqa: E402
+
+
+DOSAGE_TIMES = ["07:30", "08:00", "12:30", "13:00", "18:00", "21:00", "23:30"]
+FORMS = ["tablet", "capsule", "syrup", "other"]
+UNITS = ["tablet", "capsule", "ml", "mg", "other"]
+
+Chunk = Tuple[List[str], List[str], List[str], List[str], List[str]]
+
+
+def synthetic_chunks(rows: int, users: int, chunk_size: int, seed: int) -> Iterator[Chunk]:
+    """(user_id, time, status, form, dosage_unit) 문자열 리스트 청크 생성 (사용자별 완료율이 다름)"""
+    rng = np.random.default_rng(seed)
+    user_labels = np.array([f"00000000-0000-0000-0000-{u:012x}" for u in range(users)])
+    user_rates = rng.beta(5, 1.5, size=users)
+
+    for offset in range(0, rows, chunk_size):
+        size = min(chunk_size, rows - offset)
+        user_codes = rng.integers(0, users, size=size)
+        taken = rng.random(size) < user_rates[user_codes]
+        yield (
+            user_labels[user_codes].tolist(),
+            np.array(DOSAGE_TIMES)[rng.integers(0, len(DOSAGE_TIMES), size=size)].tolist(),
+            np.where(taken, "taken", np.where(rng.random(size) < 0.5, "missed", "delayed")).tolist(),
+            np.array(FORMS)[rng.integers(0, len(FORMS), size=size)].tolist(),
+            np.array(UNITS)[rng.integers(0, len(UNITS), size=size)].tolist(),
+        )
+
+
+def python_loop_summary(chunks: Iterator[Chunk]) -> Dict[Tuple[str, str], Tuple[int, int]]:
+    """행 단위 파이썬 집계 (비교 기준), (dimension, bucket) -> (전체, 완료)"""
+    groups: Dict[Tuple[str, str], List[int]] = defaultdict(lambda: [0, 0])
+    for user_ids, times, statuses, forms, units in chunks:
+        for user_id, dosage_time, status, form, unit in zip(user_ids, times, statuses, forms, units):
+            hour = int(dosage_time[:2])
+            bucket = TIME_OF_DAY_BUCKETS[0 if 6 <= hour <= 11 else 1 if 12 <= hour <= 17 else 2]
+            taken = status == "taken"
+            for key in (("user", user_id), ("time_of_day", bucket), ("form", form), ("dosage_unit", unit)):
+                counts = groups[key]
+                counts[0] += 1
+                counts[1] += taken
+    return {key: (total, taken) for key, (total, taken) in groups.items()}
+
+
+def check_same(rows: List[dict], baseline: Dict[Tuple[str, str], Tuple[int, int]]):
+    """벡터화 결과의 그룹별 합계가 파이썬 집계와 같은지 확인"""
+    for row in rows:
+        if row["dimension"] in ("time_of_day", "form", "dosage_unit"):
+            expected = baseline[(row["dimension"], row["bucket"])]
+            assert (row["total_doses"], row["taken_count"]) == expected, (row, expected)
+    overall = next(row for row in rows if row["dimension"] == "overall")
+    users = [counts for key, counts in baseline.items() if key[0] == "user"]
+    assert overall["user_count"] == len(users)
+    assert overall["total_doses"] == sum(total for total, _ in users)
+
+
+def measure_vectorized(args: argparse.Namespace, rows: int) -> Tuple[float, List[dict]]:
+    aggregator = PopulationAggregator()
+    elapsed = 0.0
+    for chunk in synthetic_chunks(rows, args.users or max(rows // 100, 1), args.chunk_size, args.seed):
+        started = time.perf_counter()
+        aggregator.add_chunk(*chunk)
+        elapsed += time.perf_counter() - started
+
+    started = time.perf_counter()
+    summary = aggregator.summary()
+    return elapsed + time.perf_counter() - started, summary
+
+
+def measure_python_loop(args: argparse.Namespace, rows: int) -> Tuple[float, Dict]:
+    chunks = list(synthetic_chunks(rows, args.users or max(rows // 100, 1), args.chunk_size, args.seed))
+    started = time.perf_counter()
+    summary = python_loop_summary(iter(chunks))
+    return time.perf_counter() - started, summary
+
+
+def main(args: argparse.Namespace):
+    results = []
+    for rows in args.rows:
+        elapsed, summary = measure_vectorized(args, rows)
+        results.append({"variant": "vectorized", "rows": rows, "seconds": round(elapsed, 3)})
+
+        if rows <= args.baseline_rows:
+            baseline_elapsed, baseline = measure_python_loop(args, rows)
+            check_same(summary, baseline)
+            results.append({"variant": "python_loop", "rows": rows, "seconds": round(baseline_elapsed, 3)})
+
+        for result in results:
+            if result["rows"] == rows:
+                result["rows_per_second"] = round(rows / result["seconds"]) if result["seconds"] else None
+        print(f"{rows:>12,} rows 완료 (요약 {len(summary)}행)")
+
+    # ru_maxrss: Linux는 KB 단위
+    max_rss_mb = round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1)
+
+    print(f"\n{'variant':<14}{'rows':>14}{'seconds':>10}{'rows/s':>14}")
+    for result in results:
+        print(f"{result['variant']:<14}{result['rows']:>14,}{result['seconds']:>10.3f}{result['rows_per_second'] or 0:>14,}")
+    print(f"최대 RSS: {max_rss_mb} MB")
+
+    output = Path(args.output or SERVER_DIR / "benchmark-results" / (
+        f"analytics-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json"
+    ))
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "meta": {
+            "benchmark": "analytics",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "numpy": np.__version__,
+            "platform": platform.platform(),
+            "max_rss_mb": max_rss_mb,
+            "args": vars(args),
+        },
+        "results": results,
+    }, ensure_ascii=False, indent=2))
+    print(f"\n결과 저장: {output}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="전체 사용자 복용 통계 집계 벤치마크")
+    parser.add_argument("--rows", type=int, nargs="+", default=[1000000, 10000000], help="기록 수 (여러 개 가능)")
+    parser.add_argument("--users", type=int, default=None, help="사용자 수 (기본: 기록 수 / 100)")
+    parser.add_argument("--chunk-size", type=int, default=10000, help="청크 크기 (ANALYTICS_CHUNK_SIZE)")
+    parser.add_argument("--baseline-rows", type=int, default=1000000, help="파이썬 집계도 실행할 최대 기록 수")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmark-results/analytics-<시각>.json)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,296 @@
+"""API 벤치마크 / 부하 테스트
+
+FastAPI 앱(main:app)을 ASGI 클라이언트로 직접 호출하고, Supabase는 같은 프로세스의
+대역 서버(fake_supabase)로 대체합니다. /v1/medications, /v1/auth 라우트별로 여러 동시성에서
+처리량과 p50/p95/p99 지연, 요청당 데이터 접근 호출 수를 측정해 JSON으로 저장합니다.
+
+실행 (server 디렉터리에서):
+    python scripts/benchmarks/api_benchmark.py --concurrency 1,8,32 --requests 300 --latency-ms 5
+    python scripts/benchmarks/api_benchmark.py --baseline benchmark-results/api-이전결과.json
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Any, Callable, Dict, List, NamedTuple, Optional
+
+SERVER_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(SERVER_DIR))
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+
+from fake_supabase import FakeSupabase, build_fixtures  # noqa: E402
+
+
+class Scenario(NamedTuple):
+    """벤치마크 대상 요청 (사용자 인덱스 -> 요청 인자)"""
+    name: str
+    method: str
+    path: str
+    params: Callable[[int], Optional[dict]] = lambda i: None
+    body: Callable[[int], Optional[dict]] = lambda i: None
+
+
+def build_scenarios(medications: List[dict], today: date) -> List[Scenario]:
+    """medications: 사용자 인덱스별 대표 약물"""
+    yesterday = (today - timedelta(days=1)).isoformat()
+    week_ago = (today - timedelta(days=7)).isoformat()
+
+    return [
+        Scenario("list_medications", "GET", "/v1/medications", lambda i: {"limit": 50}),
+        Scenario("get_medication", "GET", "/v1/medications/{medication_id}"),
+        Scenario("records_page", "GET", "/v1/medications/records",
+                 lambda i: {"start_date": week_ago, "end_date": yesterday, "limit": 100}),
+        Scenario("daily_records", "GET", "/v1/medications/records/daily",
+                 lambda i: {"target_date": yesterday}),
+        Scenario("calendar_month", "GET", "/v1/medications/records/calendar",
+                 lambda i: {"year": today.year, "month": today.month}),
+        Scenario("calendar_range", "GET", "/v1/medications/records/calendar/range",
+                 lambda i: {"start_date": week_ago, "end_date": yesterday}),
+        Scenario("monthly_statistics", "GET", "/v1/medications/statistics/monthly",
+                 lambda i: {"year": today.year, "month": today.month}),
+        Scenario("export_ndjson", "GET", "/v1/medications/records/export",
+                 lambda i: {"format": "ndjson", "start_date": week_ago, "end_date": yesterday}),
+        Scenario("create_record", "POST", "/v1/medications/records",
+                 body=lambda i: {
+                     "medication_id": medications[i]["id"],
+                     "date": f"{today.isoformat()}T00:00:00",
+                     "time": "08:00",
+                     "status": "taken",
+                 }),
+        Scenario("auth_me", "GET", "/v1/auth/me"),
+        Scenario("auth_signin", "POST", "/v1/auth/signin",
+                 body=lambda i: {"email": f"user{i}@example.com", "password": "bench-password"}),
+        Scenario("auth_signup", "POST", "/v1/auth/signup",
+                 body=lambda i: {"email": f"new{i}@example.com", "password": "bench-password", "name": f"new{i}"}),
+    ]
+
+
+def percentile(sorted_values: List[float], q: float) -> float:
+    """최근접 순위 백분위수"""
+    if not sorted_values:
+        return 0.0
+    rank = max(int(round(q / 100 * len(sorted_values) + 0.5)) - 1, 0)
+    return sorted_values[min(rank, len(sorted_values) - 1)]
+
+
+def db_call_totals() -> tuple:
+    """요청당 데이터 접근 호출 수 히스토그램의 (합계, 요청 수) 전체 라우트 합"""
+    from prometheus_client import REGISTRY
+
+    total, count = 0.0, 0.0
+    for metric in REGISTRY.collect():
+        if metric.name != "healthplus_db_calls_per_request":
+            continue
+        for sample in metric.samples:
+            if sample.name.endswith("_sum"):
+                total += sample.value
+            elif sample.name.endswith("_count"):
+                count += sample.value
+    return total, count
+
+
+async def run_scenario(
+    client, scenario: Scenario, tokens: List[str], medications: List[dict],
+    concurrency: int, requests: int
+) -> Dict[str, Any]:
+    latencies: List[float] = []
+    statuses: Dict[str, int] = {}
+    next_index = 0
+    db_sum_before, db_count_before = db_call_totals()
+
+    async def worker():
+        nonlocal next_index
+        while next_index < requests:
+            i = next_index
+            next_index += 1
+            user = i % len(tokens)
+            path = scenario.path.format(medication_id=medications[user]["id"])
+
+            started = time.perf_counter()
+            response = await client.request(
+                scenario.method, path,
+                params=scenario.params(user),
+                json=scenario.body(user) if scenario.method != "GET" else None,
+                headers={"Authorization": f"Bearer {tokens[user]}"},
+            )
+            latencies.append(time.perf_counter() - started)
+            statuses[str(response.status_code)] = statuses.get(str(response.status_code), 0) + 1
+
+    started = time.perf_counter()
+    await asyncio.gather(*(worker() for _ in range(concurrency)))
+    elapsed = time.perf_counter() - started
+
+    db_sum_after, db_count_after = db_call_totals()
+    handled = db_count_after - db_count_before
+    latencies.sort()
+    return {
+        "scenario": scenario.name,
+        "method": scenario.method,
+        "route": scenario.path,
+        "concurrency": concurrency,
+        "requests": requests,
+        "throughput_rps": round(requests / elapsed, 2),
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 3),
+            "p95": round(percentile(latencies, 95) * 1000, 3),
+            "p99": round(percentile(latencies, 99) * 1000, 3),
+            "mean": round(sum(latencies) / len(latencies) * 1000, 3),
+            "max": round(latencies[-1] * 1000, 3),
+        },
+        "db_calls_per_request": round((db_sum_after - db_sum_before) / handled, 3) if handled else None,
+        "status_codes": statuses,
+    }
+
+
+def git_revision() -> Optional[str]:
+    try:
+        return subprocess.check_output(
+            ["git", "rev-parse", "--short", "HEAD"], cwd=SERVER_DIR, stderr=subprocess.DEVNULL, text=True
+        ).strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def print_results(results: List[dict], baseline: Optional[Dict[tuple, dict]] = None):
+    header = f"{'scenario':<20}{'conc':>5}{'rps':>10}{'p50':>9}{'p95':>9}{'p99':>9}{'db/req':>8}  status"
+    print(header)
+    print("-" * len(header))
+    for result in results:
+        latency = result["latency_ms"]
+        db_calls = result["db_calls_per_request"]
+        line = (
+            f"{result['scenario']:<20}{result['concurrency']:>5}{result['throughput_rps']:>10.1f}"
+            f"{latency['p50']:>9.2f}{latency['p95']:>9.2f}{latency['p99']:>9.2f}"
+            f"{db_calls if db_calls is not None else '-':>8}  {result['status_codes']}"
+        )
+        previous = (baseline or {}).get((result["scenario"], result["concurrency"]))
+        if previous:
+            p95_change = _change(previous["latency_ms"]["p95"], latency["p95"])
+            rps_change = _change(previous["throughput_rps"], result["throughput_rps"])
+            line += f"  (p95 {p95_change}, rps {rps_change})"
+        print(line)
+
+
+def _change(before: float, after: float) -> str:
+    if not before:
+        return "n/a"
+    return f"{(after - before) / before * 100:+.1f}%"
+
+
+async def main(args: argparse.Namespace):
+    today = date.today()
+    fixtures = build_fixtures(args.users, args.medications, args.days, today)
+    fake = FakeSupabase(fixtures, latency_ms=args.latency_ms, jitter_ms=args.jitter_ms)
+    url = fake.start()
+
+    # 설정은 앱 import 시점에 읽으므로 import 전에 환경 변수 지정
+    os.environ.update({
+        "SUPABASE_URL": url,
+        "SUPABASE_ANON_KEY": "bench.anon.key",
+        "SUPABASE_SERVICE_ROLE_KEY": "bench.service-role.key",
+        "JWT_SECRET": "bench-jwt-secret",
+        "AUTH_MODE": args.auth_mode,
+        "CACHE_ENABLED": "true" if args.cache else "false",
+        "CELERY_TASK_ALWAYS_EAGER": "true",
+        "REMINDER_SCHEDULER_ENABLED": "false",
+        "METRICS_ENABLED": "true",
+        "STORAGE_BACKEND": args.storage_backend,
+        "ADMISSION_CONTROL_ENABLED": "true" if args.admission_control else "false",
+    })
+    os.environ.pop("REDIS_URL", None)
+    os.environ.pop("PROMETHEUS_MULTIPROC_DIR", None)
+
+    import httpx
+    from main import app
+    from app.schemas.auth import UserResponse
+    from app.services.auth_service import auth_service
+
+    tokens = [
+        auth_service.create_user_token(UserResponse(
+            id=profile["user_id"],
+            email=profile["email"],
+            name=profile["name"],
+            login_method="email",
+            created_at=datetime.fromisoformat(profile["created_at"]),
+            is_email_verified=True,
+        ))
+        for profile in fixtures["user_profiles"]
+    ]
+    medications = [
+        next(m for m in fixtures["medications"] if m["user_id"] == profile["user_id"])
+        for profile in fixtures["user_profiles"]
+    ]
+
+    scenarios = build_scenarios(medications, today)
+    if args.scenarios:
+        selected = set(args.scenarios.split(","))
+        scenarios = [s for s in scenarios if s.name in selected]
+
+    results = []
+    async with app.router.lifespan_context(app):
+        transport = httpx.ASGITransport(app=app)
+        async with httpx.AsyncClient(transport=transport, base_url="http://bench") as client:
+            for scenario in scenarios:
+                await run_scenario(client, scenario, tokens, medications, 1, args.warmup)
+                for concurrency in args.concurrency:
+                    results.append(await run_scenario(
+                        client, scenario, tokens, medications, concurrency, args.requests
+                    ))
+    fake.stop()
+
+    baseline = None
+    if args.baseline:
+        previous = json.loads(Path(args.baseline).read_text())
+        baseline = {(r["scenario"], r["concurrency"]): r for r in previous["results"]}
+    print_results(results, baseline)
+
+    output = Path(args.output or SERVER_DIR / "benchmark-results" / (
+        f"api-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json"
+    ))
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "meta": {
+            "benchmark": "api",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "git_revision": git_revision(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+            "fake_supabase_requests": fake.request_count,
+        },
+        "results": results,
+    }, ensure_ascii=False, indent=2))
+    print(f"\n결과 저장: {output}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="HealthPlus API 벤치마크")
+    parser.add_argument("--concurrency", type=lambda v: [int(c) for c in v.split(",")], default=[1, 8, 32],
+                        help="동시성 수준 (쉼표 구분)")
+    parser.add_argument("--requests", type=int, default=300, help="시나리오/동시성별 요청 수")
+    parser.add_argument("--warmup", type=int, default=20, help="시나리오별 워밍업 요청 수")
+    parser.add_argument("--latency-ms", type=float, default=5.0, help="Supabase 대역 응답 지연 (ms)")
+    parser.add_argument("--jitter-ms", type=float, default=2.0, help="추가 지연 범위 (0~jitter ms 균등 분포)")
+    parser.add_argument("--users", type=int, default=50, help="사용자 수")
+    parser.add_argument("--medications", type=int, default=5, help="사용자당 약물 수")
+    parser.add_argument("--days", type=int, default=30, help="사용자당 기록 일수")
+    parser.add_argument("--auth-mode", choices=["local", "remote"], default="local", help="AUTH_MODE")
+    parser.add_argument("--storage-backend", choices=["postgrest", "asyncpg"], default="postgrest",
+                        help="STORAGE_BACKEND (asyncpg는 DATABASE_URL의 실제 DB 필요)")
+    parser.add_argument("--admission-control", action="store_true",
+                        help="부하 제어/사용자별 요청 제한 사용 (기본: 끔, 429/503 없이 측정)")
+    parser.add_argument("--cache", action="store_true", help="응답 캐시 사용 (기본: 끔, 서비스 비용 측정)")
+    parser.add_argument("--scenarios", help="실행할 시나리오 (쉼표 구분, 기본: 전체)")
+    parser.add_argument("--baseline", help="비교할 이전 결과 JSON")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmark-results/api-<시각>.json)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args()))
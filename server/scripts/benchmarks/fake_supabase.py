@@ -0,0 +1,298 @@
+"""벤치마크용 Supabase(PostgREST/Auth) 대역 서버
+
+실제 DB 대신 메모리의 고정 데이터로 응답하고, 요청마다 지정한 지연을 넣어
+네트워크 왕복 + 쿼리 시간을 흉내냅니다. 같은 프로세스의 별도 스레드(자체 이벤트 루프)에서
+실행되어 앱의 이벤트 루프를 막지 않지만 GIL은 공유하므로, 결과는 절대값보다 변경 전후 비교에 사용합니다.
+
+PostgREST 쿼리는 eq/neq/gt/gte/lt/lte/in 필터와 limit만 해석합니다(or/order는 무시).
+쓰기는 응답만 만들고 데이터는 바꾸지 않아 반복 실행해도 같은 상태를 유지합니다.
+"""
+import asyncio
+import json
+import random
+import socket
+import threading
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional
+
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, Response
+from starlette.routing import Route
+
+
+DOSAGE_TIMES = ["08:00", "13:00", "20:00"]
+
+
+def build_fixtures(users: int, medications_per_user: int, days: int, today: date) -> Dict[str, List[dict]]:
+    """사용자별 약물, 최근 days일의 복용 기록/일별 집계, 프로필 생성"""
+    tables: Dict[str, List[dict]] = {
+        "user_profiles": [], "medications": [], "medication_records": [], "daily_adherence": [],
+        "sync_tombstones": [], "user_streaks": []
+    }
+    created_at = datetime.combine(today - timedelta(days=days + 1), datetime.min.time(), tzinfo=timezone.utc)
+
+    for u in range(users):
+        user_id = str(uuid.UUID(int=u + 1))
+        tables["user_profiles"].append({
+            "user_id": user_id,
+            "email": f"user{u}@example.com",
+            "name": f"user{u}",
+            "login_method": "email",
+            "profile_image_url": None,
+            "created_at": created_at.isoformat(),
+        })
+
+        medications = []
+        for m in range(medications_per_user):
+            medication = {
+                "id": str(uuid.UUID(int=(u + 1) << 32 | (m + 1))),
+                "user_id": user_id,
+                "name": f"약물 {m + 1}",
+                "image_path": None,
+                "daily_dosage_count": len(DOSAGE_TIMES),
+                "dosage_times": DOSAGE_TIMES,
+                "form": "tablet",
+                "single_dosage_amount": 1,
+                "dosage_unit": "tablet",
+                "has_meal_relation": True,
+                "meal_relation": "after_meal",
+                "is_continuous": True,
+                "memo": None,
+                "created_at": created_at.isoformat(),
+                "updated_at": created_at.isoformat(),
+            }
+            medications.append(medication)
+        tables["medications"].extend(reversed(medications))  # created_at desc 순
+
+        for d in range(days, 0, -1):
+            day = (today - timedelta(days=d)).isoformat()
+            taken = 0
+            for dosage_time in DOSAGE_TIMES:
+                for medication in medications:
+                    status = "taken" if random.random() < 0.85 else "missed"
+                    taken += status == "taken"
+                    tables["medication_records"].append({
+                        "id": str(uuid.uuid4()),
+                        "user_id": user_id,
+                        "medication_id": medication["id"],
+                        "date": day,
+                        "time": dosage_time,
+                        "status": status,
+                        "delay_reason": None,
+                        "taken_at": f"{day}T{dosage_time}:00+00:00" if status == "taken" else None,
+                        "created_at": f"{day}T{dosage_time}:00+00:00",
+                        "updated_at": f"{day}T{dosage_time}:00+00:00",
+                        "medications": {
+                            "name": medication["name"],
+                            "user_id": user_id,
+                            "dosage_unit": medication["dosage_unit"],
+                            "single_dosage_amount": medication["single_dosage_amount"],
+                        },
+                    })
+            total = len(DOSAGE_TIMES) * len(medications)
+            tables["daily_adherence"].append({
+                "user_id": user_id,
+                "date": day,
+                "total_doses": total,
+                "taken_count": taken,
+                "completion_rate": round(taken / total, 4) if total else 0.0,
+                "overall_status": "taken" if taken == total else "delayed",
+                "updated_at": f"{day}T23:00:00+00:00",
+            })
+
+        # user_streaks (DB 트리거 refresh_user_streak가 유지하는 값과 같게)
+        run = longest = 0
+        last_completed = None
+        for row in tables["daily_adherence"][-days:] if days else []:
+            if row["overall_status"] == "taken":
+                run += 1
+                last_completed = row["date"]
+            else:
+                run = 0
+            longest = max(longest, run)
+        tables["user_streaks"].append({
+            "user_id": user_id,
+            "current_streak": run,
+            "longest_streak": longest,
+            "last_completed_date": last_completed,
+        })
+
+    return tables
+
+
+def _matches(row: dict, column: str, expression: str) -> bool:
+    operator, _, value = expression.partition(".")
+    actual = row.get(column)
+    if operator == "in":
+        return str(actual) in {v.strip('"') for v in value.strip("()").split(",")}
+    if operator == "is":
+        return actual is None if value == "null" else str(actual).lower() == value
+    actual = "" if actual is None else str(actual)
+    return {
+        "eq": actual == value,
+        "neq": actual != value,
+        "gt": actual > value,
+        "gte": actual >= value,
+        "lt": actual < value,
+        "lte": actual <= value,
+    }.get(operator, True)
+
+
+class FakeSupabase:
+    """Supabase 대역 (latency_ms + 0~jitter_ms 균등 분포 지연)"""
+
+    RESERVED_PARAMS = {"select", "order", "limit", "offset", "or", "on_conflict", "columns"}
+
+    def __init__(self, tables: Dict[str, List[dict]], latency_ms: float = 5.0, jitter_ms: float = 0.0):
+        self.tables = tables
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.request_count = 0
+        self._server: Optional[uvicorn.Server] = None
+        self._thread: Optional[threading.Thread] = None
+        self.url = ""
+
+        self.app = Starlette(routes=[
+            Route("/rest/v1/rpc/{function}", self.rpc, methods=["POST", "GET"]),
+            Route("/rest/v1/{table}", self.table, methods=["GET", "HEAD", "POST", "PATCH", "DELETE"]),
+            Route("/auth/v1/signup", self.auth_session, methods=["POST"]),
+            Route("/auth/v1/token", self.auth_session, methods=["POST"]),
+            Route("/auth/v1/user", self.auth_user, methods=["GET"]),
+            Route("/auth/v1/logout", self.auth_logout, methods=["POST"]),
+        ])
+
+    def start(self) -> str:
+        """별도 스레드에서 서버 시작, 기본 URL 반환"""
+        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+        sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+        sock.bind(("127.0.0.1", 0))
+        self.url = f"http://127.0.0.1:{sock.getsockname()[1]}"
+
+        config = uvicorn.Config(self.app, log_level="warning", access_log=False, lifespan="off")
+        self._server = uvicorn.Server(config)
+        self._thread = threading.Thread(target=self._server.run, kwargs={"sockets": [sock]}, daemon=True)
+        self._thread.start()
+        while not self._server.started:
+            time.sleep(0.01)
+        return self.url
+
+    def stop(self):
+        if self._server is not None:
+            self._server.should_exit = True
+            self._thread.join(timeout=5)
+
+    async def _delay(self):
+        self.request_count += 1
+        delay = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay > 0:
+            await asyncio.sleep(delay / 1000)
+
+    def _select(self, request: Request, table: str) -> List[dict]:
+        rows = self.tables.get(table, [])
+        for column, expression in request.query_params.multi_items():
+            if column not in self.RESERVED_PARAMS:
+                rows = [row for row in rows if _matches(row, column, expression)]
+        offset = int(request.query_params.get("offset", 0))
+        limit = request.query_params.get("limit")
+        return rows[offset:offset + int(limit)] if limit else rows[offset:]
+
+    def _respond(self, request: Request, rows: List[dict], status_code: int = 200) -> Response:
+        if "vnd.pgrst.object" in request.headers.get("accept", ""):
+            if not rows:
+                return JSONResponse(
+                    {"code": "PGRST116", "message": "JSON object requested, multiple (or no) rows returned",
+                     "details": "The result contains 0 rows", "hint": None},
+                    status_code=406
+                )
+            return JSONResponse(rows[0], status_code=status_code)
+
+        headers = {}
+        if "count=" in request.headers.get("prefer", ""):
+            headers["content-range"] = f"0-{max(len(rows) - 1, 0)}/{len(rows)}"
+        return JSONResponse(rows, status_code=status_code, headers=headers)
+
+    async def table(self, request: Request) -> Response:
+        await self._delay()
+        table = request.path_params["table"]
+
+        if request.method in ("GET", "HEAD"):
+            return self._respond(request, self._select(request, table))
+
+        if request.method == "POST":
+            body = json.loads(await request.body() or b"[]")
+            rows = [self._written_row(table, row) for row in (body if isinstance(body, list) else [body])]
+            return self._respond(request, rows, status_code=201)
+
+        matched = self._select(request, table)
+        if request.method == "PATCH":
+            update = json.loads(await request.body() or b"{}")
+            matched = [{**row, **update} for row in matched]
+        return self._respond(request, matched)
+
+    def _written_row(self, table: str, row: dict) -> dict:
+        now = datetime.now(timezone.utc).isoformat()
+        written = {"id": str(uuid.uuid4()), "created_at": now, "updated_at": now, **row}
+        if table == "medication_records":
+            medication = next(
+                (m for m in self.tables["medications"] if m["id"] == row.get("medication_id")), None
+            )
+            written.setdefault("taken_at", None)
+            written["medications"] = medication and {
+                "name": medication["name"],
+                "user_id": medication["user_id"],
+                "dosage_unit": medication["dosage_unit"],
+                "single_dosage_amount": medication["single_dosage_amount"],
+            }
+        return written
+
+    async def rpc(self, request: Request) -> Response:
+        await self._delay()
+        if request.path_params["function"] == "get_monthly_statistics":
+            return JSONResponse({
+                "average_completion_rate": 0.85,
+                "consecutive_days": 12,
+                "best_time": "08:00",
+                "total_days": 30,
+                "completed_days": 22,
+            })
+        return JSONResponse(None)
+
+    def _user(self, email: str = "user0@example.com") -> dict:
+        profile = next(
+            (p for p in self.tables["user_profiles"] if p["email"] == email),
+            self.tables["user_profiles"][0]
+        )
+        return {
+            "id": profile["user_id"],
+            "aud": "authenticated",
+            "role": "authenticated",
+            "email": email,
+            "email_confirmed_at": profile["created_at"],
+            "app_metadata": {"provider": "email"},
+            "user_metadata": {"name": profile["name"]},
+            "created_at": profile["created_at"],
+        }
+
+    async def auth_session(self, request: Request) -> Response:
+        await self._delay()
+        body = json.loads(await request.body() or b"{}")
+        return JSONResponse({
+            "access_token": "bench-access-token",
+            "token_type": "bearer",
+            "expires_in": 3600,
+            "expires_at": int(time.time()) + 3600,
+            "refresh_token": "bench-refresh-token",
+            "user": self._user(body.get("email", "user0@example.com")),
+        })
+
+    async def auth_user(self, request: Request) -> Response:
+        await self._delay()
+        return JSONResponse(self._user())
+
+    async def auth_logout(self, request: Request) -> Response:
+        await self._delay()
+        return Response(status_code=204)
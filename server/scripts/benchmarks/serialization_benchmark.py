@@ -0,0 +1,188 @@
+"""응답 직렬화 마이크로 벤치마크
+
+목록 응답 1,000개 항목 기준으로 DB 행 -> 응답 바이트 변환 비용을 비교합니다.
+- validated: 서비스에서 모델 생성(검증) 후 FastAPI response_model 처리(덤프/재검증/인코딩) + JSONResponse
+- fast: model_construct + TypeAdapter.dump_json (FAST_SERIALIZATION 경로)
+- orjson_rows: DB 행을 그대로 orjson으로 직렬화 (하한 참고값)
+
+실행 (server 디렉터리에서):
+    python scripts/benchmarks/serialization_benchmark.py --items 1000 --repeat 20
+"""
+import argparse
+import asyncio
+import json
+import os
+import platform
+import statistics
+import sys
+import time
+import uuid
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import Callable, Dict, List
+
+SERVER_DIR = Path(__file__).resolve().parents[2]
+sys.path.insert(0, str(SERVER_DIR))
+
+for name, value in {
+    "SUPABASE_URL": "http://127.0.0.1:1",
+    "SUPABASE_ANON_KEY": "bench.anon.key",
+    "SUPABASE_SERVICE_ROLE_KEY": "bench.service-role.key",
+    "JWT_SECRET": "bench-jwt-secret",
+}.items():
+    os.environ.setdefault(name, value)
+
+import orjson  # noqa: E402
+from fastapi.responses import JSONResponse  # noqa: E402
+from fastapi.routing import serialize_response  # noqa: E402
+from fastapi.utils import create_response_field  # noqa: E402
+
+from app.schemas.medication import (  # noqa: E402
+    MedicationRecordItem, MedicationRecordPage, MedicationResponse
+)
+from app.utils.serialization import type_adapter  # noqa: E402
+
+
+def medication_rows(count: int) -> List[dict]:
+    created_at = datetime(2026, 1, 1, tzinfo=timezone.utc)
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "user_id": str(uuid.uuid4()),
+            "name": f"약물 {i}",
+            "image_path": None,
+            "daily_dosage_count": 3,
+            "dosage_times": ["08:00", "13:00", "20:00"],
+            "form": "tablet",
+            "single_dosage_amount": 1,
+            "dosage_unit": "tablet",
+            "has_meal_relation": True,
+            "meal_relation": "after_meal",
+            "is_continuous": True,
+            "memo": None,
+            "created_at": (created_at + timedelta(minutes=i)).isoformat(),
+            "updated_at": (created_at + timedelta(minutes=i)).isoformat(),
+        }
+        for i in range(count)
+    ]
+
+
+def record_rows(count: int) -> List[dict]:
+    start = date(2026, 1, 1)
+    return [
+        {
+            "id": str(uuid.uuid4()),
+            "medication_id": str(uuid.uuid4()),
+            "date": (start + timedelta(days=i // 3)).isoformat(),
+            "time": ["08:00", "13:00", "20:00"][i % 3],
+            "status": "taken",
+            "delay_reason": None,
+            "taken_at": f"{(start + timedelta(days=i // 3)).isoformat()}T08:00:00+00:00",
+            "medications": {"name": f"약물 {i % 5}"},
+        }
+        for i in range(count)
+    ]
+
+
+def record_item(row: dict) -> dict:
+    return {**row, "medication_name": row["medications"]["name"]}
+
+
+def fastapi_render(field, content) -> bytes:
+    """FastAPI가 response_model 라우트에서 하는 처리 (serialize_response + JSONResponse)"""
+    payload = asyncio.run(serialize_response(field=field, response_content=content))
+    return JSONResponse(payload).body
+
+
+def build_cases(items: int) -> Dict[str, Dict[str, Callable[[], bytes]]]:
+    medications = medication_rows(items)
+    records = record_rows(items)
+
+    medication_list_field = create_response_field(name="medications", type_=List[MedicationResponse])
+    record_page_field = create_response_field(name="records", type_=MedicationRecordPage)
+    medication_list_adapter = type_adapter(List[MedicationResponse])
+    record_page_adapter = type_adapter(MedicationRecordPage)
+
+    return {
+        "medication_list": {
+            "validated": lambda: fastapi_render(
+                medication_list_field, [MedicationResponse(**row) for row in medications]
+            ),
+            "fast": lambda: medication_list_adapter.dump_json(
+                [MedicationResponse.model_construct(**row) for row in medications], warnings=False
+            ),
+            "orjson_rows": lambda: orjson.dumps(medications),
+        },
+        "record_page": {
+            "validated": lambda: fastapi_render(record_page_field, MedicationRecordPage(
+                items=[MedicationRecordItem(**record_item(row)) for row in records]
+            )),
+            "fast": lambda: record_page_adapter.dump_json(MedicationRecordPage.model_construct(
+                items=[MedicationRecordItem.model_construct(**record_item(row)) for row in records]
+            ), warnings=False),
+            "orjson_rows": lambda: orjson.dumps({"items": records, "next_cursor": None}),
+        },
+    }
+
+
+def measure(func: Callable[[], bytes], repeat: int) -> List[float]:
+    func()  # 워밍업 (스키마/캐시 준비)
+    timings = []
+    for _ in range(repeat):
+        started = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - started)
+    return timings
+
+
+def main(args: argparse.Namespace):
+    # asyncio.run은 serialize_response 호출마다 루프를 만들므로 그 비용은 별도로 빼서 보정
+    loop_overhead = statistics.median(measure(lambda: asyncio.run(asyncio.sleep(0)), args.repeat))
+
+    results = []
+    for case, variants in build_cases(args.items).items():
+        for variant, func in variants.items():
+            timings = measure(func, args.repeat)
+            median = statistics.median(timings)
+            if variant == "validated":
+                median = max(median - loop_overhead, 0.0)
+            results.append({
+                "case": case,
+                "variant": variant,
+                "items": args.items,
+                "median_ms": round(median * 1000, 3),
+                "ms_per_1k_items": round(median * 1000 * 1000 / args.items, 3),
+                "min_ms": round(min(timings) * 1000, 3),
+            })
+
+    print(f"{'case':<18}{'variant':<14}{'median ms':>12}{'ms/1k':>10}")
+    for result in results:
+        print(f"{result['case']:<18}{result['variant']:<14}{result['median_ms']:>12.3f}{result['ms_per_1k_items']:>10.3f}")
+
+    output = Path(args.output or SERVER_DIR / "benchmark-results" / (
+        f"serialization-{datetime.now(timezone.utc).strftime('%Y%m%dT%H%M%SZ')}.json"
+    ))
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps({
+        "meta": {
+            "benchmark": "serialization",
+            "timestamp": datetime.now(timezone.utc).isoformat(),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "args": vars(args),
+        },
+        "results": results,
+    }, ensure_ascii=False, indent=2))
+    print(f"\n결과 저장: {output}")
+
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="응답 직렬화 마이크로 벤치마크")
+    parser.add_argument("--items", type=int, default=1000, help="응답 항목 수")
+    parser.add_argument("--repeat", type=int, default=20, help="반복 횟수")
+    parser.add_argument("--output", help="결과 JSON 경로 (기본: benchmark-results/serialization-<시각>.json)")
+    return parser.parse_args()
+
+
+if __name__ == "__main__":
+    main(parse_args())
@@ -0,0 +1,15 @@
+import os
+import sys
+from pathlib import Path
+
+# app.core.config가 import 시점에 설정을 읽으므로 필수 값을 먼저 채움 (외부 서비스에는 연결하지 않음)
+for name, value in {
+    "SUPABASE_URL": "http://127.0.0.1:1",
+    "SUPABASE_ANON_KEY": "test.anon.key",
+    "SUPABASE_SERVICE_ROLE_KEY": "test.service-role.key",
+    "JWT_SECRET": "test-jwt-secret",
+    "REDIS_URL": "",
+}.items():
+    os.environ[name] = value
+
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
@@ -0,0 +1,65 @@
+import pytest
+
+from app.core import admission
+from app.core.admission import AdmissionMiddleware, InMemoryRateLimiter, RateLimiter, client_ip
+from app.core.config import settings
+
+
+def make_scope(path: str = "/v1/medications", client: str = "10.0.0.5", forwarded: str = ""):
+    headers = [(b"x-forwarded-for", forwarded.encode())] if forwarded else []
+    return {"type": "http", "method": "POST", "path": path, "headers": headers, "client": (client, 1234)}
+
+
+def test_client_ip_ignores_forwarded_header_without_trusted_proxy(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXY_COUNT", 0)
+    assert client_ip(make_scope(forwarded="1.1.1.1")) == "10.0.0.5"
+
+
+def test_client_ip_uses_address_seen_by_trusted_proxy(monkeypatch):
+    monkeypatch.setattr(settings, "RATE_LIMIT_TRUSTED_PROXY_COUNT", 1)
+    # 클라이언트가 넣은 왼쪽 값(9.9.9.9)은 무시하고 ingress가 덧붙인 값을 사용
+    assert client_ip(make_scope(forwarded="9.9.9.9, 203.0.113.7")) == "203.0.113.7"
+    assert client_ip(make_scope()) == "10.0.0.5"
+
+
+async def test_in_memory_rate_limiter_refills():
+    limiter = InMemoryRateLimiter(rate=1000.0, burst=2)
+    assert await limiter.acquire("k") == 0
+    assert await limiter.acquire("k") == 0
+    assert await limiter.acquire("k") > 0
+    assert await limiter.acquire("other") == 0
+
+
+@pytest.fixture
+def limits(monkeypatch):
+    monkeypatch.setattr(settings, "ADMISSION_CONTROL_ENABLED", True)
+    monkeypatch.setattr(settings, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(admission, "rate_limiter", InMemoryRateLimiter(rate=0.001, burst=3))
+    monkeypatch.setattr(admission, "auth_rate_limiter", InMemoryRateLimiter(rate=0.001, burst=1))
+
+
+async def call(path: str) -> int:
+    statuses = []
+
+    async def app(scope, receive, send):
+        await send({"type": "http.response.start", "status": 200, "headers": []})
+
+    async def send(message):
+        if message["type"] == "http.response.start":
+            statuses.append(message["status"])
+
+    await AdmissionMiddleware(app)(make_scope(path), None, send)
+    return statuses[0]
+
+
+async def test_auth_paths_use_separate_limit(limits):
+    assert await call("/v1/auth/signin") == 200
+    assert await call("/v1/auth/signin") == 429
+    # 일반 요청 한도는 인증 경로 요청으로 줄지 않음
+    assert [await call("/v1/medications") for _ in range(4)] == [200, 200, 200, 429]
+
+
+def test_rate_limiter_requires_acquire():
+    with pytest.raises(TypeError):
+        RateLimiter(1.0, 1)
+    InMemoryRateLimiter(1.0, 1)
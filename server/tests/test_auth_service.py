@@ -0,0 +1,44 @@
+import pytest
+
+from app.core.cache import InMemoryCacheBackend, cache
+from app.core.config import settings
+from app.services.auth_service import AuthService
+
+
+PAYLOAD = {"sub": "u1", "email": "u1@example.com", "created_at": "2024-01-01T00:00:00+00:00"}
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(cache, "backend", InMemoryCacheBackend())
+    monkeypatch.setattr(cache, "shared", True)
+    monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+
+    service = AuthService()
+    service.profiles = []
+    service.lookups = 0
+
+    async def get_profile(user_id):
+        service.lookups += 1
+        return service.profiles[min(service.lookups, len(service.profiles)) - 1]
+
+    monkeypatch.setattr(service, "_get_user_profile", get_profile)
+    return service
+
+
+async def test_principal_without_profile_row_is_not_cached(service):
+    # 가입 직후: 프로필 생성 작업이 끝나기 전에는 이름이 비어 있음
+    service.profiles = [{}, {"name": "홍길동"}]
+
+    assert (await service._get_local_principal("u1", PAYLOAD)).name is None
+    assert (await service._get_local_principal("u1", PAYLOAD)).name == "홍길동"
+    assert (await service._get_local_principal("u1", PAYLOAD)).name == "홍길동"
+    assert service.lookups == 2
+
+
+async def test_invalidate_principal_refreshes_profile(service):
+    service.profiles = [{"name": "이전"}, {"name": "변경"}]
+
+    assert (await service._get_local_principal("u1", PAYLOAD)).name == "이전"
+    await service.invalidate_principal("u1")
+    assert (await service._get_local_principal("u1", PAYLOAD)).name == "변경"
@@ -0,0 +1,74 @@
+from typing import List
+
+import pytest
+
+from app.core.cache import CacheBackend, InMemoryCacheBackend, cache, cached
+from app.core.config import settings
+
+
+class Service:
+    def __init__(self):
+        self.calls = 0
+
+    @cached("items", scope="items")
+    async def get_items(self, user_id: str, limit: int, cursor: str = "") -> List[str]:
+        self.calls += 1
+        return [f"{user_id}:{limit}:{cursor}"]
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    monkeypatch.setattr(cache, "backend", InMemoryCacheBackend())
+    monkeypatch.setattr(cache, "shared", True)
+    monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+    return cache
+
+
+async def test_cached_keyword_and_positional_calls_share_key(shared_cache):
+    service = Service()
+
+    assert await service.get_items("u1", 10) == ["u1:10:"]
+    assert await service.get_items("u1", limit=10, cursor="") == ["u1:10:"]
+    assert await service.get_items(user_id="u1", limit=10) == ["u1:10:"]
+    assert service.calls == 1
+
+    assert await service.get_items("u1", 10, cursor="c") == ["u1:10:c"]
+    assert service.calls == 2
+
+
+async def test_invalidate_drops_cached_values(shared_cache):
+    service = Service()
+    await service.get_items("u1", 10)
+    await shared_cache.invalidate("u1", "items")
+    await service.get_items("u1", 10)
+    assert service.calls == 2
+
+
+async def test_in_process_backend_is_not_used_unless_opted_in(monkeypatch):
+    monkeypatch.setattr(cache, "backend", InMemoryCacheBackend())
+    monkeypatch.setattr(cache, "shared", False)
+    monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "CACHE_IN_PROCESS_FALLBACK", False)
+    service = Service()
+
+    await service.get_items("u1", 10)
+    await service.get_items("u1", 10)
+    assert service.calls == 2
+
+    monkeypatch.setattr(settings, "CACHE_IN_PROCESS_FALLBACK", True)
+    await service.get_items("u1", 10)
+    await service.get_items("u1", 10)
+    assert service.calls == 3
+
+
+def test_cache_backend_requires_all_methods():
+    with pytest.raises(TypeError):
+        CacheBackend()
+
+    class PartialBackend(CacheBackend):
+        async def get(self, key):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialBackend()
+    InMemoryCacheBackend()
@@ -0,0 +1,17 @@
+import pytest
+from pydantic import ValidationError
+
+from app.core.config import Settings
+
+
+def test_asyncpg_backend_requires_database_url():
+    with pytest.raises(ValidationError, match="DATABASE_URL"):
+        Settings(STORAGE_BACKEND="asyncpg", DATABASE_URL=None)
+
+    settings = Settings(STORAGE_BACKEND="asyncpg", DATABASE_URL="postgresql://localhost/healthplus")
+    assert settings.DATABASE_URL
+
+
+def test_unknown_storage_backend_is_rejected():
+    with pytest.raises(ValidationError, match="STORAGE_BACKEND"):
+        Settings(STORAGE_BACKEND="postgres")
@@ -0,0 +1,17 @@
+from app.core.database import SupabaseClient, close_db
+
+
+async def test_close_db_closes_pooled_http_clients():
+    client = SupabaseClient.get_service_client()
+    postgrest_session = client.postgrest.session
+    storage_session = client.storage.session
+    auth_session = client.auth._http_client
+
+    await close_db()
+
+    assert postgrest_session.is_closed
+    assert storage_session.is_closed
+    assert auth_session.is_closed
+    # 다음 호출 시 새 클라이언트 생성
+    assert SupabaseClient.get_service_client() is not client
+    await close_db()
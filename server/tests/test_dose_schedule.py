@@ -0,0 +1,77 @@
+from datetime import date
+from zoneinfo import ZoneInfo
+
+from app.services.dose_schedule_service import ExpectedDose, dose_template, expand_expected_doses, merge_doses
+
+
+TZ = ZoneInfo("Asia/Seoul")
+
+MEDICATION = {
+    "id": "m1",
+    "user_id": "u1",
+    "dosage_times": ["21:00", "08:00"],
+    "daily_dosage_count": 2,
+    "is_continuous": True,
+    "created_at": "2024-01-01T00:00:00+00:00",  # 현지 09:00
+}
+
+
+def test_template_starts_at_creation():
+    template = dose_template(MEDICATION, TZ)
+    assert template.times == ["08:00", "21:00"]
+    assert template.start == ("2024-01-01", "09:00")
+
+    doses = list(expand_expected_doses([template], date(2024, 1, 1), date(2024, 1, 2)))
+    assert doses == [
+        ExpectedDose(date(2024, 1, 1), "21:00", "m1", "u1"),
+        ExpectedDose(date(2024, 1, 2), "08:00", "m1", "u1"),
+        ExpectedDose(date(2024, 1, 2), "21:00", "m1", "u1"),
+    ]
+
+
+def test_changed_schedule_applies_only_after_effective_time():
+    medication = {**MEDICATION, "schedule_updated_at": "2024-01-10T03:00:00Z"}  # 현지 12:00
+    template = dose_template(medication, TZ)
+    assert template.start == ("2024-01-10", "12:00")
+
+    doses = list(expand_expected_doses([template], date(2024, 1, 5), date(2024, 1, 10)))
+    assert doses == [ExpectedDose(date(2024, 1, 10), "21:00", "m1", "u1")]
+
+
+def test_non_continuous_medication_has_no_template():
+    assert dose_template({**MEDICATION, "is_continuous": False}, TZ) is None
+
+
+def test_merge_doses_pairs_records_with_expected_doses():
+    expected = [
+        ExpectedDose(date(2024, 1, 1), "08:00", "m1", "u1"),
+        ExpectedDose(date(2024, 1, 1), "21:00", "m1", "u1"),
+        ExpectedDose(date(2024, 1, 2), "08:00", "m1", "u1"),
+    ]
+    taken = {"date": "2024-01-01", "time": "08:00", "medication_id": "m1", "status": "taken"}
+    # 일정 변경 전 시간에 남은 기록
+    extra = {"date": "2024-01-01T00:00:00", "time": "12:00", "medication_id": "m1", "status": "taken"}
+    late = {"date": "2024-01-02", "time": "08:00", "medication_id": "m1", "status": "delayed"}
+
+    assert list(merge_doses(expected, [taken, extra, late])) == [
+        (expected[0], taken),
+        (None, extra),
+        (expected[1], None),
+        (expected[2], late),
+    ]
+
+
+def test_merge_doses_handles_empty_sides():
+    dose = ExpectedDose(date(2024, 1, 1), "08:00", "m1", "u1")
+    record = {"date": "2024-01-01", "time": "08:00", "medication_id": "m2"}
+
+    assert list(merge_doses([], [])) == []
+    assert list(merge_doses([dose], [])) == [(dose, None)]
+    assert list(merge_doses([], [record])) == [(None, record)]
+
+
+def test_merge_doses_matches_unpadded_record_times():
+    dose = ExpectedDose(date(2024, 1, 1), "09:00", "m1", "u1")
+    record = {"date": "2024-01-01", "time": "9:00", "medication_id": "m1"}
+
+    assert list(merge_doses([dose], [record])) == [(dose, record)]
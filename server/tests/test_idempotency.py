@@ -0,0 +1,94 @@
+import pytest
+from fastapi import HTTPException
+from pydantic import BaseModel
+
+from app.core.cache import InMemoryCacheBackend, cache
+from app.core.config import settings
+from app.utils.idempotency import REPLAYED_HEADER, get_idempotency_key, idempotent
+
+
+class Item(BaseModel):
+    name: str
+
+
+@pytest.fixture
+def shared_cache(monkeypatch):
+    monkeypatch.setattr(cache, "backend", InMemoryCacheBackend())
+    monkeypatch.setattr(cache, "shared", True)
+    monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+    monkeypatch.setattr(settings, "IDEMPOTENCY_ENABLED", True)
+    return cache
+
+
+class Handler:
+    def __init__(self, error: Exception = None):
+        self.calls = 0
+        self.error = error
+
+    async def __call__(self) -> Item:
+        self.calls += 1
+        if self.error is not None:
+            raise self.error
+        return Item(name=f"item-{self.calls}")
+
+
+async def test_retry_replays_first_response(shared_cache):
+    handler = Handler()
+    first = await idempotent("k1", "u1", "create_item", Item(name="a"), handler, Item)
+    retry = await idempotent("k1", "u1", "create_item", Item(name="a"), handler, Item)
+
+    assert handler.calls == 1
+    assert retry.body == first.body == b'{"name":"item-1"}'
+    assert retry.headers[REPLAYED_HEADER] == "true"
+    assert REPLAYED_HEADER.lower() not in first.headers
+
+
+async def test_key_is_scoped_per_user(shared_cache):
+    handler = Handler()
+    await idempotent("k1", "u1", "create_item", Item(name="a"), handler, Item)
+    await idempotent("k1", "u2", "create_item", Item(name="a"), handler, Item)
+
+    assert handler.calls == 2
+
+
+async def test_reused_key_with_different_payload_is_rejected(shared_cache):
+    await idempotent("k1", "u1", "create_item", Item(name="a"), Handler(), Item)
+
+    with pytest.raises(HTTPException) as error:
+        await idempotent("k1", "u1", "create_item", Item(name="b"), Handler(), Item)
+    assert error.value.status_code == 422
+
+
+async def test_pending_request_returns_conflict(shared_cache):
+    async def retry():
+        return await idempotent("k1", "u1", "delete_item", "id-1", Handler(), Item)
+
+    with pytest.raises(HTTPException) as error:
+        await idempotent("k1", "u1", "delete_item", "id-1", retry, Item)
+    assert error.value.status_code == 409
+
+
+async def test_failed_request_can_be_retried(shared_cache):
+    with pytest.raises(RuntimeError):
+        await idempotent("k1", "u1", "create_item", Item(name="a"), Handler(RuntimeError()), Item)
+
+    handler = Handler()
+    await idempotent("k1", "u1", "create_item", Item(name="a"), handler, Item)
+    assert handler.calls == 1
+
+
+async def test_without_key_runs_handler_directly(shared_cache):
+    handler = Handler()
+    assert await idempotent(None, "u1", "create_item", Item(name="a"), handler, Item) == Item(name="item-1")
+    await idempotent(None, "u1", "create_item", Item(name="a"), handler, Item)
+
+    assert handler.calls == 2
+
+
+async def test_idempotency_key_header_validation():
+    assert await get_idempotency_key(None) is None
+    assert await get_idempotency_key(" abc ") == "abc"
+    for invalid in ["", "키", "x" * 256]:
+        with pytest.raises(HTTPException) as error:
+            await get_idempotency_key(invalid)
+        assert error.value.status_code == 422
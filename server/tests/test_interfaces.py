@@ -0,0 +1,22 @@
+import pytest
+
+from app.services.medication_store import AsyncpgMedicationStore, MedicationStore, PostgrestMedicationStore
+
+
+def test_interface_cannot_be_instantiated():
+    with pytest.raises(TypeError):
+        MedicationStore()
+
+
+def test_incomplete_implementation_is_rejected():
+    class PartialStore(MedicationStore):
+        async def get_medication(self, user_id, medication_id):
+            return None
+
+    with pytest.raises(TypeError):
+        PartialStore()
+
+
+def test_implementations_are_complete():
+    PostgrestMedicationStore()
+    AsyncpgMedicationStore()
@@ -0,0 +1,130 @@
+import io
+import json
+from typing import Dict, List, Tuple
+
+import httpx
+import pytest
+from PIL import Image
+from storage3._async.file_api import AsyncBucketProxy
+
+from app.core.config import settings
+from app.core.exceptions import ExternalServiceError, NotFoundError
+from app.services import media_service as media_module
+from app.services.media_service import MediaService
+
+
+BOUNDARY = "testboundary"
+
+
+class FakeStorage:
+    """Supabase Storage API 대역 (업로드한 객체를 메모리에 보관)"""
+
+    def __init__(self, fail_on: str = ""):
+        self.objects: Dict[str, Tuple[bytes, str]] = {}
+        self.removed: List[str] = []
+        self.fail_on = fail_on
+
+    async def handle(self, request: httpx.Request) -> httpx.Response:
+        path = request.url.path.removeprefix(f"/storage/v1/object/{settings.MEDIA_STORAGE_BUCKET}")
+        if request.method == "POST":
+            if self.fail_on and path.endswith(self.fail_on):
+                return httpx.Response(500, json={"message": "error"})
+            content = b"".join([chunk async for chunk in request.stream])
+            assert len(content) == int(request.headers["content-length"])
+            self.objects[path.lstrip("/")] = (content, request.headers["content-type"])
+            return httpx.Response(200, json={"Key": path})
+        if request.method == "GET":
+            if path.lstrip("/") not in self.objects:
+                return httpx.Response(400, json={"statusCode": "404", "message": "Object not found"})
+            content, content_type = self.objects[path.lstrip("/")]
+            return httpx.Response(200, content=content, headers={"content-type": content_type})
+        if request.method == "DELETE":
+            self.removed.extend(json.loads(request.content)["prefixes"])
+            return httpx.Response(200, json=[])
+        return httpx.Response(405)
+
+
+class FakeClient:
+    def __init__(self, storage: FakeStorage):
+        self.storage = self
+        self.session = httpx.AsyncClient(
+            base_url="http://storage.test/storage/v1/", transport=httpx.MockTransport(storage.handle)
+        )
+
+    def from_(self, name):
+        return AsyncBucketProxy(name, self.session)
+
+
+@pytest.fixture
+def service():
+    service = MediaService()
+    yield service
+    service.shutdown()
+
+
+def use_storage(monkeypatch, storage: FakeStorage):
+    client = FakeClient(storage)
+    monkeypatch.setattr(media_module, "get_service_supabase", lambda: client)
+
+
+async def read_variant(service: MediaService, user_id: str, image_id: str, variant: str):
+    chunks, media_type = await service.open_variant(user_id, image_id, variant)
+    return b"".join([chunk async for chunk in chunks]), media_type
+
+
+def png_bytes() -> bytes:
+    buffer = io.BytesIO()
+    Image.new("RGB", (800, 400), "red").save(buffer, "PNG")
+    return buffer.getvalue()
+
+
+async def multipart_stream(content: bytes):
+    body = (
+        f"--{BOUNDARY}\r\n"
+        'Content-Disposition: form-data; name="file"; filename="pill.png"\r\n'
+        "Content-Type: image/png\r\n\r\n"
+    ).encode() + content + f"\r\n--{BOUNDARY}--\r\n".encode()
+    for offset in range(0, len(body), 1000):
+        yield body[offset:offset + 1000]
+
+
+async def upload(service: MediaService, content: bytes):
+    return await service.save_upload(
+        "user-1", f"multipart/form-data; boundary={BOUNDARY}", None, multipart_stream(content)
+    )
+
+
+async def test_upload_stores_original_and_variants_in_bucket(monkeypatch, service):
+    storage = FakeStorage()
+    use_storage(monkeypatch, storage)
+    content = png_bytes()
+
+    result = await upload(service, content)
+
+    prefix = f"medications/user-1/{result.image_id}"
+    assert set(storage.objects) == {f"{prefix}/original", f"{prefix}/thumbnail", f"{prefix}/medium"}
+    assert await read_variant(service, "user-1", result.image_id, "original") == (content, "image/png")
+
+    thumbnail, media_type = await read_variant(service, "user-1", result.image_id, "thumbnail")
+    assert media_type == "image/webp"
+    assert max(Image.open(io.BytesIO(thumbnail)).size) == 160
+
+
+async def test_open_variant_of_other_user_is_not_found(monkeypatch, service):
+    storage = FakeStorage()
+    use_storage(monkeypatch, storage)
+    result = await upload(service, png_bytes())
+
+    with pytest.raises(NotFoundError):
+        await service.open_variant("user-2", result.image_id, "thumbnail")
+    with pytest.raises(NotFoundError):
+        await service.open_variant("user-1", result.image_id, "large")
+
+
+async def test_failed_upload_removes_stored_objects(monkeypatch, service):
+    storage = FakeStorage(fail_on="medium")
+    use_storage(monkeypatch, storage)
+
+    with pytest.raises(ExternalServiceError):
+        await upload(service, png_bytes())
+    assert sorted(path.rsplit("/", 1)[1] for path in storage.removed) == ["medium", "original", "thumbnail"]
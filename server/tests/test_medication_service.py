@@ -0,0 +1,114 @@
+from datetime import date, datetime
+
+import pytest
+from postgrest import AsyncPostgrestClient
+
+from app.core.cache import InMemoryCacheBackend, cache
+from app.core.config import settings
+from app.core.exceptions import NotFoundError
+from app.schemas.medication import MedicationRecordCreate, MedicationResponse, MedicationStatus
+from app.services import medication_service as medication_module
+from app.services.dose_schedule_service import dose_schedule_service
+from app.services.medication_service import MedicationService
+
+
+MEDICATION = MedicationResponse(
+    id="m1", name="비타민", daily_dosage_count=1, dosage_times=["08:00"], form="tablet",
+    single_dosage_amount=1, dosage_unit="tablet", has_meal_relation=False, is_continuous=True,
+    created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 1),
+)
+
+
+class FakeStore:
+    def __init__(self):
+        self.daily_calls = 0
+
+    async def list_daily_records(self, user_id, target_date):
+        self.daily_calls += 1
+        return []
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(cache, "backend", InMemoryCacheBackend())
+    monkeypatch.setattr(cache, "shared", True)
+    monkeypatch.setattr(settings, "CACHE_ENABLED", True)
+
+    service = MedicationService()
+    service.store = FakeStore()
+
+    async def get_medications(user_id):
+        return [MEDICATION]
+
+    monkeypatch.setattr(service, "get_medications", get_medications)
+    return service
+
+
+def at(monkeypatch, hour: int):
+    now = datetime(2024, 3, 1, hour, 0, tzinfo=dose_schedule_service.tz)
+    monkeypatch.setattr(dose_schedule_service, "local_now", lambda: now)
+
+
+async def test_today_records_reflect_current_time(monkeypatch, service):
+    at(monkeypatch, 7)
+    assert (await service.get_daily_records("u1", date(2024, 3, 1))).doses == []
+
+    # 복용 시간이 지나면 캐시된 결과 대신 missed로 표시
+    at(monkeypatch, 9)
+    doses = (await service.get_daily_records("u1", date(2024, 3, 1))).doses
+    assert [(dose.time, dose.status) for dose in doses] == [("08:00", MedicationStatus.MISSED)]
+    assert service.store.daily_calls == 2
+
+
+async def test_past_records_are_cached(monkeypatch, service):
+    at(monkeypatch, 9)
+    first = await service.get_daily_records("u1", date(2024, 2, 28))
+    second = await service.get_daily_records("u1", date(2024, 2, 28))
+
+    assert first == second
+    assert [dose.status for dose in first.doses] == [MedicationStatus.MISSED]
+    assert service.store.daily_calls == 1
+
+
+@pytest.fixture
+def executed(monkeypatch):
+    """실행된 PostgREST 쿼리 기록 (네트워크 없이)"""
+    queries = []
+
+    class Response:
+        data = [{"id": "r1", "taken_at": None}]
+
+    async def execute(query):
+        queries.append(query)
+        return Response()
+
+    client = AsyncPostgrestClient("http://127.0.0.1:1")
+    monkeypatch.setattr(medication_module, "get_service_supabase", lambda: client)
+    monkeypatch.setattr(medication_module, "execute", execute)
+    return queries
+
+
+RECORD = MedicationRecordCreate(medication_id="m2", date=datetime(2024, 3, 1), time="08:00", status="missed")
+
+
+async def test_record_for_foreign_medication_is_rejected_before_any_write(service, executed):
+    async def get_medication(user_id, medication_id):
+        return None
+
+    service.store.get_medication = get_medication
+
+    with pytest.raises(NotFoundError):
+        await service.create_medication_record("u1", RECORD)
+    assert executed == []
+
+
+async def test_record_for_own_medication_uses_medication_name(service, executed):
+    async def get_medication(user_id, medication_id):
+        return {**MEDICATION.model_dump(), "id": medication_id}
+
+    service.store.get_medication = get_medication
+
+    record = await service.create_medication_record("u1", RECORD)
+    assert [query.http_method for query in executed] == ["POST"]
+    assert executed[0].json["user_id"] == "u1"
+    assert (record.id, record.medication_name) == ("r1", "비타민")
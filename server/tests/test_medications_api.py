@@ -0,0 +1,68 @@
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from pydantic import ValidationError
+
+from app.api.v1 import medications
+from app.schemas.medication import MedicationPage, MedicationRecordCreate, MedicationResponse
+from app.utils.auth import get_current_user_id
+
+
+MEDICATION = MedicationResponse(
+    id="m1", name="비타민", daily_dosage_count=1, dosage_times=["08:00"], form="tablet",
+    single_dosage_amount=1, dosage_unit="tablet", has_meal_relation=False, is_continuous=True,
+    created_at=datetime(2024, 1, 1), updated_at=datetime(2024, 1, 1),
+)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    calls = []
+
+    async def get_medications(user_id):
+        calls.append(("list", user_id))
+        return [MEDICATION]
+
+    async def get_medications_page(user_id, limit, cursor=None, fields=None):
+        calls.append(("page", user_id, limit, cursor, fields))
+        return MedicationPage(items=[{"id": "m1", "name": "비타민"}], next_cursor=None)
+
+    monkeypatch.setattr(medications.medication_service, "get_medications", get_medications)
+    monkeypatch.setattr(medications.medication_service, "get_medications_page", get_medications_page)
+
+    app = FastAPI()
+    app.include_router(medications.router, prefix="/v1")
+    app.dependency_overrides[get_current_user_id] = lambda: "u1"
+    client = TestClient(app)
+    client.calls = calls
+    return client
+
+
+def test_list_shape_without_pagination_params(client):
+    response = client.get("/v1/medications")
+
+    assert response.status_code == 200
+    assert [item["id"] for item in response.json()] == ["m1"]
+    assert client.calls == [("list", "u1")]
+
+
+def test_page_shape_when_pagination_requested(client):
+    response = client.get("/v1/medications", params={"fields": "id,name"})
+
+    assert response.status_code == 200
+    assert response.json() == {"items": [{"id": "m1", "name": "비타민"}], "next_cursor": None}
+    assert client.calls == [("page", "u1", medications.DEFAULT_PAGE_SIZE, None, ["id", "name"])]
+
+
+@pytest.mark.parametrize("value, expected", [("9:00", "09:00"), ("09:30:00", "09:30"), ("21:05", "21:05")])
+def test_record_time_is_normalized(value, expected):
+    record = MedicationRecordCreate(medication_id="m1", date=datetime(2024, 1, 1), time=value, status="taken")
+    assert record.time == expected
+
+
+@pytest.mark.parametrize("value", ["25:00", "9", "아침"])
+def test_record_time_must_be_hh_mm(value):
+    with pytest.raises(ValidationError):
+        MedicationRecordCreate(medication_id="m1", date=datetime(2024, 1, 1), time=value, status="taken")
@@ -0,0 +1,35 @@
+import pytest
+
+from app.core.exceptions import ValidationError
+from app.utils.pagination import decode_cursor, encode_cursor, keyset_filter
+
+
+def test_cursor_round_trip():
+    values = ["2024-01-01", "00000000-0000-0000-0000-000000000001", 3]
+    cursor = encode_cursor(values)
+
+    assert "=" not in cursor
+    assert decode_cursor(cursor, 3) == values
+
+
+@pytest.mark.parametrize("cursor", ["not-base64!", encode_cursor(["a"]), encode_cursor({"a": 1}.items())])
+def test_decode_cursor_rejects_invalid(cursor):
+    with pytest.raises(ValidationError):
+        decode_cursor(cursor, 2)
+
+
+def test_keyset_filter_single_column():
+    assert keyset_filter(["id"], ["abc"]) == 'id.gt."abc"'
+    assert keyset_filter(["id"], ["abc"], descending=True) == 'id.lt."abc"'
+
+
+def test_keyset_filter_compound_key():
+    assert keyset_filter(["date", "time", "id"], ["2024-01-01", "09:00", "x"]) == (
+        'date.gt."2024-01-01",'
+        'and(date.eq."2024-01-01",time.gt."09:00"),'
+        'and(date.eq."2024-01-01",time.eq."09:00",id.gt."x")'
+    )
+
+
+def test_keyset_filter_quotes_reserved_characters():
+    assert keyset_filter(["name"], ['a,b"c\\']) == 'name.gt."a,b\\"c\\\\"'
@@ -0,0 +1,90 @@
+from datetime import date, datetime
+
+import pytest
+from postgrest import AsyncPostgrestClient
+
+from app.jobs import population_analytics
+from app.jobs.population_analytics import resolve_period
+from app.services import analytics_service as analytics_module
+from app.services.analytics_service import AnalyticsService
+from app.utils.analytics import Factorizer, PopulationAggregator
+
+
+ROWS = [
+    {"dimension": "overall", "bucket": "all", "user_count": 2, "total_doses": 4, "taken_count": 3, "completion_rate": 0.75},
+]
+
+
+def test_factorizer_keeps_codes_across_chunks():
+    factorizer = Factorizer()
+
+    assert factorizer.encode(["b", "a", "b"]).tolist() == [1, 0, 1]
+    assert factorizer.encode(["c", "b", "c"]).tolist() == [2, 1, 2]
+    assert factorizer.encode([]).tolist() == []
+    assert factorizer.labels == ["a", "b", "c"]
+
+
+def test_aggregator_counts_groups_over_chunks():
+    aggregator = PopulationAggregator()
+    aggregator.add_chunk(["u1", "u2"], ["08:00", "13:00"], ["taken", "missed"], ["tablet", "syrup"], ["mg", "ml"])
+    aggregator.add_chunk(["u2", "u1"], ["21:00", "08:30"], ["taken", "taken"], ["syrup", "tablet"], ["ml", "mg"])
+
+    rows = {(row["dimension"], row["bucket"]): row for row in aggregator.summary()}
+    assert (rows["overall", "all"]["user_count"], rows["overall", "all"]["total_doses"]) == (2, 4)
+    assert (rows["form", "tablet"]["total_doses"], rows["form", "tablet"]["taken_count"]) == (2, 2)
+    assert (rows["dosage_unit", "ml"]["total_doses"], rows["dosage_unit", "ml"]["taken_count"]) == (2, 1)
+    assert sum(row["total_doses"] for key, row in rows.items() if key[0] == "time_of_day") == 4
+
+
+def test_resolve_period_defaults_to_last_month(monkeypatch):
+    monkeypatch.setattr(
+        population_analytics.dose_schedule_service, "local_now", lambda: datetime(2024, 3, 15, 9, 0)
+    )
+    assert resolve_period(None, None) == (date(2024, 2, 1), date(2024, 2, 29))
+
+
+def test_resolve_period_fills_only_missing_bound():
+    assert resolve_period(date(2024, 2, 10), None) == (date(2024, 2, 10), date(2024, 2, 29))
+    assert resolve_period(None, date(2024, 12, 20)) == (date(2024, 12, 1), date(2024, 12, 20))
+    assert resolve_period(date(2024, 1, 5), date(2024, 3, 1)) == (date(2024, 1, 5), date(2024, 3, 1))
+
+
+def test_resolve_period_rejects_reversed_range():
+    with pytest.raises(ValueError):
+        resolve_period(date(2024, 3, 2), date(2024, 3, 1))
+
+
+@pytest.fixture
+def executed(monkeypatch):
+    """실행된 PostgREST 쿼리 기록 (네트워크 없이)"""
+    queries = []
+
+    async def execute(query):
+        queries.append(query)
+
+    client = AsyncPostgrestClient("http://127.0.0.1:1")
+    monkeypatch.setattr(analytics_module, "get_service_supabase", lambda: client)
+    monkeypatch.setattr(analytics_module, "execute", execute)
+    return queries
+
+
+async def test_save_upserts_on_period_key_before_removing_stale_rows(executed):
+    await AnalyticsService().save_population_report(date(2024, 2, 1), date(2024, 2, 29), ROWS)
+
+    upsert, delete = executed
+    assert upsert.http_method == "POST"
+    assert upsert.params["on_conflict"] == "period_start,period_end,dimension,bucket"
+    assert "resolution=merge-duplicates" in upsert.headers["prefer"]
+    assert upsert.json[0]["period_start"] == "2024-02-01"
+
+    # 이번 결과(computed_at)가 아닌 같은 기간 행만 삭제
+    assert delete.http_method == "DELETE"
+    assert delete.params["period_start"] == "eq.2024-02-01"
+    assert delete.params["period_end"] == "eq.2024-02-29"
+    assert delete.params["computed_at"] == f"neq.{upsert.json[0]['computed_at']}"
+
+
+async def test_save_without_rows_only_clears_period(executed):
+    await AnalyticsService().save_population_report(date(2024, 2, 1), date(2024, 2, 29), [])
+
+    assert [query.http_method for query in executed] == ["DELETE"]
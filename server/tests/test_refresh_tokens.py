@@ -0,0 +1,79 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+
+from app.core.cache import InMemoryCacheBackend
+from app.core.config import settings
+from app.core.exceptions import AuthenticationError
+from app.schemas.auth import UserResponse
+from app.services.auth_service import AuthService, access_token_expiry_seconds
+from app.services.refresh_token_store import CacheRefreshTokenStore, PostgrestRefreshTokenStore, RefreshTokenStore
+
+
+USER = UserResponse(id="u1", email="u1@example.com", login_method="email", created_at=datetime(2024, 1, 1))
+
+
+@pytest.fixture
+def service(monkeypatch):
+    monkeypatch.setattr(settings, "REFRESH_TOKEN_ENABLED", True)
+    service = AuthService()
+    service.refresh_store = CacheRefreshTokenStore(InMemoryCacheBackend())
+    return service
+
+
+def test_access_token_is_short_lived_with_refresh_tokens(monkeypatch):
+    assert access_token_expiry_seconds() == settings.JWT_ACCESS_TOKEN_EXPIRY_MINUTES * 60
+    monkeypatch.setattr(settings, "REFRESH_TOKEN_ENABLED", False)
+    assert access_token_expiry_seconds() == settings.JWT_EXPIRY_HOURS * 3600
+
+
+async def test_refresh_rotates_token(service):
+    session = await service.create_session(USER)
+    refreshed = await service.refresh_session(session.refresh_token)
+
+    assert refreshed.refresh_token != session.refresh_token
+    assert service.get_user_id_from_token(refreshed.access_token) == "u1"
+    assert await service.refresh_session(refreshed.refresh_token)
+
+
+async def test_immediate_retry_does_not_revoke_family(service):
+    session = await service.create_session(USER)
+    first = await service.refresh_session(session.refresh_token)
+    # 동시 요청/응답 유실로 같은 토큰을 곧바로 다시 보냄
+    retry = await service.refresh_session(session.refresh_token)
+
+    assert retry.refresh_token != first.refresh_token
+    assert await service.refresh_session(first.refresh_token)
+    assert await service.refresh_session(retry.refresh_token)
+
+
+async def test_reuse_after_grace_revokes_family(monkeypatch, service):
+    session = await service.create_session(USER)
+    first = await service.refresh_session(session.refresh_token)
+
+    token_id = session.refresh_token.split(".")[0]
+    used_at = datetime.now(timezone.utc) - timedelta(seconds=settings.REFRESH_TOKEN_REUSE_GRACE_SECONDS + 1)
+    await service.refresh_store.backend.set(f"healthplus:refresh:used:{token_id}", used_at.isoformat(), 60)
+
+    with pytest.raises(AuthenticationError):
+        await service.refresh_session(session.refresh_token)
+    # 탈취로 보고 같은 계열의 최신 토큰도 폐기
+    with pytest.raises(AuthenticationError):
+        await service.refresh_session(first.refresh_token)
+
+
+async def test_logout_succeeds_when_store_fails(service):
+    token = (await service.create_session(USER)).refresh_token
+
+    async def unavailable(*args):
+        raise ConnectionError("store unavailable")
+
+    service.refresh_store.consume = unavailable
+    await service.revoke_session(token)
+
+
+def test_refresh_token_store_interface_is_abstract():
+    with pytest.raises(TypeError):
+        RefreshTokenStore()
+    CacheRefreshTokenStore(InMemoryCacheBackend())
+    PostgrestRefreshTokenStore()
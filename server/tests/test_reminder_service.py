@@ -0,0 +1,234 @@
+import asyncio
+from datetime import datetime, timedelta, timezone
+from typing import List
+from zoneinfo import ZoneInfo
+
+import pytest
+
+from app.core.cache import InMemoryCacheBackend, cache
+from app.core.config import settings
+from app.core.leader import FileLeaderLock, LeaderLock
+from app.services import reminder_service as reminder_module
+from app.services.reminder_sender import LogReminderSender, ReminderSender
+from app.services.reminder_service import DISPATCHED_UNTIL_KEY, ReminderSchedule, ReminderService
+
+
+NOW = datetime(2024, 1, 1, 0, 0, tzinfo=timezone.utc)
+
+MEDICATION = {
+    "id": "m1",
+    "user_id": "u1",
+    "name": "비타민",
+    "dosage_times": ["09:00"],
+    "notification_settings": [{"is_enabled": True, "reminder_minutes_before": 10}],
+}
+
+
+class FakeLeaderLock:
+    def __init__(self, results: List[bool]):
+        self.results = results
+        self.calls = 0
+
+    async def acquire(self) -> bool:
+        self.calls += 1
+        return self.results[min(self.calls, len(self.results)) - 1]
+
+    async def release(self):
+        pass
+
+
+class FakeSender:
+    def __init__(self):
+        self.sent = []
+
+    async def send(self, reminders):
+        self.sent.extend(reminders)
+
+
+@pytest.fixture
+def service(monkeypatch):
+    service = ReminderService()
+    service._sender = FakeSender()
+    service.schedule.upsert(MEDICATION, NOW)
+    service._loaded = True
+
+    async def refresh(medication_ids, now):
+        return set(medication_ids)
+
+    monkeypatch.setattr(service, "_refresh_medications", refresh)
+    return service
+
+
+def due_reminders(service: ReminderService):
+    return service.schedule.pop_due(NOW + timedelta(days=1), 10)
+
+
+async def test_dispatch_sends_while_lease_is_held(service):
+    service._lease_until = float("inf")
+    await service.dispatch(due_reminders(service))
+    assert [reminder.medication_id for reminder in service._sender.sent] == ["m1"]
+
+
+async def test_dispatch_aborts_after_lease_is_lost(service):
+    service._lease_until = 0.0
+    await service.dispatch(due_reminders(service))
+    assert service._sender.sent == []
+    # 잠금을 잃으면 적재한 일정을 버리고 다시 리더가 되면 새로 적재
+    assert not service._loaded
+    assert len(service.schedule) == 0
+
+
+async def test_lease_renewed_in_background(monkeypatch, service):
+    monkeypatch.setattr(settings, "LEADER_LOCK_TTL_SECONDS", 0.3)
+    service._leader = FakeLeaderLock([True, True, False])
+
+    task = asyncio.create_task(service._renew_lease())
+    try:
+        await asyncio.sleep(0.15)
+        assert service.is_leader
+        await asyncio.sleep(0.2)
+        assert service._leader.calls >= 3
+        assert not service.is_leader
+    finally:
+        task.cancel()
+
+
+def test_schedule_fires_before_dosage_time_in_local_timezone():
+    schedule = ReminderSchedule(ZoneInfo("Asia/Seoul"))
+    schedule.upsert(MEDICATION, NOW)
+
+    # 현지 09:00 - 10분 = UTC 23:50 (전날)
+    assert len(schedule) == 1
+    assert schedule.peek() == datetime(2024, 1, 1, 23, 50, tzinfo=timezone.utc)
+    assert schedule.pop_due(NOW, 10) == []
+
+
+def test_schedule_pop_due_reschedules_next_day():
+    schedule = ReminderSchedule(ZoneInfo("Asia/Seoul"))
+    schedule.upsert({**MEDICATION, "dosage_times": ["09:00", "21:00"]}, NOW)
+    evening = datetime(2024, 1, 1, 11, 50, tzinfo=timezone.utc)
+
+    assert schedule.pop_due(evening, 10) == [(("m1", "21:00"), evening)]
+    assert schedule.peek() == datetime(2024, 1, 1, 23, 50, tzinfo=timezone.utc)
+
+    due = schedule.pop_due(evening + timedelta(days=1), 1)
+    assert due == [(("m1", "09:00"), datetime(2024, 1, 1, 23, 50, tzinfo=timezone.utc))]
+    assert schedule.peek() == evening + timedelta(days=1)
+
+
+def test_schedule_upsert_drops_removed_times_and_disabled_medications():
+    schedule = ReminderSchedule(ZoneInfo("Asia/Seoul"))
+    schedule.upsert({**MEDICATION, "dosage_times": ["09:00", "21:00"]}, NOW)
+
+    schedule.upsert({**MEDICATION, "dosage_times": ["21:00"]}, NOW)
+    assert len(schedule) == 1
+    assert schedule.peek() == datetime(2024, 1, 1, 11, 50, tzinfo=timezone.utc)
+
+    disabled = [{"is_enabled": False, "reminder_minutes_before": 10}]
+    schedule.upsert({**MEDICATION, "notification_settings": disabled}, NOW)
+    assert len(schedule) == 0
+    assert schedule.peek() is None
+    assert schedule.get_medication("m1") is None
+
+
+def test_schedule_remove():
+    schedule = ReminderSchedule(ZoneInfo("Asia/Seoul"))
+    schedule.upsert(MEDICATION, NOW)
+    schedule.remove("m1")
+    schedule.remove("unknown")
+
+    assert len(schedule) == 0
+    assert schedule.pop_due(NOW + timedelta(days=2), 10) == []
+
+
+# MEDICATION의 첫 알림 시각 (현지 09:00 - 10분)
+FIRE_AT = datetime(2024, 1, 1, 23, 50, tzinfo=timezone.utc)
+
+
+async def test_medication_edited_just_before_fire_time_still_fires(monkeypatch, service):
+    service._lease_until = float("inf")
+    service._watermark = NOW
+    edited = {**MEDICATION, "name": "비타민 D", "updated_at": (FIRE_AT - timedelta(seconds=30)).isoformat()}
+    sync_at = FIRE_AT + timedelta(seconds=10)
+
+    calls = []
+
+    async def iter_changed(query_factory, since):
+        # 약물 변경분 조회에만 수정된 약물 반환 (알림 설정 변경 없음)
+        calls.append(since)
+        if len(calls) == 1:
+            yield edited
+
+    monkeypatch.setattr(reminder_module, "_utcnow", lambda: sync_at)
+    monkeypatch.setattr(reminder_module, "get_service_supabase", lambda: None)
+    monkeypatch.setattr(service, "_iter_changed", iter_changed)
+    await service.sync_changes()
+
+    due = service.schedule.pop_due(sync_at, 10)
+    assert due == [(("m1", "09:00"), FIRE_AT)]
+    await service.dispatch(due)
+    assert [reminder.medication_name for reminder in service._sender.sent] == ["비타민 D"]
+
+
+def test_upsert_keeps_due_entries_not_yet_popped():
+    schedule = ReminderSchedule(ZoneInfo("Asia/Seoul"))
+    schedule.upsert({**MEDICATION, "dosage_times": ["09:00", "09:05"]}, NOW)
+
+    # 09:00 알림만 꺼낸 뒤 (발송 중 재조회) 다시 upsert해도 09:05 알림은 다음 날로 밀리지 않음
+    later = FIRE_AT + timedelta(minutes=6)
+    assert schedule.pop_due(later, 1) == [(("m1", "09:00"), FIRE_AT)]
+    schedule.upsert({**MEDICATION, "dosage_times": ["09:00", "09:05"]}, later)
+
+    assert schedule.pop_due(later, 10) == [(("m1", "09:05"), FIRE_AT + timedelta(minutes=5))]
+    assert schedule.peek() == FIRE_AT + timedelta(days=1)
+
+
+def test_upsert_shifts_pending_entry_when_minutes_before_changes():
+    schedule = ReminderSchedule(ZoneInfo("Asia/Seoul"))
+    schedule.upsert(MEDICATION, NOW)
+
+    settings_30 = [{"is_enabled": True, "reminder_minutes_before": 30}]
+    schedule.upsert({**MEDICATION, "notification_settings": settings_30}, NOW)
+    assert schedule.peek() == FIRE_AT - timedelta(minutes=20)
+
+
+async def test_new_leader_catches_up_from_previous_dispatch_watermark(monkeypatch):
+    monkeypatch.setattr(cache, "backend", InMemoryCacheBackend())
+    monkeypatch.setattr(cache, "shared", True)
+    # 이전 리더는 알림 시각 직전까지 발송하고 종료, 새 리더는 5분 뒤 적재
+    await cache.set(f"{cache.prefix}:{DISPATCHED_UNTIL_KEY}", (FIRE_AT - timedelta(seconds=1)).isoformat(), 600)
+    load_at = FIRE_AT + timedelta(minutes=5)
+
+    class Response:
+        data = [MEDICATION]
+
+    async def execute(query):
+        return Response()
+
+    monkeypatch.setattr(reminder_module, "_utcnow", lambda: load_at)
+    monkeypatch.setattr(reminder_module, "execute", execute)
+    service = ReminderService()
+    await service.load_all()
+
+    assert service.schedule.pop_due(load_at, 10) == [(("m1", "09:00"), FIRE_AT)]
+
+
+async def test_catch_up_is_bounded(monkeypatch):
+    monkeypatch.setattr(cache, "backend", InMemoryCacheBackend())
+    monkeypatch.setattr(cache, "shared", True)
+    await cache.set(f"{cache.prefix}:{DISPATCHED_UNTIL_KEY}", NOW.isoformat(), 600)
+
+    service = ReminderService()
+    now = NOW + timedelta(days=1)
+    assert await service._load_dispatched_until(now) == now - timedelta(seconds=settings.REMINDER_CATCHUP_SECONDS)
+
+
+@pytest.mark.parametrize("interface", [LeaderLock, ReminderSender])
+def test_scheduler_interfaces_are_abstract(interface):
+    with pytest.raises(TypeError):
+        interface()
+
+
+def test_scheduler_implementations_are_complete(tmp_path):
+    FileLeaderLock(str(tmp_path / "leader.lock"))
+    LogReminderSender()
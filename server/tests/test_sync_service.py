@@ -0,0 +1,82 @@
+from datetime import datetime, timedelta
+from typing import Dict, List
+
+from postgrest import AsyncPostgrestClient
+
+from app.core.config import settings
+from app.services import sync_service as sync_module
+from app.services.sync_service import PURGE_BATCH_SIZE, SYNC_ORIGIN, SyncService
+from app.utils.pagination import decode_cursor
+
+
+# 앱 서버 시계와 무관한 DB 시각
+DB_TIME = "2020-05-01T12:00:00+00:00"
+
+RECORD = {
+    "id": "00000000-0000-0000-0000-000000000001",
+    "medication_id": "00000000-0000-0000-0000-0000000000aa",
+    "date": "2020-05-01",
+    "time": "09:00",
+    "status": "taken",
+    "updated_at": "2020-05-01T11:59:00+00:00",
+}
+
+
+class FakeStore:
+    def __init__(self, rows: Dict[str, List[dict]]):
+        self.rows = rows
+
+    async def list_changes(self, table, user_id, after, limit):
+        return self.rows.get(table, [])[:limit]
+
+    async def get_db_time(self):
+        return DB_TIME
+
+
+def make_service(rows: Dict[str, List[dict]]) -> SyncService:
+    service = SyncService()
+    service.store = FakeStore(rows)
+    return service
+
+
+async def test_caught_up_position_uses_db_time():
+    response = await make_service({"medication_records": [RECORD]}).get_changes("u1", None, 10)
+
+    positions = decode_cursor(response.next_cursor, 7)
+    window_start = datetime.fromisoformat(DB_TIME) - timedelta(seconds=settings.SYNC_SAFETY_WINDOW_SECONDS)
+    assert positions[0] == DB_TIME
+    assert positions[1:] == [window_start.isoformat(), SYNC_ORIGIN[1]] * 3
+    assert not response.has_more
+
+
+async def test_page_position_is_last_row():
+    second = {**RECORD, "id": "00000000-0000-0000-0000-000000000002"}
+    response = await make_service({"medication_records": [RECORD, second]}).get_changes("u1", None, 1)
+
+    positions = decode_cursor(response.next_cursor, 7)
+    assert response.has_more
+    assert positions[3:5] == [RECORD["updated_at"], RECORD["id"]]
+    assert [record.id for record in response.records] == [RECORD["id"]]
+
+
+async def test_purge_tombstones_deletes_in_bounded_batches(monkeypatch):
+    batches = [[{"id": f"t{i}"} for i in range(PURGE_BATCH_SIZE)], [{"id": "last"}], []]
+    queries = []
+
+    class Response:
+        def __init__(self, data):
+            self.data = data
+
+    async def execute(query):
+        queries.append(query)
+        return Response(batches.pop(0) if query.http_method == "GET" else [])
+
+    client = AsyncPostgrestClient("http://127.0.0.1:1")
+    monkeypatch.setattr(sync_module, "get_service_supabase", lambda: client)
+    monkeypatch.setattr(sync_module, "execute", execute)
+
+    assert await SyncService().purge_tombstones() == PURGE_BATCH_SIZE + 1
+    assert [query.http_method for query in queries] == ["GET", "DELETE", "GET", "DELETE", "GET"]
+    assert queries[0].params["limit"] == str(PURGE_BATCH_SIZE)
+    assert queries[3].params["id"] == "in.(last)"
+    assert "return=minimal" in queries[3].headers["prefer"]